@@ -0,0 +1,54 @@
+import sys
+import time
+from fifo import Queue, ListQueue
+
+# The list-based queue is quadratic, above this size it would run for hours
+LIST_QUEUE_LIMIT = 10**5
+
+
+def drain_one_by_one(queue, n: int) -> float:
+    """
+    Enqueues `n` items and dequeues them one at a time.
+
+    returns:
+     - elapsed time in seconds
+    """
+    start = time.perf_counter()
+    for i in range(n):
+        queue.enqueue(i)
+    while not queue.is_empty():
+        queue.dequeue()
+    return time.perf_counter() - start
+
+
+def drain_in_bulk(queue, n: int, batch: int = 1024) -> float:
+    """
+    Enqueues `n` items with one `enqueue_many` call and drains them in batches.
+
+    returns:
+     - elapsed time in seconds
+    """
+    start = time.perf_counter()
+    queue.enqueue_many(range(n))
+    while not queue.is_empty():
+        queue.dequeue_many(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    sizes = [10**e for e in range(4, max_exponent + 1)]
+
+    print(f"{'n':>10} {'ListQueue':>12} {'Queue':>12} {'Queue bulk':>12}")
+    for n in sizes:
+        if n <= LIST_QUEUE_LIMIT:
+            list_time = f"{drain_one_by_one(ListQueue(), n):.4f}s"
+        else:
+            list_time = "skipped"
+        ring_time = drain_one_by_one(Queue(), n)
+        bulk_time = drain_in_bulk(Queue(), n)
+        print(f"{n:>10} {list_time:>12} {ring_time:>11.4f}s {bulk_time:>11.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import threading
+import time
+from bounded import BoundedQueue, AsyncBoundedQueue
+
+WORKER_COUNTS = [1, 2, 4, 8]
+CAPACITY = 1024
+SENTINEL = None
+
+
+def threaded_throughput(workers: int, items: int) -> float:
+    """
+    Runs `workers` producer threads and `workers` consumer threads over one BoundedQueue.
+
+    returns:
+     - items per second
+    """
+    queue = BoundedQueue(CAPACITY)
+    per_producer = items // workers
+
+    def produce():
+        for i in range(per_producer):
+            queue.put(i)
+
+    def consume():
+        while queue.get() is not SENTINEL:
+            pass
+
+    producers = [threading.Thread(target=produce) for _ in range(workers)]
+    consumers = [threading.Thread(target=consume) for _ in range(workers)]
+
+    start = time.perf_counter()
+    for thread in producers + consumers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    for _ in consumers:
+        queue.put(SENTINEL)     # one stop signal per consumer
+    for thread in consumers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return per_producer * workers / elapsed
+
+
+async def async_throughput(workers: int, items: int) -> float:
+    """
+    Runs `workers` producer tasks and `workers` consumer tasks over one AsyncBoundedQueue.
+
+    returns:
+     - items per second
+    """
+    queue = AsyncBoundedQueue(CAPACITY)
+    per_producer = items // workers
+
+    async def produce():
+        for i in range(per_producer):
+            await queue.put(i)
+
+    async def consume():
+        while await queue.get() is not SENTINEL:
+            pass
+
+    start = time.perf_counter()
+    consumers = [asyncio.create_task(consume()) for _ in range(workers)]
+    await asyncio.gather(*(produce() for _ in range(workers)))
+    for _ in consumers:
+        await queue.put(SENTINEL)
+    await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - start
+
+    return per_producer * workers / elapsed
+
+
+def single_thread_throughput(items: int) -> tuple:
+    """
+    Compares the locked path with the lock-free `single_thread` path on one thread.
+
+    returns:
+     - (locked items per second, lock-free items per second)
+    """
+    results = []
+    for single_thread in (False, True):
+        queue = BoundedQueue(CAPACITY, single_thread=single_thread)
+        start = time.perf_counter()
+        for _ in range(items // CAPACITY):
+            for i in range(CAPACITY):
+                queue.put(i)
+            for _ in range(CAPACITY):
+                queue.get()
+        results.append(items / (time.perf_counter() - start))
+    return tuple(results)
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    locked, lock_free = single_thread_throughput(items)
+    print(f"single thread: locked {locked:,.0f} items/s, lock-free {lock_free:,.0f} items/s\n")
+
+    print(f"{'producers/consumers':>20} {'threads':>16} {'asyncio':>16}")
+    for workers in WORKER_COUNTS:
+        threaded = threaded_throughput(workers, items)
+        awaited = asyncio.run(async_throughput(workers, items))
+        print(f"{workers:>20} {threaded:>10,.0f} it/s {awaited:>10,.0f} it/s")
+
+
+if __name__ == "__main__":
+    main()
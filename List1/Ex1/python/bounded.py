@@ -0,0 +1,287 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from queue import Empty, Full
+from fifo import Queue
+from lifo import Stack
+
+
+class _BoundedContainer(ABC):
+    """
+    Base class of the thread-safe bounded containers.
+
+    Producers block in `put` while the container is full (backpressure) and consumers
+    block in `get` while it is empty. Both accept a timeout and raise `queue.Full` /
+    `queue.Empty` when it expires, like the standard library `queue` module.
+
+    Subclasses choose the storage (FIFO or LIFO) through `_new_storage`, `_push` and `_pop`.
+    """
+
+    def __init__(self, capacity: int = 0, single_thread: bool = False):
+        """
+        params:
+         - capacity: maximum number of items, 0 means unbounded
+         - single_thread: skip locking entirely; only valid when a single thread ever
+           touches the container, in which case `put`/`get` never block and raise
+           `Full`/`Empty` immediately
+        """
+        self.capacity = capacity
+        self.single_thread = single_thread
+        self.storage = self._new_storage()
+        self.count = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return 0 < self.capacity <= self.count
+
+    def put(self, item, block: bool = True, timeout: float = None) -> None:
+        """
+        Adds an item, waiting for a free slot if the container is full.
+
+        params:
+         - item: item to add
+         - block: if False, raise `Full` instead of waiting
+         - timeout: maximum number of seconds to wait (None waits forever)
+        """
+        if self.single_thread:
+            if self.is_full():
+                raise Full
+            self._push(item)
+            self.count += 1
+            return
+
+        with self.not_full:
+            if not self._wait(self.not_full, lambda: not self.is_full(), block, timeout):
+                raise Full
+            self._push(item)
+            self.count += 1
+            self.not_empty.notify()
+
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        Removes and returns an item, waiting for one if the container is empty.
+
+        params:
+         - block: if False, raise `Empty` instead of waiting
+         - timeout: maximum number of seconds to wait (None waits forever)
+        """
+        if self.single_thread:
+            if self.is_empty():
+                raise Empty
+            self.count -= 1
+            return self._pop()
+
+        with self.not_empty:
+            if not self._wait(self.not_empty, lambda: not self.is_empty(), block, timeout):
+                raise Empty
+            self.count -= 1
+            item = self._pop()
+            self.not_full.notify()
+            return item
+
+    def put_nowait(self, item) -> None:
+        self.put(item, block=False)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    @staticmethod
+    def _wait(condition, predicate, block: bool, timeout: float) -> bool:
+        """
+        Waits on `condition` (whose lock is held) until `predicate` holds.
+
+        returns:
+         - True if the predicate holds, False if we may not block or the timeout expired
+        """
+        if predicate():
+            return True
+        if not block:
+            return False
+        return condition.wait_for(predicate, timeout)
+
+    @abstractmethod
+    def _new_storage(self):
+        """Creates the empty storage of the container."""
+
+    @abstractmethod
+    def _push(self, item) -> None:
+        """Adds an item to the storage."""
+
+    @abstractmethod
+    def _pop(self):
+        """Removes and returns the next item of the storage."""
+
+
+class BoundedQueue(_BoundedContainer):
+    """
+    Thread-safe bounded FIFO queue built on the ring-buffer `Queue`.
+    """
+
+    def _new_storage(self):
+        return Queue()
+
+    def _push(self, item) -> None:
+        self.storage.enqueue(item)
+
+    def _pop(self):
+        return self.storage.dequeue()
+
+
+class BoundedStack(_BoundedContainer):
+    """
+    Thread-safe bounded LIFO stack built on `Stack`.
+    """
+
+    def _new_storage(self):
+        return Stack()
+
+    def _push(self, item) -> None:
+        self.storage.push(item)
+
+    def _pop(self):
+        return self.storage.pop()
+
+
+class _AsyncBoundedContainer(ABC):
+    """
+    Base class of the asyncio bounded containers.
+
+    Same semantics as `_BoundedContainer`, but `put` and `get` are coroutines that
+    suspend the calling task instead of blocking the thread. They must be used from
+    a single event loop.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        params:
+         - capacity: maximum number of items, 0 means unbounded
+        """
+        self.capacity = capacity
+        self.storage = self._new_storage()
+        self.count = 0
+        self.changed = asyncio.Condition()
+        # The loop keeps only weak references to tasks, so pending notifiers are kept alive here
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return 0 < self.capacity <= self.count
+
+    async def put(self, item, timeout: float = None) -> None:
+        """
+        Adds an item, suspending until there is a free slot.
+        Raises `queue.Full` if `timeout` seconds pass first.
+        """
+        async with self.changed:
+            if not await self._wait(lambda: not self.is_full(), timeout):
+                raise Full
+            self._push(item)
+            self.count += 1
+            self.changed.notify_all()
+
+    async def get(self, timeout: float = None):
+        """
+        Removes and returns an item, suspending until one is available.
+        Raises `queue.Empty` if `timeout` seconds pass first.
+        """
+        async with self.changed:
+            if not await self._wait(lambda: not self.is_empty(), timeout):
+                raise Empty
+            self.count -= 1
+            item = self._pop()
+            self.changed.notify_all()
+            return item
+
+    def put_nowait(self, item) -> None:
+        if self.is_full():
+            raise Full
+        self._push(item)
+        self.count += 1
+        self._notify_soon()
+
+    def get_nowait(self):
+        if self.is_empty():
+            raise Empty
+        self.count -= 1
+        item = self._pop()
+        self._notify_soon()
+        return item
+
+    async def _wait(self, predicate, timeout: float) -> bool:
+        if predicate():
+            return True
+        try:
+            await asyncio.wait_for(self.changed.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _notify_soon(self) -> None:
+        # The condition can only be notified with its lock held, which a plain function cannot await
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop, so no task can be waiting on the condition either
+            return
+
+        async def notify():
+            async with self.changed:
+                self.changed.notify_all()
+        task = loop.create_task(notify())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @abstractmethod
+    def _new_storage(self):
+        """Creates the empty storage of the container."""
+
+    @abstractmethod
+    def _push(self, item) -> None:
+        """Adds an item to the storage."""
+
+    @abstractmethod
+    def _pop(self):
+        """Removes and returns the next item of the storage."""
+
+
+class AsyncBoundedQueue(_AsyncBoundedContainer):
+    """
+    Bounded FIFO queue with awaitable `put`/`get`.
+    """
+
+    def _new_storage(self):
+        return Queue()
+
+    def _push(self, item) -> None:
+        self.storage.enqueue(item)
+
+    def _pop(self):
+        return self.storage.dequeue()
+
+
+class AsyncBoundedStack(_AsyncBoundedContainer):
+    """
+    Bounded LIFO stack with awaitable `put`/`get`.
+    """
+
+    def _new_storage(self):
+        return Stack()
+
+    def _push(self, item) -> None:
+        self.storage.push(item)
+
+    def _pop(self):
+        return self.storage.pop()
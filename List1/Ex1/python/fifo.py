@@ -1,4 +1,127 @@
 class Queue:
+    """
+    FIFO queue backed by a growable ring buffer.
+
+    The items live in a fixed-size list that is used circularly: `head` points at
+    the oldest item and `size` items follow it (wrapping around the end of the buffer).
+    The buffer doubles when it is full and halves when it is at most a quarter full,
+    so `enqueue` and `dequeue` are amortized O(1).
+
+    implements:
+     - enqueue / enqueue_many - add one item / every item of an iterable at the back
+     - dequeue / dequeue_many - remove one item / up to `count` items from the front
+     - is_empty - checks if the queue has no items
+    """
+
+    MIN_CAPACITY = 8
+
+    def __init__(self, capacity: int = MIN_CAPACITY):
+        """
+        Initializes an empty queue.
+
+        params:
+         - capacity: initial size of the buffer (it grows and shrinks on demand)
+        """
+        self.capacity = max(capacity, self.MIN_CAPACITY)
+        self.buffer = [None] * self.capacity
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def enqueue(self, item) -> None:
+        if self.size == self.capacity:
+            self._resize(2 * self.capacity)
+        self.buffer[(self.head + self.size) % self.capacity] = item
+        self.size += 1
+
+    def enqueue_many(self, items) -> None:
+        """
+        Adds every item of `items` at the back of the queue.
+        The buffer is resized at most once and filled with (at most two) slice assignments.
+        """
+        items = list(items)
+        count = len(items)
+        if count == 0:
+            return
+
+        required = self.size + count
+        if required > self.capacity:
+            new_capacity = self.capacity
+            while new_capacity < required:
+                new_capacity *= 2
+            self._resize(new_capacity)
+
+        tail = (self.head + self.size) % self.capacity
+        first_part = min(count, self.capacity - tail)
+        self.buffer[tail:tail + first_part] = items[:first_part]
+        self.buffer[:count - first_part] = items[first_part:]
+        self.size += count
+
+    def dequeue(self):
+        if self.is_empty():
+            print("Error: Trying to dequeue from an empty queue!")
+            return None
+        item = self.buffer[self.head]
+        self.buffer[self.head] = None   # drop the reference so the item can be collected
+        self.head = (self.head + 1) % self.capacity
+        self.size -= 1
+        self._shrink_if_sparse()
+        return item
+
+    def dequeue_many(self, count: int) -> list:
+        """
+        Removes up to `count` items from the front of the queue.
+
+        returns:
+         - list of the removed items, oldest first (shorter than `count` if the queue runs out)
+        """
+        count = min(count, self.size)
+        if count <= 0:
+            return []
+
+        first_part = min(count, self.capacity - self.head)
+        items = self.buffer[self.head:self.head + first_part]
+        self.buffer[self.head:self.head + first_part] = [None] * first_part
+        if first_part < count:
+            rest = count - first_part
+            items += self.buffer[:rest]
+            self.buffer[:rest] = [None] * rest
+
+        self.head = (self.head + count) % self.capacity
+        self.size -= count
+        self._shrink_if_sparse()
+        return items
+
+    def is_empty(self):
+        return self.size == 0
+
+    def _shrink_if_sparse(self) -> None:
+        # Halving only at a quarter full keeps a grow right after a shrink from being possible
+        while self.capacity > self.MIN_CAPACITY and self.size <= self.capacity // 4:
+            self._resize(self.capacity // 2)
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Copies the items (oldest first) into a new buffer of `new_capacity` slots.
+        """
+        end = self.head + self.size
+        if end <= self.capacity:
+            items = self.buffer[self.head:end]
+        else:
+            items = self.buffer[self.head:] + self.buffer[:end - self.capacity]
+        self.buffer = items + [None] * (new_capacity - self.size)
+        self.capacity = new_capacity
+        self.head = 0
+
+
+class ListQueue:
+    """
+    The original list-based queue, kept as a baseline for the benchmarks.
+    `dequeue` is O(n) because `list.pop(0)` shifts every remaining item.
+    """
+
     def __init__(self):
         self.items = []
 
@@ -14,4 +137,3 @@ class Queue:
     def is_empty(self):
         return len(self.items) == 0
 
-
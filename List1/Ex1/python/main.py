@@ -1,5 +1,8 @@
+import asyncio
+import gc
 from lifo import Stack
 from fifo import Queue
+from bounded import AsyncBoundedQueue
 
 def main():
     stack = Stack()
@@ -19,5 +22,18 @@ def main():
         print(queue.dequeue(), end=" ")
     print()
 
+async def check_nowait_wakes_waiter():
+    # A get() waiting without a timeout has to wake up after a put_nowait
+    queue = AsyncBoundedQueue(1)
+    waiter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    queue.put_nowait(42)
+    # The notifier task must survive a collection before it runs
+    gc.collect()
+    item = await asyncio.wait_for(waiter, 1)
+    assert item == 42, f"waiter got {item}"
+    print("put_nowait woke the waiting get()")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    asyncio.run(check_nowait_wakes_waiter())
\ No newline at end of file
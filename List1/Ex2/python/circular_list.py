@@ -1,4 +1,5 @@
 from node import Node
+from node_pool import NodePool
 
 class CircularList:
     """
@@ -8,14 +9,33 @@ class CircularList:
      - insert - adds a new node to the list with the specified value
      - merge - merges two lists
      - print - prints the list
+     - list_search - searches for a value, in O(1) expected time when the list is indexed
+
+    backends:
+     - "node" - every element is a Node object, `final_node` is a Node
+     - "pool" - elements live in a NodePool (parallel int64 arrays), `final_node` is an index into it
     """
 
-    def __init__(self):
-        """ 
+    def __init__(self, indexed: bool = False, backend: str = "node", pool: NodePool = None):
+        """
         Initializes a new instance of the CircularList class.
+
+        params:
+         - indexed: keep a value -> node dictionary (first node holding each value)
+           so that list_search does not have to walk the list
+         - backend: "node" or "pool"
+         - pool: NodePool to allocate from when backend is "pool" (a new one by default);
+           merging lists that share a pool is O(1)
         """
+        if backend not in ("node", "pool"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if pool is not None and backend != "pool":
+            raise ValueError("A pool can only be given with the \"pool\" backend")
+
         self.final_node = None
-        self.node_count = 0 
+        self.node_count = 0
+        self.index = {} if indexed else None
+        self.pool = (pool if pool is not None else NodePool()) if backend == "pool" else None
 
     def print_list(self):
         """
@@ -24,13 +44,10 @@ class CircularList:
         if self.final_node is None:
             print("List is empty.")
             return
-        head = self.final_node.next
-        current = head
-        for _ in range(self.node_count):
-            print(current.value, end=" -> ")
-            current = current.next
+        for _, value in self._walk():
+            print(value, end=" -> ")
         print("(back to head)")
-    
+
     def insert(self, value):
         """
         Adds a new node to the list with the specified value.
@@ -40,32 +57,57 @@ class CircularList:
         params:
          - value: value to be stored in the node
         """
-        new_node = Node(value)
-        if self.final_node is None:
-            self.final_node = new_node
-            self.final_node.next = self.final_node  # point to itself
+        if self.pool is not None:
+            new_node = self._insert_pooled(value)
         else:
-            new_node.next = self.final_node.next    # point to the first node
-            self.final_node.next = new_node         # point to the new node
-            self.final_node = new_node              # update the tail
+            new_node = Node(value)
+            if self.final_node is None:
+                self.final_node = new_node
+                self.final_node.next = self.final_node  # point to itself
+            else:
+                new_node.next = self.final_node.next    # point to the first node
+                self.final_node.next = new_node         # point to the new node
+                self.final_node = new_node              # update the tail
         self.node_count += 1
 
-    def merge(self, other_list) -> None: 
+        if self.index is not None:
+            self.index.setdefault(value, new_node)  # keep the node closest to the head
+
+    def merge(self, other_list) -> None:
         """
         Merges another circular list into this list.
 
         params:
          - other_list: CircularList to be merged into this list
         """
-    
+
+        if (self.pool is None) != (other_list.pool is None):
+            raise ValueError("Cannot merge lists with different backends")
+
+        if other_list.final_node is None:
+            return
+
+        if self.pool is not None and other_list.pool is not self.pool:
+            other_list._move_to_pool(self.pool)
+
+        if self.index is not None:
+            self._merge_index(other_list)
+
         if self.final_node is None:
             self.final_node = other_list.final_node
             self.node_count = other_list.node_count
             return
-        
-        if other_list.final_node is None:
+
+        if self.pool is not None:
+            # Same steps as below, on the link array
+            next_links = self.pool.next
+            self_first_node = next_links[self.final_node]
+            next_links[self.final_node] = next_links[other_list.final_node]
+            next_links[other_list.final_node] = self_first_node
+            self.final_node = other_list.final_node
+            self.node_count += other_list.node_count
             return
-        
+
         # Save the first nodes of both lists
         self_first_node = self.final_node.next
         other_first_node = other_list.final_node.next
@@ -77,7 +119,7 @@ class CircularList:
         # Update the last node of the first list
         self.final_node = other_list.final_node
 
-        # Update size 
+        # Update size
         self.node_count += other_list.node_count
 
     def list_search(self, value):
@@ -88,15 +130,22 @@ class CircularList:
          - value: value to search for
 
         returns:
-         - Tuple (found: bool, comparison_count: int) 
+         - Tuple (found: bool, comparison_count: int)
         """
         if self.final_node is None:
             return (False, 0)
-        
-        # initialize variables 
+
+        # an indexed lookup is a single hash probe
+        if self.index is not None:
+            return (value in self.index, 1)
+
+        if self.pool is not None:
+            return self._search_pooled(value)
+
+        # initialize variables
         comparison_count = 0
         head = self.final_node.next
-        current = head  
+        current = head
 
         # search for the value
         for _ in range(self.node_count):
@@ -104,6 +153,91 @@ class CircularList:
             if current.value == value:
                 return (True, comparison_count)
             current = current.next
-        
+
         return (False, comparison_count)
-    
+
+    def _insert_pooled(self, value) -> int:
+        """
+        insert for the "pool" backend, returns the index of the new node
+        """
+        new_node = self.pool.allocate(value)    # the new node points to itself
+        if self.final_node is not None:
+            next_links = self.pool.next
+            next_links[new_node] = next_links[self.final_node]
+            next_links[self.final_node] = new_node
+        self.final_node = new_node
+        return new_node
+
+    def _search_pooled(self, value):
+        """
+        list_search for the "pool" backend
+        """
+        values = self.pool.value
+        next_links = self.pool.next
+        current = next_links[self.final_node]
+        comparison_count = 0
+        for _ in range(self.node_count):
+            comparison_count += 1
+            if values[current] == value:
+                return (True, comparison_count)
+            current = next_links[current]
+        return (False, comparison_count)
+
+    def _move_to_pool(self, pool: NodePool) -> None:
+        """
+        Copies the nodes of this list (and no other list sharing its pool) into `pool`
+        and translates the node indices.
+        """
+        nodes = [node for node, _ in self._walk()]
+        first = pool.absorb(self.pool, nodes)
+        self.pool = pool
+        self.final_node = first + len(nodes) - 1
+        if self.index is not None:
+            new_nodes = {node: first + position for position, node in enumerate(nodes)}
+            self.index = {value: new_nodes[node] for value, node in self.index.items()}
+
+    def _walk(self):
+        """
+        Yields (node, value) pairs from the head to the tail, for either backend.
+        """
+        if self.final_node is None:
+            return
+        if self.pool is not None:
+            values = self.pool.value
+            next_links = self.pool.next
+            current = next_links[self.final_node]
+            for _ in range(self.node_count):
+                yield current, values[current]
+                current = next_links[current]
+        else:
+            current = self.final_node.next
+            for _ in range(self.node_count):
+                yield current, current.value
+                current = current.next
+
+    def _merge_index(self, other_list) -> None:
+        """
+        Folds the index of `other_list` into the index of this list.
+        The smaller dictionary is inserted into the larger one, so the larger one is never rehashed.
+        Nodes of this list come first after the merge, so they win for values present in both lists.
+        The index of `other_list` is dropped (set to None): its nodes now belong to this list, and a
+        dictionary shared by both lists would be corrupted by a later insert into either of them.
+
+        params:
+         - other_list: non-empty CircularList that is about to be merged into this list
+        """
+        other_index = other_list.index
+        if other_index is None:
+            # the other list was not indexed - index its nodes now, walking from its head
+            other_index = {}
+            for node, value in other_list._walk():
+                other_index.setdefault(value, node)
+
+        if len(other_index) > len(self.index):
+            for value, node in self.index.items():
+                other_index[value] = node
+            self.index = other_index
+        else:
+            for value, node in other_index.items():
+                self.index.setdefault(value, node)
+        other_list.index = None
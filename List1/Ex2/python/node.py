@@ -1,5 +1,7 @@
 
 class Node:
+    __slots__ = ("value", "next")   # no per-instance __dict__, saves ~40 bytes per node
+
     def __init__(self, value):
         """
         this class is a node of a singly linked list
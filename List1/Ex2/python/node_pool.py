@@ -0,0 +1,60 @@
+from array import array
+
+
+class NodePool:
+    """
+    this class stores the nodes of singly linked lists as a struct of arrays
+
+    A node is an integer index into the parallel `value` and `next` buffers, and links
+    are indices as well, so a node costs 16 bytes instead of a Python object.
+    Several lists can share one pool; values have to fit in a signed 64-bit integer.
+
+    variables
+     - value: value stored in each node
+     - next: index of the next node of each node
+    """
+
+    def __init__(self):
+        self.value = array('q')
+        self.next = array('q')
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def allocate(self, value: int) -> int:
+        """
+        Adds a node that links to itself.
+
+        params:
+         - value: value to be stored in the node
+
+        returns:
+         - index of the new node
+        """
+        node = len(self.value)
+        self.value.append(value)
+        self.next.append(node)
+        return node
+
+    def absorb(self, other_pool, nodes) -> int:
+        """
+        Copies some nodes of `other_pool` (the nodes of one list, from its head to its tail)
+        to the end of this pool, linked into a ring in the same order.
+        Nodes of other lists that share `other_pool` are not copied.
+
+        params:
+         - other_pool: NodePool the nodes are copied from
+         - nodes: indices of the nodes in `other_pool`, in list order
+
+        returns:
+         - index of the copy of nodes[0]; the copy of nodes[i] is that index + i
+        """
+        first = len(self.value)
+        values = other_pool.value
+        self.value.extend(array('q', (values[node] for node in nodes)))
+        count = len(self.value) - first
+        if count:
+            last = first + count - 1
+            self.next.extend(range(first + 1, last + 1))
+            self.next.append(first)
+        return first
@@ -0,0 +1,54 @@
+import sys
+import time
+import tracemalloc
+from circular_list import CircularList
+
+BACKENDS = ["node", "pool"]
+
+
+def build(backend: str, n: int) -> CircularList:
+    circular_list = CircularList(backend=backend)
+    for value in range(n):
+        circular_list.insert(value)
+    return circular_list
+
+
+def measure_build_time(backend: str, n: int) -> float:
+    """
+    returns:
+     - seconds needed to insert `n` values
+    """
+    start = time.perf_counter()
+    build(backend, n)
+    return time.perf_counter() - start
+
+
+def measure_memory(backend: str, n: int) -> int:
+    """
+    Builds the list again under tracemalloc (which slows the build down, so it is timed separately).
+
+    returns:
+     - bytes held by the finished list
+    """
+    tracemalloc.start()
+    circular_list = build(backend, n)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del circular_list
+    return used
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    sizes = [10**e for e in range(5, max_exponent + 1)]
+
+    print(f"{'n':>10} {'backend':>8} {'build time':>12} {'memory':>12} {'bytes/node':>11}")
+    for n in sizes:
+        for backend in BACKENDS:
+            elapsed = measure_build_time(backend, n)
+            used = measure_memory(backend, n)
+            print(f"{n:>10} {backend:>8} {elapsed:>11.3f}s {used / 2**20:>9.1f} MiB {used / n:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
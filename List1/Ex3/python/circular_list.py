@@ -1,4 +1,5 @@
 from node import Node
+from node_pool import NodePool
 import random
 
 class CircularList:
@@ -7,16 +8,49 @@ class CircularList:
 
     implements:
      - insert - adds a new node to the list with the specified value
+     - extend / from_iterable - adds a whole batch of values in a single pass
      - merge - merges two lists
      - print - prints the list
+     - list_search - searches for a value, in O(1) expected time when the list is indexed
+
+    backends:
+     - "node" - every element is a Node object, `final_node` is a Node
+     - "pool" - elements live in a NodePool (parallel int64 arrays), `final_node` is an index into it
     """
 
-    def __init__(self):
-        """ 
+    def __init__(self, indexed: bool = False, backend: str = "node", pool: NodePool = None):
+        """
         Initializes a new instance of the CircularList class.
+
+        params:
+         - indexed: keep a value -> node dictionary (first node holding each value)
+           so that list_search does not have to walk the list
+         - backend: "node" or "pool"
+         - pool: NodePool to allocate from when backend is "pool" (a new one by default);
+           merging lists that share a pool is O(1)
         """
+        if backend not in ("node", "pool"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if pool is not None and backend != "pool":
+            raise ValueError("A pool can only be given with the \"pool\" backend")
+
         self.final_node = None
-        self.node_count = 0 
+        self.node_count = 0
+        self.index = {} if indexed else None
+        self.pool = (pool if pool is not None else NodePool()) if backend == "pool" else None
+
+    @classmethod
+    def from_iterable(cls, values, indexed: bool = False, backend: str = "node", pool: NodePool = None):
+        """
+        Builds a list holding `values` in order, linking the whole batch in a single pass.
+
+        params:
+         - values: iterable of values
+         - indexed, backend, pool: as in __init__
+        """
+        circular_list = cls(indexed=indexed, backend=backend, pool=pool)
+        circular_list.extend(values)
+        return circular_list
 
     def print_list(self) -> None:
         """
@@ -25,13 +59,10 @@ class CircularList:
         if self.final_node is None:
             print("List is empty.")
             return
-        head = self.final_node.next
-        current = head
-        for _ in range(self.node_count):
-            print(current.value, end=" <-> ")
-            current = current.next
+        for _, value in self._walk():
+            print(value, end=" <-> ")
         print("(back to head)")
-    
+
     def insert(self, value) -> None:
         """
         Adds a new node to the list with the specified value.
@@ -41,37 +72,88 @@ class CircularList:
         params:
          - value: value to be stored in the node
         """
-        new_node = Node(value)
-        if self.final_node is None:
-            self.final_node = new_node
-            self.final_node.next = self.final_node  # point to itself
-            self.final_node.prev = self.final_node  # point to itself
+        if self.pool is not None:
+            new_node = self._insert_pooled(value)
         else:
-            new_node.next = self.final_node.next    # point to the first node
-            new_node.prev = self.final_node         # point to the tail
+            new_node = Node(value)
+            if self.final_node is None:
+                self.final_node = new_node
+                self.final_node.next = self.final_node  # point to itself
+                self.final_node.prev = self.final_node  # point to itself
+            else:
+                new_node.next = self.final_node.next    # point to the first node
+                new_node.prev = self.final_node         # point to the tail
 
-            self.final_node.next = new_node         # point to the new node
-            new_node.next.prev = new_node           # new node next is the first node, so update its prev
+                self.final_node.next = new_node         # point to the new node
+                new_node.next.prev = new_node           # new node next is the first node, so update its prev
 
-            self.final_node = new_node              # update the tail
+                self.final_node = new_node              # update the tail
         self.node_count += 1
 
-    def merge(self, other_list) -> None: 
+        if self.index is not None:
+            self.index.setdefault(value, new_node)  # keep the node closest to the head
+
+    def extend(self, values) -> None:
+        """
+        Appends every value of `values` at the tail, in order.
+        The batch is linked into a ring of its own first and then spliced in with one merge.
+
+        params:
+         - values: iterable of values
+        """
+        batch = CircularList(backend="node" if self.pool is None else "pool", pool=self.pool)
+        if self.pool is not None:
+            batch._link_pooled(values)
+        else:
+            batch._link_nodes(values)
+
+        if self.index is not None and batch.final_node is not None:
+            batch.index = {}
+            for node, value in batch._walk():
+                batch.index.setdefault(value, node)
+        self.merge(batch)
+
+    def merge(self, other_list) -> None:
         """
         Merges another circular list into this list.
 
         params:
          - other_list: CircularList to be merged into this list
         """
-    
+
+        if (self.pool is None) != (other_list.pool is None):
+            raise ValueError("Cannot merge lists with different backends")
+
+        if other_list.final_node is None:
+            return
+
+        if self.pool is not None and other_list.pool is not self.pool:
+            other_list._move_to_pool(self.pool)
+
+        if self.index is not None:
+            self._merge_index(other_list)
+
         if self.final_node is None:
             self.final_node = other_list.final_node
             self.node_count = other_list.node_count
             return
-        
-        if other_list.final_node is None:
+
+        if self.pool is not None:
+            # Same steps as below, on the link arrays
+            next_links, prev_links = self.pool.next, self.pool.prev
+            self_first_node = next_links[self.final_node]
+            other_first_node = next_links[other_list.final_node]
+
+            next_links[self.final_node] = other_first_node
+            prev_links[other_first_node] = self.final_node
+
+            next_links[other_list.final_node] = self_first_node
+            prev_links[self_first_node] = other_list.final_node
+
+            self.final_node = other_list.final_node
+            self.node_count += other_list.node_count
             return
-        
+
         # Save the first nodes of both lists
         self_first_node = self.final_node.next
         other_first_node = other_list.final_node.next
@@ -86,31 +168,49 @@ class CircularList:
         # Update the last node of the first list
         self.final_node = other_list.final_node
 
-        # Update size 
+        # Update size
         self.node_count += other_list.node_count
 
-    def list_search(self, value) -> tuple[bool, int]:
+    def list_search(self, value, mode: str = "random") -> tuple[bool, int]:
         """
         Searches for a node with the specified value in the list.
-        The seach direction is random.
+
+        modes:
+         - "random" - walk the whole ring in a random direction
+         - "bidirectional" - walk forward from the head and backward from the tail at the same time,
+           stopping where they meet; the walk is at most half the ring long, but every step
+           makes two comparisons
 
         params:
          - value: value to search for
+         - mode: "random" or "bidirectional" (ignored for an indexed list)
 
         returns:
-         - Tuple (found: bool, comparison_count: int) 
+         - Tuple (found: bool, comparison_count: int)
         """
         if self.final_node is None:
             return (False, 0)
-        
-        # initialize variables 
-        comparison_count = 0
-        head = self.final_node.next
-        current = head  
-        
+
+        # an indexed lookup is a single hash probe
+        if self.index is not None:
+            return (value in self.index, 1)
+
+        if mode == "bidirectional":
+            return self._search_bidirectional(value)
+        if mode != "random":
+            raise ValueError(f"Unknown search mode: {mode}")
+
         # randomize the search direction
         direction = random.choice([-1, 1])
 
+        if self.pool is not None:
+            return self._search_pooled(value, direction)
+
+        # initialize variables
+        comparison_count = 0
+        head = self.final_node.next
+        current = head
+
         # search for the value
         for _ in range(self.node_count):
             comparison_count += 1
@@ -121,6 +221,169 @@ class CircularList:
                 current = current.next
             else:
                 current = current.prev
-    
+
         return (False, comparison_count)
-    
+
+    def _search_bidirectional(self, value) -> tuple[bool, int]:
+        """
+        list_search in "bidirectional" mode, for either backend
+        """
+        comparison_count = 0
+        remaining = self.node_count
+
+        if self.pool is not None:
+            values, next_links, prev_links = self.pool.value, self.pool.next, self.pool.prev
+            forward = next_links[self.final_node]
+            backward = self.final_node
+            while remaining > 0:
+                comparison_count += 1
+                if values[forward] == value:
+                    return (True, comparison_count)
+                remaining -= 1
+                if remaining == 0:
+                    break
+                comparison_count += 1
+                if values[backward] == value:
+                    return (True, comparison_count)
+                remaining -= 1
+                forward = next_links[forward]
+                backward = prev_links[backward]
+            return (False, comparison_count)
+
+        forward = self.final_node.next
+        backward = self.final_node
+        while remaining > 0:
+            comparison_count += 1
+            if forward.value == value:
+                return (True, comparison_count)
+            remaining -= 1
+            if remaining == 0:      # odd length, both walks reached the middle node
+                break
+            comparison_count += 1
+            if backward.value == value:
+                return (True, comparison_count)
+            remaining -= 1
+            forward = forward.next
+            backward = backward.prev
+        return (False, comparison_count)
+
+    def _link_nodes(self, values) -> None:
+        """
+        Links Node objects for `values` into this (empty) list in one pass.
+        """
+        first_node = previous = None
+        count = 0
+        for value in values:
+            node = Node(value)
+            if previous is None:
+                first_node = node
+            else:
+                previous.next = node
+                node.prev = previous
+            previous = node
+            count += 1
+        if previous is None:
+            return
+        previous.next = first_node      # close the ring
+        first_node.prev = previous
+        self.final_node = previous
+        self.node_count = count
+
+    def _link_pooled(self, values) -> None:
+        """
+        Allocates `values` as one linked run in the pool of this (empty) list.
+        """
+        first_node, count = self.pool.allocate_run(values)
+        if count == 0:
+            return
+        self.final_node = first_node + count - 1
+        self.node_count = count
+
+    def _insert_pooled(self, value) -> int:
+        """
+        insert for the "pool" backend, returns the index of the new node
+        """
+        new_node = self.pool.allocate(value)    # the new node points to itself
+        if self.final_node is not None:
+            next_links, prev_links = self.pool.next, self.pool.prev
+            first_node = next_links[self.final_node]
+            next_links[new_node] = first_node
+            prev_links[new_node] = self.final_node
+            next_links[self.final_node] = new_node
+            prev_links[first_node] = new_node
+        self.final_node = new_node
+        return new_node
+
+    def _search_pooled(self, value, direction: int) -> tuple[bool, int]:
+        """
+        list_search for the "pool" backend, walking the `next` (1) or `prev` (-1) links
+        """
+        values = self.pool.value
+        links = self.pool.next if direction == 1 else self.pool.prev
+        current = self.pool.next[self.final_node]
+        comparison_count = 0
+        for _ in range(self.node_count):
+            comparison_count += 1
+            if values[current] == value:
+                return (True, comparison_count)
+            current = links[current]
+        return (False, comparison_count)
+
+    def _move_to_pool(self, pool: NodePool) -> None:
+        """
+        Copies the nodes of this list (and no other list sharing its pool) into `pool`
+        and translates the node indices.
+        """
+        nodes = [node for node, _ in self._walk()]
+        first = pool.absorb(self.pool, nodes)
+        self.pool = pool
+        self.final_node = first + len(nodes) - 1
+        if self.index is not None:
+            new_nodes = {node: first + position for position, node in enumerate(nodes)}
+            self.index = {value: new_nodes[node] for value, node in self.index.items()}
+
+    def _walk(self):
+        """
+        Yields (node, value) pairs from the head to the tail, for either backend.
+        """
+        if self.final_node is None:
+            return
+        if self.pool is not None:
+            values = self.pool.value
+            next_links = self.pool.next
+            current = next_links[self.final_node]
+            for _ in range(self.node_count):
+                yield current, values[current]
+                current = next_links[current]
+        else:
+            current = self.final_node.next
+            for _ in range(self.node_count):
+                yield current, current.value
+                current = current.next
+
+    def _merge_index(self, other_list) -> None:
+        """
+        Folds the index of `other_list` into the index of this list.
+        The smaller dictionary is inserted into the larger one, so the larger one is never rehashed.
+        Nodes of this list come first after the merge, so they win for values present in both lists.
+        The index of `other_list` is dropped (set to None): its nodes now belong to this list, and a
+        dictionary shared by both lists would be corrupted by a later insert into either of them.
+
+        params:
+         - other_list: non-empty CircularList that is about to be merged into this list
+        """
+        other_index = other_list.index
+        if other_index is None:
+            # the other list was not indexed - index its nodes now, walking from its head
+            other_index = {}
+            for node, value in other_list._walk():
+                other_index.setdefault(value, node)
+
+        if len(other_index) > len(self.index):
+            for value, node in self.index.items():
+                other_index[value] = node
+            self.index = other_index
+        else:
+            for value, node in other_index.items():
+                self.index.setdefault(value, node)
+        other_list.index = None
@@ -1,5 +1,7 @@
 from circular_list import CircularList
+from node_pool import NodePool
 import random
+import time
 
 def test_insert():
     list = CircularList()
@@ -32,34 +34,133 @@ def test_merge():
     print("\nMerged List:")
     list1.print_list()
 
-def test_search_cost():
+def test_indexed_search():
+    # Values of both lists overlap, so the merged index has to keep the first occurrence
+    list1 = CircularList(indexed=True)
+    list2 = CircularList(indexed=True)
+    for value in range(0, 20):
+        list1.insert(value)
+    for value in range(10, 100):
+        list2.insert(value)
+
+    list1.merge(list2)
+    assert list1.node_count == 110
+    assert list2.index is None  # the merged nodes are indexed by list1 only
+    for value in range(0, 100):
+        assert list1.list_search(value) == (True, 1)
+        assert list1.index[value].value == value
+    assert list1.list_search(100) == (False, 1)
+
+    # The first node holding 15 belongs to list1, walking from the head has to find the same node
+    current = list1.final_node.next
+    while current.value != 15:
+        current = current.next
+    assert list1.index[15] is current
+
+    # Merging an unindexed list indexes its nodes on the fly
+    list3 = CircularList()
+    list3.insert(500)
+    list1.merge(list3)
+    assert list1.list_search(500) == (True, 1)
+
+    # The index of list1 is its own: inserting into the merged lists again must not leak between them
+    list1.insert(1000)
+    list2.insert(2000)
+    assert list1.list_search(1000) == (True, 1)
+    assert list1.list_search(2000) == (False, 1)
+
+def test_pool_backend():
+    # The pool backend has to behave exactly like the node backend
+    values1 = [random.randint(0, 1000) for _ in range(200)]
+    values2 = [random.randint(0, 1000) for _ in range(300)]
+
+    node_list1, node_list2 = CircularList(), CircularList()
+    pool_list1, pool_list2 = CircularList(backend="pool"), CircularList(backend="pool")
+    for value in values1:
+        node_list1.insert(value)
+        pool_list1.insert(value)
+    for value in values2:
+        node_list2.insert(value)
+        pool_list2.insert(value)
+
+    node_list1.merge(node_list2)
+    pool_list1.merge(pool_list2)    # separate pools, so list2 is copied into the pool of list1
+
+    assert pool_list1.node_count == node_list1.node_count == 500
+    assert [value for _, value in pool_list1._walk()] == values1 + values2
+    for value in range(1001):
+        assert pool_list1.list_search(value)[0] == node_list1.list_search(value)[0]
+
+    # Lists sharing a pool are merged without copying
+    shared_list1 = CircularList(backend="pool")
+    shared_list2 = CircularList(backend="pool", pool=shared_list1.pool)
+    shared_list1.insert(1)
+    shared_list2.insert(2)
+    shared_list1.merge(shared_list2)
+    assert len(shared_list1.pool) == 2
+    assert [value for _, value in shared_list1._walk()] == [1, 2]
+
+    # Merging from another pool copies only the nodes of the merged list, not the whole pool
+    target = CircularList(indexed=True, backend="pool")
+    target.insert(0)
+    other = CircularList(indexed=True, backend="pool", pool=shared_list1.pool)
+    other.insert(3)
+    other.insert(4)
+    target.merge(other)
+    assert len(target.pool) == 3
+    assert [value for _, value in target._walk()] == [0, 3, 4]
+    assert target.list_search(4) == (True, 1)
+    assert target.pool.value[target.index[4]] == 4
+
+    # A pool only makes sense with the pool backend
+    try:
+        CircularList(backend="node", pool=NodePool())
+        assert False, "pool= with the node backend has to be rejected"
+    except ValueError:
+        pass
+
+def test_from_iterable():
+    values = [random.randint(0, 1000) for _ in range(101)]
+    for backend in ("node", "pool"):
+        L = CircularList.from_iterable(values, backend=backend)
+        assert L.node_count == len(values)
+        assert [value for _, value in L._walk()] == values
+
+        # Both search modes have to agree on every value
+        for x in range(-1, 1002):
+            found, cost = L.list_search(x, "bidirectional")
+            assert found == (x in values)
+            assert found == L.list_search(x, "random")[0]
+            assert cost <= len(values)
+
+def test_search_cost(indexed: bool = False):
     # Create an array T with 10000 random numbers in the range [0, 100000]
     T = [random.randint(0, 100000) for _ in range(10000)]
     
-    # Insert these numbers into the list L
-    L = CircularList()
-    for num in T:
-        L.insert(num)
-    
-    # Number of search attempts for elements that are definitely in the list
-    num_searches_in_list = 1000
-    total_cost_found = 0
-    for _ in range(num_searches_in_list):
-        x = random.choice(T)  # Choose a random number from T (which is definitely in the list)
-        _, cost = L.list_search(x)  # Search for it in the list and measure the cost
-        total_cost_found += cost
-    
-    avg_cost_found = total_cost_found / num_searches_in_list
-
-    # Number of search attempts for random numbers that may or may not be in the list
-    num_searches_random = 1000
-    total_cost_not_found = 0
-    for _ in range(num_searches_random):
-        x = random.randint(0, 100000)  # Choose a random number, which may or may not be in the list
-        _, cost = L.list_search(x)  # Search for it in the list and measure the cost
-        total_cost_not_found += cost
-    
-    avg_cost_not_found = total_cost_not_found / num_searches_random
+    # Insert these numbers into the list L, linking them in one pass
+    L = CircularList.from_iterable(T, indexed=indexed)
+
+    # Every mode answers the same queries
+    num_searches = 1000
+    queries = {
+        # numbers that are definitely in the list
+        "on the list": [random.choice(T) for _ in range(num_searches)],
+        # random numbers, which may or may not be in the list
+        "not on the list": [random.randint(0, 100000) for _ in range(num_searches)],
+    }
+
+    # The search mode is irrelevant for an indexed list
+    modes = ["random"] if indexed else ["random", "bidirectional"]
+
+    for mode in modes:
+        print(f"\n{'Indexed' if indexed else 'Linear'} search ({mode}):")
+        for label, values in queries.items():
+            total_cost = 0
+            start = time.perf_counter()
+            for x in values:
+                _, cost = L.list_search(x, mode)  # Search for it in the list and measure the cost
+                total_cost += cost
+            elapsed = time.perf_counter() - start
 
-    print(f"\nAverage comparisons for numbers that are on the list: {avg_cost_found}")
-    print(f"Average comparisons for numbers that are not on the list: {avg_cost_not_found}")
+            print(f"Average comparisons for numbers that are {label}: {total_cost / num_searches}, "
+                  f"average time: {elapsed / num_searches * 1e6:.1f} us")
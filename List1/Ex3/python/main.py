@@ -1,4 +1,4 @@
-from list_tests import test_insert, test_merge, test_search_cost
+from list_tests import test_insert, test_merge, test_indexed_search, test_pool_backend, test_from_iterable, test_search_cost
     
 
 def main():
@@ -8,7 +8,17 @@ def main():
     test_merge()
     print("Merge tests passed.")
 
+    test_indexed_search()
+    print("Indexed search tests passed.")
+
+    test_pool_backend()
+    print("Pool backend tests passed.")
+
+    test_from_iterable()
+    print("Bulk construction tests passed.")
+
     test_search_cost()
+    test_search_cost(indexed=True)
     print("Search cost tests passed.")
 
 
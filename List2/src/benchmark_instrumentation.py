@@ -0,0 +1,61 @@
+import random
+import sys
+import time
+import utils.counters as counters
+from utils.instrumentation import uninstrumented
+from insertion_sort import insertion_sort
+from quick_sort import quick_sort
+from dual_pivot_qs import dual_pivot_quick_sort
+from merge_sort import merge_sort
+from hybrid_sort import hybrid_sort
+
+# (name, sort function, extra arguments after (array, low, high))
+SORTS = [
+    ("insertion_sort", insertion_sort, ()),
+    ("quick_sort", quick_sort, ()),
+    ("dual_pivot", dual_pivot_quick_sort, ()),
+    ("merge_sort", merge_sort, ()),
+    ("hybrid_sort", hybrid_sort, (10,)),
+]
+
+# insertion_sort is quadratic, it gets a smaller input
+INSERTION_SORT_LIMIT = 2000
+
+
+def time_sort(sort_function, extra_args: tuple, data: list, repetitions: int, **kwargs) -> float:
+    """
+    Sorts a fresh copy of `data` `repetitions` times.
+
+    Returns:
+        float: Best time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repetitions):
+        array = data.copy()
+        start = time.perf_counter()
+        sort_function(array, 0, len(array) - 1, *extra_args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"{'algorithm':>15} {'n':>7} {'globals':>10} {'Counters':>10} {'uninstr.':>10} {'overhead':>9}")
+    for name, sort_function, extra_args in SORTS:
+        size = min(n, INSERTION_SORT_LIMIT) if sort_function is insertion_sort else n
+        data = list(range(1, size + 1))
+        random.shuffle(data)
+
+        counters.reset_counters()
+        global_time = time_sort(sort_function, extra_args, data, repetitions)
+        context_time = time_sort(sort_function, extra_args, data, repetitions, counter=counters.Counters())
+        plain_time = time_sort(uninstrumented(sort_function), extra_args, data, repetitions)
+
+        print(f"{name:>15} {size:>7} {global_time:>9.4f}s {context_time:>9.4f}s {plain_time:>9.4f}s "
+              f"{global_time / plain_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
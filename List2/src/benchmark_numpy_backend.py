@@ -0,0 +1,77 @@
+import sys
+import time
+import numpy as np
+import utils.counters as counters
+import numpy_backend
+from utils.instrumentation import uninstrumented
+from quick_sort import quick_sort
+from dual_pivot_qs import dual_pivot_quick_sort
+from merge_sort import merge_sort
+from hybrid_sort import hybrid_sort
+
+HYBRID_THRESHOLD = 10
+
+# The pure Python sorts are only timed up to this size
+PYTHON_LIMIT = 10**6
+
+# Comparison counts of both paths are compared up to this size
+COUNT_LIMIT = 10**5
+
+# (name, pure Python sort, NumPy backend sort, extra arguments after (array, low, high))
+SORTS = [
+    ("quick_sort", quick_sort, numpy_backend.quick_sort, ()),
+    ("dual_pivot", dual_pivot_quick_sort, numpy_backend.dual_pivot_quick_sort, ()),
+    ("merge_sort", merge_sort, numpy_backend.merge_sort, ()),
+    ("hybrid_sort", hybrid_sort, numpy_backend.hybrid_sort, (HYBRID_THRESHOLD,)),
+]
+
+
+def time_sort(sort_function, extra_args: tuple, array) -> float:
+    """
+    Sorts `array` in place.
+
+    Returns:
+        float: Time in seconds.
+    """
+    start = time.perf_counter()
+    sort_function(array, 0, len(array) - 1, *extra_args)
+    return time.perf_counter() - start
+
+
+def count_comparisons(sort_function, extra_args: tuple, array) -> int:
+    """Sorts `array` in place with a Counters instance and returns its comparison count."""
+    counter = counters.Counters()
+    sort_function(array, 0, len(array) - 1, *extra_args, counter=counter)
+    return counter.comparison_count
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    rng = np.random.default_rng(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+
+    print(f"{'algorithm':>12} {'n':>9} {'python':>9} {'numpy':>9} {'np.sort':>9} {'speedup':>8}  comparisons (python / numpy)")
+    for n in [10**e for e in range(4, max_exponent + 1)]:
+        data = rng.integers(0, 2**62, n, dtype=np.int64)
+        library_time = time_sort(lambda array, low, high: array.sort(), (), data.copy())
+
+        for name, python_sort, backend_sort, extra_args in SORTS:
+            array = data.copy()
+            backend_time = time_sort(backend_sort, extra_args, array)
+            if not np.all(array[:-1] <= array[1:]):
+                print(f"{name:>12} {n:>9} NOT sorted by the NumPy backend")
+                continue
+
+            python_time = speedup = comparisons = ""
+            if n <= PYTHON_LIMIT:
+                elapsed = time_sort(uninstrumented(python_sort), extra_args, data.tolist())
+                python_time = f"{elapsed:.3f}s"
+                speedup = f"{elapsed / backend_time:.1f}x"
+            if n <= COUNT_LIMIT:
+                comparisons = (f"{count_comparisons(python_sort, extra_args, data.tolist())} / "
+                               f"{count_comparisons(backend_sort, extra_args, data.copy())}")
+
+            print(f"{name:>12} {n:>9} {python_time:>9} {backend_time:>8.3f}s {library_time:>8.3f}s {speedup:>8}  {comparisons}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import time
+from utils.instrumentation import uninstrumented
+from merge_sort import merge_sort
+from parallel_sort import parallel_sort, METHODS
+
+WORKER_COUNTS = [1, 2, 4, 8, 16, 32]
+
+# The single process merge_sort baseline is only timed up to this size
+SEQUENTIAL_LIMIT = 10**7
+
+
+def time_call(function, *args, **kwargs) -> float:
+    """
+    Returns:
+        float: Time of one call in seconds.
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    if len(sys.argv) > 2:
+        worker_counts = [int(count) for count in sys.argv[2].split(",")]
+    else:
+        worker_counts = [count for count in WORKER_COUNTS if count <= os.cpu_count()]
+
+    print(f"{os.cpu_count()} cores")
+    print(f"{'n':>10} {'method':>7} {'workers':>8} {'time':>9} {'speedup':>8} {'vs merge_sort':>14}")
+    for n in [10**e for e in range(6, max_exponent + 1)]:
+        data = [random.getrandbits(62) for _ in range(n)]
+
+        sequential_time = None
+        if n <= SEQUENTIAL_LIMIT:
+            sequential_time = time_call(uninstrumented(merge_sort), data.copy(), 0, n - 1)
+            print(f"{n:>10} {'-':>7} {'-':>8} {sequential_time:>8.2f}s {'':>8} {'1.00x':>14}")
+
+        for method in METHODS:
+            single_worker_time = None
+            for workers in worker_counts:
+                elapsed = time_call(parallel_sort, data.copy(), 0, n - 1, workers, method)
+                single_worker_time = single_worker_time or elapsed
+                versus_sequential = f"{sequential_time / elapsed:.2f}x" if sequential_time else "-"
+                print(f"{n:>10} {method:>7} {workers:>8} {elapsed:>8.2f}s "
+                      f"{single_worker_time / elapsed:>7.2f}x {versus_sequential:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import random
+import sys
+import time
+import utils.counters as counters
+from utils.instrumentation import uninstrumented
+from quick_sort import quick_sort, PARTITION_SCHEMES
+from hybrid_sort import hybrid_sort
+
+HYBRID_THRESHOLD = 10
+
+# Counting runs are several times slower, above this size only the time is measured
+COUNT_LIMIT = 10**5
+
+INPUTS = {
+    # same keys as generators/generate_random.py
+    "low_cardinality": lambda n: [random.randint(1, 100) for _ in range(n)],
+    "sorted": lambda n: list(range(1, n + 1)),
+    "reversed": lambda n: list(range(n, 0, -1)),
+}
+
+SORTS = [
+    ("quick_sort", quick_sort, ()),
+    ("hybrid_sort", hybrid_sort, (HYBRID_THRESHOLD,)),
+]
+
+
+def measure(sort_function, extra_args: tuple, data: list, partition_scheme: str) -> str:
+    """
+    Sorts copies of `data` with the uninstrumented sort (timed) and, for small inputs,
+    with a Counters instance.
+
+    Returns:
+        str: Formatted time and comparison count.
+    """
+    plain_sort = uninstrumented(sort_function)   # compiled once, outside the timed region
+    array = data.copy()
+    start = time.perf_counter()
+    try:
+        plain_sort(array, 0, len(array) - 1, *extra_args, partition_scheme=partition_scheme)
+    except RecursionError:
+        return "recursion limit"
+    elapsed = time.perf_counter() - start
+
+    comparisons = ""
+    if len(data) <= COUNT_LIMIT:
+        counter = counters.Counters()
+        sort_function(data.copy(), 0, len(data) - 1, *extra_args, counter=counter, partition_scheme=partition_scheme)
+        comparisons = f", {counter.comparison_count} comparisons"
+    return f"{elapsed:.3f}s{comparisons}"
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    sizes = [10**e for e in range(3, max_exponent + 1)]
+
+    for input_name, generate in INPUTS.items():
+        print(f"\n{input_name}:")
+        for n in sizes:
+            data = generate(n)
+            for name, sort_function, extra_args in SORTS:
+                for partition_scheme in PARTITION_SCHEMES:
+                    result = measure(sort_function, extra_args, data, partition_scheme)
+                    print(f"  n={n:<9} {name:<12} {partition_scheme:<10} {result}")
+
+
+if __name__ == "__main__":
+    main()
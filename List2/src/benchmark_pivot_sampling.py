@@ -0,0 +1,101 @@
+import random
+import sys
+import time
+import utils.counters as counters
+import dual_pivot_qs
+from utils.instrumentation import uninstrumented
+from dual_pivot_qs import dual_pivot_quick_sort, PIVOT_SAMPLINGS
+
+# Counting runs are several times slower, above this size only the time is measured
+COUNT_LIMIT = 10**5
+
+# The old chooser scans the array from index 0 on every partition, it is quadratic
+LEGACY_LIMIT = 10**5
+
+INPUTS = {
+    # same keys as generators/generate_random.py
+    "random": lambda n: random.sample(range(1, 2 * n + 1), n),
+    "low_cardinality": lambda n: [random.randint(1, 100) for _ in range(n)],
+    "sorted": lambda n: list(range(1, n + 1)),
+}
+
+
+def legacy_choose_two_pivots(array_to_sort, low, high, pivot_sampling="five"):
+    """
+    The chooser dual_pivot_qs used before: five samples, located again with list.index.
+    It may return an index outside [low, high] when the array holds duplicates.
+    """
+    mid = (low + high) // 2
+    candidates = [array_to_sort[low], array_to_sort[mid], array_to_sort[high],
+                  array_to_sort[low+1] if low+1 <= high else None,
+                  array_to_sort[high-1] if high-1 >= low else None]
+    candidates = sorted(x for x in candidates if x is not None)
+    return array_to_sort.index(candidates[1]), array_to_sort.index(candidates[3])
+
+
+def measure_current(data: list, pivot_sampling: str) -> str:
+    """
+    Sorts copies of `data` with the uninstrumented sort (timed) and, for small inputs,
+    with a Counters instance.
+
+    Returns:
+        str: Formatted time and comparison count.
+    """
+    plain_sort = uninstrumented(dual_pivot_quick_sort)   # compiled once, outside the timed region
+    array = data.copy()
+    start = time.perf_counter()
+    try:
+        plain_sort(array, 0, len(array) - 1, pivot_sampling=pivot_sampling)
+    except RecursionError:
+        return "recursion limit"
+    elapsed = time.perf_counter() - start
+
+    comparisons = ""
+    if len(data) <= COUNT_LIMIT:
+        counter = counters.Counters()
+        dual_pivot_quick_sort(data.copy(), 0, len(data) - 1, counter, pivot_sampling)
+        comparisons = f", {counter.comparison_count} comparisons"
+    return f"{elapsed:.3f}s{comparisons}"
+
+
+def measure_legacy(data: list) -> str:
+    """
+    Sorts a copy of `data` with the old pivot chooser swapped into dual_pivot_qs.
+    The instrumented sort is used, so the time includes counting.
+
+    Returns:
+        str: Formatted time, comparison count and whether the result is sorted.
+    """
+    if len(data) > LEGACY_LIMIT:
+        return "skipped"
+    counter = counters.Counters()
+    array = data.copy()
+    current_chooser = dual_pivot_qs.choose_two_pivots_without_sorting
+    dual_pivot_qs.choose_two_pivots_without_sorting = legacy_choose_two_pivots
+    start = time.perf_counter()
+    try:
+        dual_pivot_quick_sort(array, 0, len(array) - 1, counter)
+    except RecursionError:
+        return "recursion limit"
+    finally:
+        dual_pivot_qs.choose_two_pivots_without_sorting = current_chooser
+    elapsed = time.perf_counter() - start
+    result = "sorted" if array == sorted(data) else "NOT sorted"
+    return f"{elapsed:.3f}s (counted), {counter.comparison_count} comparisons, {result}"
+
+
+def main():
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    sizes = [10**e for e in range(5, max_exponent + 1)]
+
+    for input_name, generate in INPUTS.items():
+        print(f"\n{input_name}:")
+        for n in sizes:
+            data = generate(n)
+            print(f"  n={n:<9} {'legacy .index':<17} {measure_legacy(data)}")
+            for pivot_sampling in PIVOT_SAMPLINGS:
+                print(f"  n={n:<9} {pivot_sampling:<17} {measure_current(data, pivot_sampling)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,41 @@ from typing import List
 import sys
 import random
 import utils.counters as counters
+import utils.binary_io as binary_io
 
+PIVOT_SAMPLINGS = ("five", "tertiles_of_five", "tertiles_of_nine", "adaptive")
 
-def dual_pivot_quick_sort(array_to_sort: List[int], low: int, high: int) -> None:
+# "adaptive" sampling switches from five to nine samples at this subarray size
+ADAPTIVE_NINE_THRESHOLD = 1000
+
+
+def dual_pivot_quick_sort(array_to_sort: List[int], low: int, high: int, counter=counters,
+                          pivot_sampling: str = "five") -> None:
     """
     Implements the dual-pivot quick sort algorithm to sort an array in place.
-    This version uses the median of three to choose the two pivots.
+    The two pivots are the tertiles of a small sample, see choose_two_pivots_without_sorting.
 
     Parameters:
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the array segment to be sorted.
         high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+        pivot_sampling (str): One of PIVOT_SAMPLINGS.
 
     Returns:
         None - It sorts the array in place.
     """
+    if pivot_sampling not in PIVOT_SAMPLINGS:
+        raise ValueError(f"Unknown pivot sampling: {pivot_sampling}")
     if low < high:
-        pivot_1, pivot_2 = dual_partition(array_to_sort, low, high)
-        dual_pivot_quick_sort(array_to_sort, low, pivot_1 - 1)
-        dual_pivot_quick_sort(array_to_sort, pivot_1 + 1, pivot_2 - 1)
-        dual_pivot_quick_sort(array_to_sort, pivot_2 + 1, high)
+        pivot_1, pivot_2 = dual_partition(array_to_sort, low, high, counter, pivot_sampling)
+        dual_pivot_quick_sort(array_to_sort, low, pivot_1 - 1, counter, pivot_sampling)
+        dual_pivot_quick_sort(array_to_sort, pivot_1 + 1, pivot_2 - 1, counter, pivot_sampling)
+        dual_pivot_quick_sort(array_to_sort, pivot_2 + 1, high, counter, pivot_sampling)
 
-def dual_partition(array_to_sort: List[int], low: int, high: int) -> tuple:
+def dual_partition(array_to_sort: List[int], low: int, high: int, counter=counters,
+                   pivot_sampling: str = "five") -> tuple:
     """
     Partitions the array into three sub-arrays based on two pivots 
 
@@ -31,21 +44,25 @@ def dual_partition(array_to_sort: List[int], low: int, high: int) -> tuple:
         array_to_sort (List[int]): The array to be partitioned.
         low (int): The starting index of the partition.
         high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
+        pivot_sampling (str): How the pivots are sampled, see choose_two_pivots_without_sorting.
     """
     # Choose two pivots 
-    lower_pivot_index, high_pivot_index = choose_two_pivots_without_sorting(array_to_sort, low, high)
+    lower_pivot_index, high_pivot_index = choose_two_pivots_without_sorting(array_to_sort, low, high, pivot_sampling)
  
     # Swap the pivots with the first and last elements
-    counters.swap(array_to_sort, low, lower_pivot_index)
-    counters.swap(array_to_sort, high, high_pivot_index)
+    counter.swap(array_to_sort, low, lower_pivot_index)
+    if high_pivot_index == low:
+        high_pivot_index = lower_pivot_index  # the higher pivot was just moved out of the way
+    counter.swap(array_to_sort, high, high_pivot_index)
 
     # Ensure the lower pivot is less than the higher pivot
     pivot_low = array_to_sort[low]
     pivot_high = array_to_sort[high]
 
     # Ensure the pivots are in the correct order
-    if counters.compare(pivot_high, pivot_low):
-        counters.swap(array_to_sort, low, high)  
+    if counter.compare(pivot_high, pivot_low):
+        counter.swap(array_to_sort, low, high)  
         pivot_low, pivot_high = pivot_high, pivot_low
 
 
@@ -56,49 +73,73 @@ def dual_partition(array_to_sort: List[int], low: int, high: int) -> tuple:
 
     # Loop through the array and partition it into three sections
     while current_pointer <= right_pointer:
-        if counters.compare(array_to_sort[current_pointer], pivot_low):
-            counters.swap(array_to_sort, current_pointer, left_pointer)
+        if counter.compare(array_to_sort[current_pointer], pivot_low):
+            counter.swap(array_to_sort, current_pointer, left_pointer)
             left_pointer += 1
             current_pointer += 1
-        elif counters.compare(pivot_high, array_to_sort[current_pointer]):
-            counters.swap(array_to_sort, current_pointer, right_pointer)
+        elif counter.compare(pivot_high, array_to_sort[current_pointer]):
+            counter.swap(array_to_sort, current_pointer, right_pointer)
             right_pointer -= 1
         else:
             current_pointer += 1
     
     # Swap the pivots to their correct positions
-    counters.swap(array_to_sort, low, left_pointer - 1)
-    counters.swap(array_to_sort, high, right_pointer + 1)
+    counter.swap(array_to_sort, low, left_pointer - 1)
+    counter.swap(array_to_sort, high, right_pointer + 1)
 
     # Return the indices of the pivots
     return left_pointer - 1, right_pointer + 1  
 
-def choose_two_pivots_without_sorting(array_to_sort: List[int], low: int, high: int):
-    # Select 5 elements (low, mid, high, and their neighbors)
-    mid = (low + high) // 2
-    candidates = [array_to_sort[low], array_to_sort[mid], array_to_sort[high], 
-                  array_to_sort[low+1] if low+1 <= high else None, 
-                  array_to_sort[high-1] if high-1 >= low else None]
-    
-    # Remove None if low+1 or high-1 is out of bounds
-    candidates = [x for x in candidates if x is not None]
-    
-    # Now select 2 elements, e.g., the median of the first 3
-    candidates_sorted = sorted(candidates)
-    pivot_low = candidates_sorted[1]  # Second smallest
-    pivot_high = candidates_sorted[3]  # Fourth smallest
-
-    # Find the original indices
-    pivot_low_index = array_to_sort.index(pivot_low)
-    pivot_high_index = array_to_sort.index(pivot_high)
-    
-    return pivot_low_index, pivot_high_index
+def choose_two_pivots_without_sorting(array_to_sort: List[int], low: int, high: int,
+                                      pivot_sampling: str = "five") -> tuple:
+    """
+    Chooses two pivots as the tertiles of a sample of the subarray.
+    The sample positions are tracked while ordering it, so the pivots are found in O(1)
+    and always lie in [low, high]. Like the median of three in quick_sort, ordering
+    the sample is not counted.
+
+    Samplings:
+        "five" - low, low + 1, middle, high - 1, high; pivots are the 2nd and 4th smallest
+        "tertiles_of_five" - 5 evenly spaced elements; pivots are the 2nd and 4th smallest
+        "tertiles_of_nine" - 9 evenly spaced elements; pivots are the 3rd and 7th smallest
+        "adaptive" - tertiles of five below ADAPTIVE_NINE_THRESHOLD elements, of nine above
+
+    Parameters:
+        array_to_sort (List[int]): The array to be partitioned.
+        low (int): The starting index of the subarray.
+        high (int): The ending index of the subarray (low < high).
+        pivot_sampling (str): One of PIVOT_SAMPLINGS.
+
+    Returns:
+        tuple: Two different indices in [low, high], of the lower and of the higher pivot.
+    """
+    size = high - low + 1
+    if pivot_sampling == "adaptive":
+        pivot_sampling = "tertiles_of_nine" if size >= ADAPTIVE_NINE_THRESHOLD else "tertiles_of_five"
+
+    sample_size = 9 if pivot_sampling == "tertiles_of_nine" else 5
+    if size < sample_size:
+        # Too small to sample, the ends are as good as any other pair
+        return low, high
+
+    if pivot_sampling == "five":
+        mid = (low + high) // 2
+        positions = [low, low + 1, mid, high - 1, high]
+    else:
+        # The middle of each of sample_size equal slices
+        positions = [low + (2 * slice_number + 1) * size // (2 * sample_size) for slice_number in range(sample_size)]
+
+    positions.sort(key=lambda position: array_to_sort[position])
+    if sample_size == 9:
+        return positions[2], positions[6]
+    return positions[1], positions[3]
 
 
 if __name__ == "__main__":
-    input_data = sys.stdin.read().splitlines()
-    n = int(input_data[0].strip())
-    array = list(map(int, input_data[1].split()))
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
     
     if n < 40:
         print("Initial array:", " ".join(str(x) for x in array))
@@ -112,9 +153,11 @@ if __name__ == "__main__":
     print(f"Total comparisons: {counters.comparison_count}")
     print(f"Total swaps: {counters.swap_count}")
 
-    original_array = array[:]  # Make a copy of the original array
-    # Check if the result is a sorted version of the input
-    if array == sorted(original_array):
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
         print("The array is correctly sorted.")
     else:
-        print("The array is NOT correctly sorted.")
\ No newline at end of file
+        print("The array is NOT correctly sorted.")
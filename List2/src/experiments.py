@@ -4,13 +4,39 @@ import matplotlib.pyplot as plt
 from insertion_sort import insertion_sort
 from quick_sort import quick_sort
 from dual_pivot_qs import dual_pivot_quick_sort
-from List3.src.my_sort import my_merge_sort
-from merge_sort import merge_sort
+from merge_sort import merge_sort, natural_merge_sort
 from hybrid_sort import hybrid_sort
+import hybrid_sort as hybrid_sort_module
+from radix_sort import integer_sort, counting_sort, radix_sort
 import utils.counters as counters
+from utils.instrumentation import uninstrumented
+from threshold_tuner import DEFAULT_KEY_TYPES, measure_thresholds
+from utils.threshold_cache import store_threshold, cached_threshold
+from utils.results_store import RESULTS_PATH, load_results, append_result, code_hash
+from utils.input_pool import InputPool, attach
+from utils.profiling import profile, write_records, read_records
+import argparse
 import concurrent.futures
+import os
+import time
 
-def run_experiment(sort_function, n: int, k: int, threshold: int = 5) -> tuple:
+# Algorithms of the comparison / swap experiments, by the name used on the command line and in
+# the results store. "hybrid_sort:<threshold>" runs hybrid_sort with that threshold.
+ALGORITHMS = {
+    'insertion_sort': insertion_sort,
+    'quick_sort': quick_sort,
+    'hybrid_sort': hybrid_sort,
+    'dual_pivot': dual_pivot_quick_sort,
+    'merge_sort': merge_sort,
+    'natural_merge_sort': natural_merge_sort,
+}
+
+DEFAULT_ALGORITHMS = ('merge_sort', 'natural_merge_sort')
+
+# Profile records of experiment_profile (time, peak memory, recursion depth and counts per call)
+PROFILE_PATH = os.path.join(os.path.dirname(RESULTS_PATH), "profile_results.csv")
+
+def run_experiment(sort_function, n: int, k: int, threshold: int = None, seed: int = None, inputs: InputPool = None) -> tuple:
     """
     Run sorting experiment for a given sorting function and return the average number of comparisons and swaps.
     
@@ -18,21 +44,28 @@ def run_experiment(sort_function, n: int, k: int, threshold: int = 5) -> tuple:
         sort_function: Sorting function to be tested (insertion_sort, quick_sort, hybrid_sort, etc.)
         n (int): Number of elements to sort.
         k (int): Number of repetitions to average.
-        threshold (int): Threshold value for hybrid_sort (if applicable).
+        threshold (int): Threshold value for hybrid_sort (if applicable), None for the tuned one.
+        seed (int): Seed of the shuffles, so that a cell can be reproduced; None for an unseeded run.
+        inputs (InputPool): Pre-generated permutations to sort (trial i of size n in repetition i)
+                            instead of shuffling; `seed` is not used then.
     
     Returns:
         tuple: (average_comparisons, average_swaps)
     """
     comparisons_list = []
     swaps_list = []
+    generator = random.Random(seed)
     
     # Generate the initial array once (values from 1 to n)
     original_array = list(range(1, n + 1))
     
-    for _ in range(k):
-        # Copy and shuffle the array for each repetition
-        array = original_array.copy()
-        random.shuffle(array)
+    for repetition in range(k):
+        if inputs is not None:
+            array = inputs.trial(repetition, n)
+        else:
+            # Copy and shuffle the array for each repetition
+            array = original_array.copy()
+            generator.shuffle(array)
         counters.reset_counters()
         
         if sort_function == hybrid_sort:
@@ -49,89 +82,162 @@ def run_experiment(sort_function, n: int, k: int, threshold: int = 5) -> tuple:
     return avg_comparisons, avg_swaps
 
 
-def run_experiment_for_size(size: int, k: int) -> dict:
+def parse_algorithm(algorithm: str) -> tuple:
     """
-    Run experiments for a given size for all sorting algorithms.
-    
-    Returns a dictionary with keys for each algorithm.
+    Returns:
+        tuple: (sort function, threshold) of a name from ALGORITHMS, e.g. "hybrid_sort:6".
+    """
+    name, _, threshold = algorithm.partition(':')
+    if name not in ALGORITHMS or (threshold and name != 'hybrid_sort'):
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    return ALGORITHMS[name], int(threshold) if threshold else None
+
+
+def algorithm_hash(algorithm: str) -> str:
+    """
+    Code hash (utils.results_store.code_hash) a cell of the algorithm is stored under. A plain
+    "hybrid_sort" runs with the threshold tuned for int keys and the counted backend, which is
+    kept in hybrid_thresholds.json rather than in the source, so that threshold is hashed too
+    and re-tuning it measures the cells again.
+    """
+    sort_function, threshold = parse_algorithm(algorithm)
+    if sort_function == hybrid_sort and threshold is None:
+        return code_hash(sort_function, (cached_threshold("int", hybrid_sort_module.BACKEND),))
+    return code_hash(sort_function)
+
+
+def run_cell(algorithm: str, size: int, k: int, inputs_spec: tuple) -> tuple:
+    """
+    Run one cell of an experiment: k repetitions of one algorithm on one size, on the inputs
+    of the shared InputPool described by inputs_spec. Takes the algorithm and the pool by
+    name, so that it can be sent to a worker process.
+    """
+    sort_function, threshold = parse_algorithm(algorithm)
+    return tuple(float(value) for value in run_experiment(sort_function, size, k, threshold, inputs=attach(inputs_spec)))
+
+
+def run_cells(sizes: list, k: int, algorithms=DEFAULT_ALGORITHMS, seed: int = 0,
+              store: str = RESULTS_PATH, workers: int = 1) -> dict:
+    """
+    Run every (algorithm, size) cell that is not in the results store yet and append each one
+    to the store as soon as it is finished, so an interrupted experiment resumes where it stopped.
+
+    The inputs of all cells are generated up front from the seed into a shared InputPool, so
+    every algorithm sorts the same k permutations of a size and the workers generate nothing.
+
+    A cell is stored under (algorithm, n, k, seed, code hash); the code hash (see
+    algorithm_hash) changes with the source of the sort and with the tuned threshold of a plain
+    hybrid_sort, so results of an older version of a sort are measured again instead of being reused.
+
+    Parameters:
+        sizes (list): Sizes of the arrays.
+        k (int): Number of repetitions of every cell.
+        algorithms: Names from ALGORITHMS.
+        seed (int): Seed of the input pool.
+        store (str): Path of the results store (CSV).
+        workers (int): Number of processes running cells, 1 runs them in this process.
+
+    Returns:
+        dict: {algorithm: [(size, comparisons, swaps), ...]} sorted by size.
+    """
+    hashes = {algorithm: algorithm_hash(algorithm) for algorithm in algorithms}
+    done = load_results(store)
+    cells = [(algorithm, size) for size in sizes for algorithm in algorithms
+             if (algorithm, size, k, seed, hashes[algorithm]) not in done]
+    print(f"{len(sizes) * len(algorithms) - len(cells)} cells found in {store}, {len(cells)} to run...")
+
+    def finish(algorithm, size, result):
+        key = (algorithm, size, k, seed, hashes[algorithm])
+        append_result(key, result, store)
+        done[key] = result
+
+    if cells:
+        with InputPool({size for _, size in cells}, k, seed) as inputs:
+            if workers == 1:
+                for algorithm, size in cells:
+                    print(f"Running {algorithm} for n={size}, k={k}...")
+                    finish(algorithm, size, run_cell(algorithm, size, k, inputs.spec))
+            else:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                    # Submit a task for each cell
+                    futures = {executor.submit(run_cell, algorithm, size, k, inputs.spec): (algorithm, size)
+                               for algorithm, size in cells}
+                    for future in concurrent.futures.as_completed(futures):
+                        algorithm, size = futures[future]
+                        try:
+                            finish(algorithm, size, future.result())
+                        except Exception as exc:
+                            print(f"{algorithm} for size {size} generated an exception: {exc}")
+
+    return {algorithm: [(size, *done[(algorithm, size, k, seed, hashes[algorithm])]) for size in sizes
+                        if (algorithm, size, k, seed, hashes[algorithm]) in done]
+            for algorithm in algorithms}
+
+
+def stored_results(algorithms=None, k: int = None, store: str = RESULTS_PATH) -> dict:
+    """
+    Read the results of the current code of the algorithms from the store, without running anything.
+    When a size was measured with several k or seeds, the row stored last wins.
+
+    Parameters:
+        algorithms: Names from ALGORITHMS, None for every algorithm in the store.
+        k (int): Only rows with this number of repetitions, None for any.
+        store (str): Path of the results store.
+
+    Returns:
+        dict: {algorithm: [(size, comparisons, swaps), ...]} sorted by size.
     """
-    print(f"Running experiment for size {size} with {k} repetitions...")
     results = {}
-    #results['quick_sort'] = run_experiment(quick_sort, size, k)
-    #results['hybrid_sort'] = run_experiment(hybrid_sort, size, k, threshold=6)
-    #results['dual_pivot'] = run_experiment(dual_pivot_quick_sort, size, k)
-    results['merge_sort'] = run_experiment(merge_sort, size, k)
-    results['my_merge_sort'] = run_experiment(my_merge_sort, size, k)
-    return {size: results}
+    hashes = {}
+    for (algorithm, size, row_k, _, row_hash), (comparisons, swaps) in load_results(store).items():
+        if (algorithms is not None and algorithm not in algorithms) or (k is not None and row_k != k):
+            continue
+        try:
+            if algorithm not in hashes:
+                hashes[algorithm] = algorithm_hash(algorithm)
+        except ValueError:
+            continue  # An algorithm that no longer exists
+        if row_hash == hashes[algorithm]:
+            results.setdefault(algorithm, {})[size] = (comparisons, swaps)
+    return {algorithm: [(size, *values) for size, values in sorted(by_size.items())]
+            for algorithm, by_size in results.items()}
 
 
-def experiment_for_big_sizes_parallel() -> dict:
+def experiment_for_big_sizes_parallel(algorithms=DEFAULT_ALGORITHMS, store: str = RESULTS_PATH) -> dict:
     sizes = [i for i in range(1000, 50001, 1000)]
     k = 10 # Number of repetitions for each size
-    combined_results = {
-    #    'quick_sort': [],
-    #    'hybrid_sort': [],
-    #    'dual_pivot': [],
-        'merge_sort': [],
-        'my_merge_sort': []
-    }
-    
-    with concurrent.futures.ProcessPoolExecutor(max_workers=20) as executor:
-        # Submit a task for each size
-        futures = {executor.submit(run_experiment_for_size, size, k): size for size in sizes}
-        for future in concurrent.futures.as_completed(futures):
-            size = futures[future]
-            try:
-                result_for_size = future.result()  # result_for_size is a dict: {size: {alg: (comp, swaps), ...}}
-                for alg, (comp, swaps) in result_for_size[size].items():
-                    combined_results[alg].append((size, comp, swaps))
-            except Exception as exc:
-                print(f"Size {size} generated an exception: {exc}")
-    
-    return combined_results
+    return run_cells(sizes, k, algorithms, store=store, workers=20)
 
 
-def experiment_for_various_sizes():
+def experiment_for_various_sizes(algorithms=DEFAULT_ALGORITHMS, store: str = RESULTS_PATH) -> dict:
     sizes = [10, 20, 30, 40, 50]
     k = 1000
-    results = {
-    #    'insertion_sort': [],
-    #    'quick_sort': [],
-    #    'hybrid_sort': [],
-    #    'dual_pivot': [],
-        'merge_sort': [],
-        'my_merge_sort': []
-    }
-    
-    for size in sizes:
-        print(f"\nRunning experiment for n={size}, k={k}...")
-    #    results['insertion_sort'].append((size, *run_experiment(insertion_sort, size, k)))
-    #    results['quick_sort'].append((size, *run_experiment(quick_sort, size, k)))
-    #    results['hybrid_sort'].append((size, *run_experiment(hybrid_sort, size, k, threshold=10)))
-    #    results['dual_pivot'].append((size, *run_experiment(dual_pivot_quick_sort, size, k)))
-        results['merge_sort'].append((size, *run_experiment(merge_sort, size, k)))
-        results['my_merge_sort'].append((size, *run_experiment(my_merge_sort, size, k)))
-    
-    return results
+    return run_cells(sizes, k, algorithms, store=store)
 
 
-def plot_results(results):
+def plot_results(results=None, algorithms=None, store: str = RESULTS_PATH):
+    """
+    Plot comparisons and swaps against n; without `results` the stored results of the
+    algorithms (all of them by default) are plotted.
+    """
+    if results is None:
+        results = stored_results(algorithms, store=store)
     fig, ax = plt.subplots(2, 2, figsize=(14, 10))
     
     colors = {
-    #    'insertion_sort': '#e6194b',  # red
-    #    'quick_sort': '#3cb44b',      # green
-    #    'hybrid_sort': '#ffe119',     # yellow
-    #    'dual_pivot': '#4363d8',      # blue
+        'insertion_sort': '#e6194b',  # red
+        'quick_sort': '#3cb44b',      # green
+        'hybrid_sort': '#ffe119',     # yellow
+        'dual_pivot': '#4363d8',      # blue
         'merge_sort': '#f58231',      # orange
-        'my_merge_sort': '#911eb4',   # purple
+        'natural_merge_sort': '#911eb4',   # purple
     }
     
     for label, result in results.items():
         sizes = [r[0] for r in result]
         comparisons = [r[1] for r in result]
         swaps = [r[2] for r in result]
-        color = colors.get(label, None)
+        color = colors.get(label.partition(':')[0], None)
         
         ax[0, 0].plot(sizes, comparisons, label=label, color=color)
         ax[0, 1].plot(sizes, swaps, label=label, color=color)
@@ -161,14 +267,15 @@ def plot_results(results):
     plt.show()
 
 
-def calculate_C(results=None):
+def calculate_C(results=None, algorithm: str = 'quick_sort', store: str = RESULTS_PATH):
     sizes = []
     comparisons = []
     
     if results is None:
-        results = experiment_for_big_sizes_parallel()
+        # Measures only the sizes missing from the store
+        results = experiment_for_big_sizes_parallel([algorithm], store)
     
-    for size, comp, _ in results['quick_sort']:
+    for size, comp, _ in results[algorithm]:
         sizes.append(size)
         comparisons.append(comp)
     
@@ -189,8 +296,8 @@ def calculate_C(results=None):
     plt.show()
 
 
-def analyze_results():
-    results = experiment_for_various_sizes()
+def analyze_results(algorithms=DEFAULT_ALGORITHMS, store: str = RESULTS_PATH):
+    results = experiment_for_various_sizes(algorithms, store)
     
     for sort_name, result in results.items():
         print(f"\n{sort_name} results:")
@@ -200,8 +307,198 @@ def analyze_results():
     plot_results(results)
 
 
-def analyze_results_big_sizes():
-    results_big_sizes = experiment_for_big_sizes_parallel()
+def run_traffic_experiment(sort_function, n: int, k: int, key_range: int = None, threshold: int = 5) -> tuple:
+    """
+    Run sorting experiment for a given sorting function and return its average time,
+    comparisons and writes (memory traffic: every swap is 2 writes).
+
+    The time is measured on the uninstrumented sort, the counts with a Counters instance.
+
+    Parameters:
+        sort_function: Sorting function to be tested (quick_sort, integer_sort, etc.)
+        n (int): Number of elements to sort.
+        k (int): Number of repetitions to average.
+        key_range (int): Keys are random in 1..key_range, or a permutation of 1..n if None.
+        threshold (int): Threshold value for hybrid_sort (if applicable).
+
+    Returns:
+        tuple: (average_time, average_comparisons, average_writes)
+    """
+    plain_sort = uninstrumented(sort_function)
+    extra_args = (threshold,) if sort_function == hybrid_sort else ()
+    times, comparisons_list, writes_list = [], [], []
+
+    for _ in range(k):
+        if key_range is None:
+            array = list(range(1, n + 1))
+            random.shuffle(array)
+        else:
+            array = [random.randint(1, key_range) for _ in range(n)]
+
+        start = time.perf_counter()
+        plain_sort(array.copy(), 0, n - 1, *extra_args)
+        times.append(time.perf_counter() - start)
+
+        counter = counters.Counters()
+        sort_function(array, 0, n - 1, *extra_args, counter=counter)
+        comparisons_list.append(counter.comparison_count)
+        writes_list.append(counter.write_count)
+
+    return np.mean(times), np.mean(comparisons_list), np.mean(writes_list)
+
+
+def experiment_integer_keys() -> dict:
+    """
+    Compare the integer sorts with the comparison sorts on permutations of 1..n
+    (run_experiment) and on keys from 1..100 (generators/generate_random.py).
+
+    Returns a dictionary {key kind: {algorithm: [(size, time, comparisons, writes), ...]}}.
+    """
+    sizes = [1000, 5000, 10000, 50000, 100000]
+    k = 5
+    key_kinds = {'permutation': None, 'random 1..100': 100}
+    sorts = {
+        'quick_sort': quick_sort,
+        'hybrid_sort': hybrid_sort,
+        'merge_sort': merge_sort,
+        'counting_sort': counting_sort,
+        'radix_sort': radix_sort,
+        'integer_sort': integer_sort,
+    }
+
+    results = {kind: {name: [] for name in sorts} for kind in key_kinds}
+    for kind, key_range in key_kinds.items():
+        for size in sizes:
+            print(f"\nRunning experiment for {kind} keys, n={size}, k={k}...")
+            for name, sort_function in sorts.items():
+                results[kind][name].append((size, *run_traffic_experiment(sort_function, size, k, key_range, threshold=10)))
+    return results
+
+
+def plot_traffic_results(results):
+    fig, ax = plt.subplots(len(results), 2, figsize=(14, 5 * len(results)), squeeze=False)
+
+    for row, (kind, kind_results) in enumerate(results.items()):
+        for label, result in kind_results.items():
+            sizes = [r[0] for r in result]
+            times = [r[1] for r in result]
+            writes = [r[3] for r in result]
+            ax[row, 0].plot(sizes, times, label=label)
+            ax[row, 1].plot(sizes, np.array(writes) / np.array(sizes), label=label)
+
+        ax[row, 0].set_title(f"Time vs n ({kind} keys)")
+        ax[row, 0].set_xlabel("n")
+        ax[row, 0].set_ylabel("Time [s]")
+
+        ax[row, 1].set_title(f"Writes per n vs n ({kind} keys)")
+        ax[row, 1].set_xlabel("n")
+        ax[row, 1].set_ylabel("Writes / n")
+
+    for ax_ in ax.flat:
+        ax_.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+
+def analyze_integer_keys():
+    results = experiment_integer_keys()
+
+    for kind, kind_results in results.items():
+        for sort_name, result in kind_results.items():
+            print(f"\n{sort_name} results ({kind} keys):")
+            for size, elapsed, comp, writes in result:
+                print(f"n={size}, Time: {elapsed:.4f}s, Comparisons: {comp}, Writes: {writes}")
+
+    plot_traffic_results(results)
+
+
+def experiment_threshold_tuning(backends=("python", "counted")) -> dict:
+    """
+    Tune the hybrid_sort threshold for every backend (see threshold_tuner.py), store the
+    fastest ones as the defaults of hybrid_sort and plot the time of every candidate.
+
+    Returns a dictionary {backend: {threshold: time}}.
+    """
+    results = {}
+    for backend in backends:
+        print(f"\nTuning the hybrid_sort threshold for the {backend} backend...")
+        timings = measure_thresholds(backend)
+        best = min(timings, key=timings.get)
+        store_threshold(DEFAULT_KEY_TYPES[backend], backend, best)
+        print(f"Best threshold: {best} ({timings[best]:.4f}s)")
+        results[backend] = timings
+
+    plt.figure(figsize=(8, 6))
+    for backend, timings in results.items():
+        # Relative times, the backends differ by an order of magnitude
+        fastest = min(timings.values())
+        plt.plot(list(timings), [elapsed / fastest for elapsed in timings.values()], marker='o', label=backend)
+    plt.xlabel('threshold')
+    plt.ylabel('Time / best time')
+    plt.title('hybrid_sort time vs threshold')
+    plt.legend()
+    plt.show()
+    return results
+
+
+def experiment_profile(algorithms=DEFAULT_ALGORITHMS, sizes=None, k: int = 5, seed: int = 0,
+                       path: str = PROFILE_PATH) -> list:
+    """
+    Profile every algorithm (see utils.profiling.profile) on the same k permutations of
+    every size and append the records to `path`.
+
+    Returns a list of records, each with the trial number and the threshold of hybrid_sort added.
+    """
+    sizes = sizes or [1000, 5000, 10000, 20000, 50000]
+    records = []
+    with InputPool(sizes, k, seed) as inputs:
+        for size in sizes:
+            print(f"\nProfiling n={size}, k={k}...")
+            for algorithm in algorithms:
+                sort_function, threshold = parse_algorithm(algorithm)
+                extra_args = (threshold,) if sort_function == hybrid_sort else ()
+                for trial in range(k):
+                    _, record = profile(sort_function, inputs.trial(trial, size), 0, size - 1, *extra_args)
+                    record.update(function=algorithm, trial=trial, seed=seed)
+                    records.append(record)
+    write_records(records, path)
+    return records
+
+
+def plot_profile(records=None, path: str = PROFILE_PATH):
+    """
+    Plot the average time, peak memory, recursion depth and comparisons of every algorithm
+    against n, from `records` or the records stored in `path`.
+    """
+    if records is None:
+        records = read_records(path)
+
+    # {algorithm: {n: [records]}}
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record['function'], {}).setdefault(record['n'], []).append(record)
+
+    metrics = [('elapsed_ns', 'Time [ms]', 1e-6), ('peak_memory_bytes', 'Peak memory [KiB]', 1 / 1024),
+               ('max_recursion_depth', 'Max recursion depth', 1), ('comparisons', 'Comparisons', 1)]
+    fig, ax = plt.subplots(2, 2, figsize=(14, 10))
+    for ax_, (field, title, scale) in zip(ax.flat, metrics):
+        for algorithm, by_size in grouped.items():
+            sizes = sorted(by_size)
+            values = [np.mean([r[field] for r in by_size[size] if r[field] is not None] or [np.nan]) * scale
+                      for size in sizes]
+            ax_.plot(sizes, values, marker='o', label=algorithm)
+        ax_.set_title(f"{title} vs n")
+        ax_.set_xlabel("n")
+        ax_.set_ylabel(title)
+        ax_.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+
+def analyze_results_big_sizes(algorithms=DEFAULT_ALGORITHMS, store: str = RESULTS_PATH):
+    results_big_sizes = experiment_for_big_sizes_parallel(algorithms, store)
     
     for sort_name, result in results_big_sizes.items():
         print(f"\n{sort_name} results:")
@@ -212,7 +509,30 @@ def analyze_results_big_sizes():
     
 
 if __name__ == "__main__":
-    # Uncomment the function(s) you want to run:
-    analyze_results()
-    results_big = analyze_results_big_sizes()
-    #calculate_C()
+    parser = argparse.ArgumentParser(description="Runs the List2 sorting experiments.")
+    parser.add_argument("experiment", nargs="?", default="all",
+                        choices=("all", "various", "big", "C", "plot", "integer_keys", "thresholds", "profile"),
+                        help="all (default) runs various and big")
+    parser.add_argument("--algorithms", default=None,
+                        help=f"comma-separated names from {', '.join(ALGORITHMS)} (hybrid_sort:<threshold> "
+                             f"sets the threshold), default {','.join(DEFAULT_ALGORITHMS)}")
+    parser.add_argument("--store", default=RESULTS_PATH, help="CSV file the finished cells are appended to")
+    arguments = parser.parse_args()
+    algorithms = tuple(arguments.algorithms.split(',')) if arguments.algorithms else None
+    for algorithm in algorithms or ():
+        parse_algorithm(algorithm)  # Fail before anything runs
+
+    if arguments.experiment in ("all", "various"):
+        analyze_results(algorithms or DEFAULT_ALGORITHMS, arguments.store)
+    if arguments.experiment in ("all", "big"):
+        analyze_results_big_sizes(algorithms or DEFAULT_ALGORITHMS, arguments.store)
+    if arguments.experiment == "C":
+        calculate_C(algorithm=algorithms[0] if algorithms else 'quick_sort', store=arguments.store)
+    if arguments.experiment == "plot":
+        plot_results(algorithms=algorithms, store=arguments.store)
+    if arguments.experiment == "integer_keys":
+        analyze_integer_keys()
+    if arguments.experiment == "thresholds":
+        experiment_threshold_tuning()
+    if arguments.experiment == "profile":
+        plot_profile(experiment_profile(algorithms or DEFAULT_ALGORITHMS))
@@ -0,0 +1,286 @@
+import argparse
+import os
+import tempfile
+from array import array
+import utils.counters as counters
+import utils.binary_io as binary_io
+from hybrid_sort import hybrid_sort
+from merge_sort import merge_sort
+
+RUN_SORTS = ("hybrid_sort", "merge_sort")
+
+ITEM_SIZE = array("q").itemsize
+
+# Memory a key takes once it is read into a Python list: an 8-byte list slot and an int object
+BYTES_PER_KEY = 40
+
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+
+# Every run of a merge gets a read buffer of at least this many keys, smaller reads would
+# turn the merge into seeks
+MIN_BUFFER_KEYS = 4096
+
+
+def external_sort(source: str, destination: str, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                  run_sort: str = "hybrid_sort", fan_in: int = None, counter=counters,
+                  temp_dir: str = None) -> tuple:
+    """
+    Sorts a file of raw int64 keys (the "raw" format of utils.binary_io) that may not fit in memory.
+
+    1. Run formation: the file is read in chunks of as many keys as fit in `memory_budget`,
+       every chunk is sorted in memory with `run_sort` and spilled to a temporary run file.
+    2. Merging: groups of `fan_in` runs are merged with a heap of their head keys, every run
+       read through its own buffer and the output written through one more, until one run
+       is left - the last pass writes straight to `destination`.
+
+    Comparisons, swaps and writes of the in-memory sorts and the comparisons of the merge
+    heap are counted as usual; every byte read from or written to a file is counted by
+    counter.record_io.
+
+    Parameters:
+        source (str): Path of the input file.
+        destination (str): Path of the sorted output file (may be the same as `source`).
+        memory_budget (int): Bytes of keys held in memory at a time, estimated with BYTES_PER_KEY.
+        run_sort (str): Sort of the runs, one of RUN_SORTS.
+        fan_in (int): Runs merged at once; None picks it with choose_fan_in.
+        counter: Where comparisons, swaps, writes and I/O are counted - the utils.counters
+                 module (default) or a counters.Counters instance owned by this call.
+        temp_dir (str): Directory of the run files, the system default if None.
+
+    Returns:
+        tuple: (number of runs, number of merge passes)
+    """
+    if run_sort not in RUN_SORTS:
+        raise ValueError(f"Unknown run sort: {run_sort}")
+    run_keys = memory_budget // BYTES_PER_KEY
+    if run_keys < 2:
+        raise ValueError(f"A memory budget of {memory_budget} bytes does not hold two keys")
+
+    with tempfile.TemporaryDirectory(dir=temp_dir, prefix="external_sort_") as directory:
+        runs = create_runs(source, directory, run_keys, run_sort, counter)
+        run_count = len(runs)
+        if fan_in is None:
+            fan_in = choose_fan_in(len(runs), memory_budget)
+        if fan_in < 2:
+            raise ValueError("The fan-in has to be at least 2")
+        buffer_keys = max(1, memory_budget // ((fan_in + 1) * BYTES_PER_KEY))
+
+        passes = 0
+        if len(runs) <= 1:
+            # Nothing to merge, the only run (if any) is the result
+            merge_runs(runs, destination, buffer_keys, counter)
+        while len(runs) > 1:
+            passes += 1
+            groups = [runs[start:start + fan_in] for start in range(0, len(runs), fan_in)]
+            merged = []
+            for number, group in enumerate(groups):
+                target = destination if len(groups) == 1 else os.path.join(directory, f"pass{passes}_{number}.bin")
+                merge_runs(group, target, buffer_keys, counter)
+                for run in group:
+                    os.remove(run)
+                merged.append(target)
+            runs = merged
+    return run_count, passes
+
+
+def create_runs(source: str, directory: str, run_keys: int, run_sort: str, counter=counters) -> list:
+    """
+    Cuts the input into sorted runs of at most `run_keys` keys.
+
+    Returns:
+        list: Paths of the run files, in input order.
+    """
+    runs = []
+    with open(source, "rb") as file:
+        while True:
+            data = file.read(run_keys * ITEM_SIZE)
+            if not data:
+                break
+            counter.record_io(len(data))
+            chunk = memoryview(data).cast("q").tolist()
+            del data
+
+            # Lomuto partitioning degrades on many equal keys, a run of 10^6 keys from 1..100 would recurse too deep
+            if run_sort == "hybrid_sort":
+                hybrid_sort(chunk, 0, len(chunk) - 1, counter=counter, partition_scheme="three_way")
+            else:
+                merge_sort(chunk, 0, len(chunk) - 1, counter)
+
+            run = os.path.join(directory, f"run{len(runs)}.bin")
+            write_run(run, chunk, counter)
+            runs.append(run)
+    return runs
+
+
+def choose_fan_in(runs: int, memory_budget: int) -> int:
+    """
+    Picks the fan-in of the merge passes.
+
+    The memory budget is shared by fan_in read buffers and one write buffer, none of which
+    may drop below MIN_BUFFER_KEYS keys, so it allows a fan-in of at most
+    memory_budget / (BYTES_PER_KEY * MIN_BUFFER_KEYS) - 1. That fan-in gives the fewest
+    passes, ceil(log_fan_in(runs)); of all fan-ins needing that many passes the smallest one
+    is returned, as it leaves the largest buffers.
+
+    Returns:
+        int: The fan-in, at least 2.
+    """
+    largest = max(2, memory_budget // (BYTES_PER_KEY * MIN_BUFFER_KEYS) - 1)
+    passes, reach = 0, 1
+    while reach < runs:
+        reach *= largest
+        passes += 1
+    if passes == 0:
+        return 2
+
+    fan_in = max(2, round(runs ** (1 / passes)))
+    while fan_in > 2 and (fan_in - 1) ** passes >= runs:
+        fan_in -= 1
+    while fan_in ** passes < runs:
+        fan_in += 1
+    return fan_in
+
+
+def merge_runs(runs: list, destination: str, buffer_keys: int, counter=counters) -> None:
+    """
+    Merges sorted run files into one with a min-heap of the runs ordered by their head keys.
+
+    Parameters:
+        runs (list): Paths of the sorted runs.
+        destination (str): Path of the merged run.
+        buffer_keys (int): Keys read from a run, or written to the output, at a time.
+        counter: Where the heap comparisons and the I/O are counted.
+    """
+    # Heap entries are [head key, iterator over the rest of the run]
+    heap = []
+    for run in runs:
+        keys = read_run(run, buffer_keys, counter)
+        head = next(keys, None)
+        if head is not None:
+            heap.append([head, keys])
+    for root in range(len(heap) // 2 - 1, -1, -1):
+        sift_down(heap, root, counter)
+
+    output = array("q")
+    with open(destination, "wb") as file:
+        while heap:
+            output.append(heap[0][0])
+            if len(output) >= buffer_keys:
+                flush(file, output, counter)
+
+            head = next(heap[0][1], None)
+            if head is None:
+                last = heap.pop()
+                if not heap:
+                    break
+                heap[0] = last
+            else:
+                heap[0][0] = head
+            sift_down(heap, 0, counter)
+        flush(file, output, counter)
+
+
+def sift_down(heap: list, root: int, counter=counters) -> None:
+    """
+    Moves the run at heap position `root` down until both its children have larger heads.
+    """
+    size = len(heap)
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size and not counter.compare(heap[child][0], heap[child + 1][0]):
+            child += 1
+        if counter.compare(heap[root][0], heap[child][0]):
+            return
+        heap[root], heap[child] = heap[child], heap[root]
+        root = child
+
+
+def read_run(path: str, buffer_keys: int, counter=counters):
+    """
+    Yields the keys of a run file, reading `buffer_keys` keys at a time.
+    """
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(buffer_keys * ITEM_SIZE)
+            if not data:
+                return
+            counter.record_io(len(data))
+            yield from memoryview(data).cast("q").tolist()
+
+
+def write_run(path: str, keys: list, counter=counters) -> None:
+    """
+    Writes keys to a run file in one bulk write.
+    """
+    data = array("q", keys).tobytes()
+    with open(path, "wb") as file:
+        file.write(data)
+    counter.record_io(len(data))
+
+
+def flush(file, output: array, counter=counters) -> None:
+    """
+    Writes the output buffer of a merge and empties it.
+    """
+    file.write(output.tobytes())
+    counter.record_io(len(output) * ITEM_SIZE)
+    del output[:]
+
+
+def file_checksum(path: str, check_order: bool = False, buffer_keys: int = 1 << 20):
+    """
+    utils.binary_io.key_checksum of a file of raw int64 keys, computed block by block so the
+    file never has to fit in memory.
+
+    Parameters:
+        path (str): The file.
+        check_order (bool): Also check that the keys are sorted.
+        buffer_keys (int): Keys read at a time.
+
+    Returns:
+        tuple | None: The checksum, None if check_order is set and the keys are not sorted.
+    """
+    count, key_sum, square_sum, key_xor = 0, 0, 0, 0
+    previous = None
+    with open(path, "rb") as file:
+        while data := file.read(buffer_keys * ITEM_SIZE):
+            block = memoryview(data).cast("q").tolist()
+            if check_order and (not binary_io.is_sorted(block) or (previous is not None and previous > block[0])):
+                return None
+            previous = block[-1]
+            block_count, block_sum, block_square_sum, block_xor = binary_io.key_checksum(block)
+            count += block_count
+            key_sum = (key_sum + block_sum) & binary_io.MASK
+            square_sum = (square_sum + block_square_sum) & binary_io.MASK
+            key_xor ^= block_xor
+    return count, key_sum, square_sum, key_xor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sorts a file of raw int64 keys that may not fit in memory.")
+    parser.add_argument("input", help="file of raw int64 keys, e.g. from generate_random.py --format raw")
+    parser.add_argument("output", help="file the sorted keys are written to")
+    parser.add_argument("--memory", type=float, default=DEFAULT_MEMORY_BUDGET / 2**20, help="memory budget in MiB")
+    parser.add_argument("--fan-in", type=int, default=None, help="runs merged at once, picked from the budget by default")
+    parser.add_argument("--run-sort", choices=RUN_SORTS, default="hybrid_sort")
+    parser.add_argument("--temp-dir", default=None)
+    arguments = parser.parse_args()
+
+    checksum = file_checksum(arguments.input)  # Fingerprint of the input keys, the output may replace the input
+    counters.reset_counters()  # Reset counters before sorting
+    runs, passes = external_sort(arguments.input, arguments.output, int(arguments.memory * 2**20),
+                                 arguments.run_sort, arguments.fan_in, temp_dir=arguments.temp_dir)
+
+    print(f"Runs: {runs}, merge passes: {passes}")
+    print(f"Total comparisons: {counters.comparison_count}")
+    print(f"Total swaps: {counters.swap_count}")
+    print(f"Total writes: {counters.write_count}")
+    print(f"Total I/O: {counters.io_bytes} bytes")
+
+    # Check, block by block, that the output is sorted and holds the input keys
+    if file_checksum(arguments.output, check_order=True) == checksum:
+        print("The file is correctly sorted.")
+    else:
+        print("The file is NOT correctly sorted.")
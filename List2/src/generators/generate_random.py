@@ -1,21 +1,27 @@
 import sys
+import os
 import random
 
-def generate_random(n: int, seed: int = None) -> None:
+# The generators are run as scripts from src/generators, utils lives one level up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import utils.binary_io as binary_io  # noqa: E402
+
+def generate_random(n: int, seed: int = None, key_format: str = "text") -> None:
     """
-    Generates a sequence of `n` random keys and prints them.
+    Generates a sequence of `n` random keys and writes them to stdout.
 
     Parameters:
         n (int): The number of elements to generate.
         seed (int, optional): The seed for reproducibility.
+        key_format (str): "text" (the count and the keys on two lines), "raw" (int64) or "npy".
     """
     if seed is not None:
         random.seed(seed)  # Ensure reproducibility
 
     array = [random.randint(1, 100) for _ in range(n)]  # Large range for variety
-    print(n)
-    print(" ".join(map(str, array)))
+    binary_io.write_keys(array, key_format=key_format)
 
 if __name__ == "__main__":
-    n = int(sys.argv[1]) if len(sys.argv) > 1 else int(input("Enter number of elements: "))
-    generate_random(n)
+    options = binary_io.parse_arguments(sys.argv[1:], "number of elements, asked for if not given")
+    n = options.count if options.count is not None else int(input("Enter number of elements: "))
+    generate_random(n, key_format=options.format or "text")
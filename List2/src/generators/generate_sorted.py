@@ -1,16 +1,22 @@
 import sys
+import os
 
-def generate_sorted(n: int) -> None:
+# The generators are run as scripts from src/generators, utils lives one level up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import utils.binary_io as binary_io  # noqa: E402
+
+def generate_sorted(n: int, key_format: str = "text") -> None:
     """
-    Generates a sorted sequence of `n` keys in increasing order and prints them.
+    Generates a sorted sequence of `n` keys in increasing order and writes them to stdout.
 
     Parameters:
         n (int): The number of elements to generate.
+        key_format (str): "text" (the count and the keys on two lines), "raw" (int64) or "npy".
     """
     array = list(range(1, n + 1))
-    print(n)
-    print(" ".join(map(str, array)))
+    binary_io.write_keys(array, key_format=key_format)
 
 if __name__ == "__main__":
-    n = int(sys.argv[1]) if len(sys.argv) > 1 else int(input("Enter number of elements: "))
-    generate_sorted(n)
+    options = binary_io.parse_arguments(sys.argv[1:], "number of elements, asked for if not given")
+    n = options.count if options.count is not None else int(input("Enter number of elements: "))
+    generate_sorted(n, key_format=options.format or "text")
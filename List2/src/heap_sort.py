@@ -0,0 +1,55 @@
+from typing import List
+import utils.counters as counters
+
+
+def heap_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Implements the heap sort algorithm to sort a subarray in place.
+    Guaranteed O(n log n), used by quick_sort as the fallback when its recursion gets too deep.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the subarray to be sorted.
+        high (int): The ending index of the subarray to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+
+    Returns:
+        None - the subarray is sorted in place.
+    """
+    size = high - low + 1
+
+    # Build a max-heap in array_to_sort[low:high + 1]
+    for root in range(size // 2 - 1, -1, -1):
+        sift_down(array_to_sort, low, root, size, counter)
+
+    # Move the maximum behind the heap and restore the heap on the rest
+    for end in range(size - 1, 0, -1):
+        counter.swap(array_to_sort, low, low + end)
+        sift_down(array_to_sort, low, 0, end, counter)
+
+
+def sift_down(array_to_sort: List[int], offset: int, root: int, size: int, counter=counters) -> None:
+    """
+    Moves the element at heap position `root` down until both its children are not larger.
+
+    Parameters:
+        array_to_sort (List[int]): The array holding the heap.
+        offset (int): Index of the heap position 0 in the array.
+        root (int): Heap position of the element to move down.
+        size (int): Number of elements in the heap.
+        counter: Where comparisons and swaps are counted.
+    """
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+
+        # Pick the larger child
+        if child + 1 < size and not counter.compare(array_to_sort[offset + child + 1], array_to_sort[offset + child]):
+            child += 1
+
+        if counter.compare(array_to_sort[offset + child], array_to_sort[offset + root]):
+            return
+        counter.swap(array_to_sort, offset + root, offset + child)
+        root = child
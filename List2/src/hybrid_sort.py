@@ -1,11 +1,21 @@
-from insertion_sort import insertion_sort
-from quick_sort import partition
+from insertion_sort import insertion_sort, shift_insertion_sort, binary_insertion_sort
+from sorting_network import network_sort, NETWORK_MAX_SIZE
+from quick_sort import split
 from typing import List
 import sys
 import utils.counters as counters
+import utils.binary_io as binary_io
+from utils.threshold_cache import cached_threshold, key_type
 
+# Which tuned threshold applies: the copy made by utils.instrumentation.uninstrumented runs
+# without counters, and timings differ a lot between the two
+BACKEND = "python" if __name__.endswith("[uninstrumented]") else "counted"
 
-def hybrid_sort(array_to_sort: List[int], low: int, high: int, threshold:int) -> None:
+SMALL_SORTS = ("insertion", "shift", "binary", "network")
+
+
+def hybrid_sort(array_to_sort: List[int], low: int, high: int, threshold: int = None, counter=counters,
+                partition_scheme: str = "lomuto", small_sort: str = "insertion") -> None:
     """
     Implements the hybrid sort algorithm, which combines quick sort and insertion sort.
     It uses quick sort for larger arrays and switches to insertion sort for smaller sub-arrays.
@@ -14,25 +24,56 @@ def hybrid_sort(array_to_sort: List[int], low: int, high: int, threshold:int) ->
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the array segment to be sorted.
         high (int): The ending index of the array segment to be sorted.
-        threshold (int): The threshold size for switching to insertion sort.
+        threshold (int): The threshold size for switching to insertion sort. None (default) uses
+                         the value tuned by threshold_tuner.py for the key type and BACKEND.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+        partition_scheme (str): "lomuto" or "three_way", see quick_sort.
+        small_sort (str): How the small sub-arrays are sorted:
+                          "insertion" - insertion_sort (a swap per step),
+                          "shift" - shift_insertion_sort (a write per step),
+                          "binary" - binary_insertion_sort (binary search, one slice shift),
+                          "network" - network_sort up to NETWORK_MAX_SIZE elements,
+                                      binary_insertion_sort above.
 
     Returns:
         None - It sorts the array in place.
     """
-    
+    if threshold is None:
+        if low >= high:
+            return
+        threshold = cached_threshold(key_type(array_to_sort, low), BACKEND)
+
     if high - low <= threshold:
+        sort_small(array_to_sort, low, high, counter, small_sort)  # Small sub-arrays: the small_sort variant
+    else:
+        left_high, right_low = split(array_to_sort, low, high, counter, partition_scheme)
+        hybrid_sort(array_to_sort, low, left_high, threshold, counter, partition_scheme, small_sort)  # Left sub-array
+        hybrid_sort(array_to_sort, right_low, high, threshold, counter, partition_scheme, small_sort) # Right sub-array
 
-        insertion_sort(array_to_sort, low, high)  # Use insertion sort for small sub-arrays
+def sort_small(array_to_sort: List[int], low: int, high: int, counter=counters, small_sort: str = "insertion") -> None:
+    """
+    Sorts a small sub-array with the chosen small_sort of hybrid_sort.
+    The sorts are looked up by name here rather than kept in a table, so that the
+    uninstrumented copy of this module calls the uninstrumented sorts.
+    """
+    if small_sort not in SMALL_SORTS:
+        raise ValueError(f"Unknown small sort: {small_sort}")
+    if small_sort == "insertion":
+        insertion_sort(array_to_sort, low, high, counter)
+    elif small_sort == "shift":
+        shift_insertion_sort(array_to_sort, low, high, counter)
+    elif small_sort == "binary" or high - low + 1 > NETWORK_MAX_SIZE:
+        binary_insertion_sort(array_to_sort, low, high, counter)
     else:
-        pivot_index = partition(array_to_sort, low, high)
-        hybrid_sort(array_to_sort, low, pivot_index - 1, threshold)  # Left sub-array
-        hybrid_sort(array_to_sort, pivot_index + 1, high, threshold) # Right sub-array
-    
+        network_sort(array_to_sort, low, high, counter)
+
 
 if __name__ == "__main__":
-    input_data = sys.stdin.read().splitlines()
-    n = int(input_data[0].strip())
-    array = list(map(int, input_data[1].split()))
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
     
     if n < 40:
         print("Initial array:", " ".join(f"{x:02}" for x in array))
@@ -45,10 +86,13 @@ if __name__ == "__main__":
     
     print(f"Total comparisons: {counters.comparison_count}")
     print(f"Total swaps: {counters.swap_count}")
+    print(f"Total writes: {counters.write_count}")
+
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
 
-    original_array = array[:]  # Make a copy of the original array
-    # Check if the result is a sorted version of the input
-    if array == sorted(original_array):
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
         print("The array is correctly sorted.")
     else:
         print("The array is NOT correctly sorted.")
@@ -1,9 +1,10 @@
 from typing import List
 import sys
 import utils.counters as counters
+import utils.binary_io as binary_io
 
 
-def insertion_sort(array_to_sort: List[int], low: int, high: int) -> None:
+def insertion_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
     """
     Implements the insertion sort algorithm to sort a subarray in place.
     Tracks comparisons and swaps during sorting.
@@ -12,6 +13,8 @@ def insertion_sort(array_to_sort: List[int], low: int, high: int) -> None:
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the subarray to be sorted.
         high (int): The ending index of the subarray to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
 
     Returns:
         None - the subarray is sorted in place.
@@ -20,15 +23,74 @@ def insertion_sort(array_to_sort: List[int], low: int, high: int) -> None:
         key = array_to_sort[i]
         j = i - 1
 
-        while j >= low and not counters.compare(array_to_sort[j], key):   # Use the compare function from counters
-            counters.swap(array_to_sort, j + 1, j)                      # Use the swap function from counters
+        while j >= low and not counter.compare(array_to_sort[j], key):   # Use the compare function of the counter
+            counter.swap(array_to_sort, j + 1, j)                      # Use the swap function of the counter
             j -= 1
         array_to_sort[j + 1] = key
 
+def shift_insertion_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Insertion sort that shifts the larger elements one place right instead of swapping them
+    with the key, and writes the key once into the gap: one write per moved element plus one,
+    instead of the two writes of every swap.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the subarray to be sorted.
+        high (int): The ending index of the subarray to be sorted.
+        counter: Where comparisons and writes are counted.
+
+    Returns:
+        None - the subarray is sorted in place.
+    """
+    for i in range(low + 1, high + 1):
+        key = array_to_sort[i]
+        j = i - 1
+
+        while j >= low and not counter.compare(array_to_sort[j], key):
+            array_to_sort[j + 1] = array_to_sort[j]
+            j -= 1
+        if j + 1 < i:
+            array_to_sort[j + 1] = key
+            counter.record_writes(i - j)
+
+def binary_insertion_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Insertion sort that finds the place of each key with binary search - O(n log n) comparisons -
+    and moves the larger elements with one slice shift, counted as one write per moved element
+    plus one for the key. Equal keys keep their order (the key goes after them).
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the subarray to be sorted.
+        high (int): The ending index of the subarray to be sorted.
+        counter: Where comparisons and writes are counted.
+
+    Returns:
+        None - the subarray is sorted in place.
+    """
+    for i in range(low + 1, high + 1):
+        key = array_to_sort[i]
+
+        # First position in [low, i) whose element is greater than the key
+        position, end = low, i
+        while position < end:
+            mid = (position + end) // 2
+            if counter.compare(array_to_sort[mid], key):
+                position = mid + 1
+            else:
+                end = mid
+
+        if position < i:
+            array_to_sort[position + 1:i + 1] = array_to_sort[position:i]
+            array_to_sort[position] = key
+            counter.record_writes(i - position + 1)
+
 if __name__ == "__main__":
-    input_data = sys.stdin.read().splitlines()
-    n = int(input_data[0].strip())
-    array = list(map(int, input_data[1].split()))
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
     
     if n < 40:
         print("Initial array:", " ".join(f"{x:02}" for x in array))
@@ -41,9 +103,12 @@ if __name__ == "__main__":
     
     print(f"Total comparisons: {counters.comparison_count}")
     print(f"Total swaps: {counters.swap_count}")
-    original_array = array[:]  # Make a copy of the original array
-    # Check if the result is a sorted version of the input
-    if array == sorted(original_array):
+    print(f"Total writes: {counters.write_count}")
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
         print("The array is correctly sorted.")
     else:
-        print("The array is NOT correctly sorted.")
\ No newline at end of file
+        print("The array is NOT correctly sorted.")
@@ -1,7 +1,8 @@
 import sys
 import utils.counters as counters
+import utils.binary_io as binary_io
 
-def merge(arr, left, right):
+def merge(arr, left, right, counter=counters):
     """
     Merge two sorted sub-arrays of arr[] into a single sorted sub-array.
     
@@ -9,6 +10,7 @@ def merge(arr, left, right):
         arr (list): The list to be sorted.
         left (int): Starting index of the left sub-array.
         right (int): Ending index of the right sub-array.
+        counter: Where comparisons and writes are counted.
     
     Returns:
         None: The list is sorted in place.
@@ -22,8 +24,7 @@ def merge(arr, left, right):
 
     # Merge the two halves
     while i < len(left_half) and j < len(right_half):
-        counters.comparison_count += 1  # Count comparison
-        if left_half[i] < right_half[j]:
+        if counter.compare(left_half[i], right_half[j]):  # Counted, ties take the left element (stable)
             arr[k] = left_half[i]
             i += 1
         else:
@@ -43,7 +44,9 @@ def merge(arr, left, right):
         j += 1
         k += 1
 
-def merge_sort(arr, left, right):
+    counter.record_writes(right - left + 1)
+
+def merge_sort(arr, left, right, counter=counters):
     """
     Sort the array using Merge Sort algorithm (recursive).
     
@@ -51,6 +54,8 @@ def merge_sort(arr, left, right):
         arr (list): The list to be sorted.
         left (int): Starting index of the array.
         right (int): Ending index of the array.
+        counter: Where comparisons and writes are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
     
     Returns:
         None: The list is sorted in place.
@@ -59,16 +64,230 @@ def merge_sort(arr, left, right):
         mid = (left + right) // 2
         
         # Recursively split the array and sort
-        merge_sort(arr, left, mid)
-        merge_sort(arr, mid + 1, right)
+        merge_sort(arr, left, mid, counter)
+        merge_sort(arr, mid + 1, right, counter)
         
         # Merge the sorted sub-arrays
-        merge(arr, left, right)
+        merge(arr, left, right, counter)
+
+# Consecutive wins of one run after which natural_merge_sort switches to galloping
+MIN_GALLOP = 7
+
+# Shorter natural runs are extended to this length with binary insertion sort
+MIN_RUN = 32
+
+
+def natural_merge_sort(arr, left, right, counter=counters):
+    """
+    Sort the array using a bottom-up natural Merge Sort (iterative).
+
+    The range is first split into the runs it already contains: non-decreasing runs are
+    kept, strictly decreasing runs are reversed in place (which keeps the sort stable),
+    and runs shorter than MIN_RUN are extended with binary insertion sort. Neighbouring runs
+    are then merged pairwise, pass after pass, between the array and a single auxiliary
+    buffer allocated once; sorted or reversed input is done after one scan.
+    A merge that keeps taking elements from the same run switches to galloping: the rest
+    of that run's elements that go first are found with an exponential search and copied
+    as one slice.
+
+    Comparisons are counted like in merge_sort, one per compared pair of elements
+    (including the ones made while detecting runs, inserting and galloping), and reversing
+    a decreasing run counts its swaps. Every element written by a merge, a copy or an
+    insertion is counted as a write.
+
+    Parameters:
+        arr (list): The list to be sorted.
+        left (int): Starting index of the array.
+        right (int): Ending index of the array.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+
+    Returns:
+        None: The list is sorted in place.
+    """
+    if left >= right:
+        return
+
+    # Run boundaries, relative to `left`: run r is [bounds[r], bounds[r + 1])
+    bounds = find_runs(arr, left, right, counter)
+    if len(bounds) == 2:
+        return
+
+    n = right - left + 1
+    source, source_offset = arr, left
+    target, target_offset = [None] * n, 0
+
+    while len(bounds) > 2:
+        merged_bounds = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            low = bounds[r]
+            if r + 2 < len(bounds):
+                mid, high = bounds[r + 1], bounds[r + 2]
+                merge_runs(source, source_offset, target, target_offset, low, mid, high, counter)
+            else:
+                # An odd run out is just carried over to the other buffer
+                high = bounds[r + 1]
+                target[target_offset + low:target_offset + high] = source[source_offset + low:source_offset + high]
+                counter.record_writes(high - low)
+            merged_bounds.append(high)
+        bounds = merged_bounds
+        source, source_offset, target, target_offset = target, target_offset, source, source_offset
+
+    if source is not arr:
+        arr[left:right + 1] = source
+        counter.record_writes(n)
+
+def find_runs(arr, left, right, counter=counters):
+    """
+    Splits arr[left..right] into maximal runs, reversing the strictly decreasing ones
+    and extending the ones shorter than MIN_RUN with binary insertion sort.
+
+    Returns:
+        list: Run boundaries relative to `left`, starting with 0 and ending with the length.
+    """
+    bounds = [0]
+    start = left
+    while start <= right:
+        end = start + 1
+        if end <= right:
+            if counter.compare(arr[start], arr[end]):
+                # Non-decreasing run
+                while end + 1 <= right and counter.compare(arr[end], arr[end + 1]):
+                    end += 1
+            else:
+                # Strictly decreasing run, reversed into a non-decreasing one
+                while end + 1 <= right and not counter.compare(arr[end], arr[end + 1]):
+                    end += 1
+                i, j = start, end
+                while i < j:
+                    counter.swap(arr, i, j)
+                    i += 1
+                    j -= 1
+            end += 1
+
+        # end is now one past the run, extend a short run element by element
+        extended_end = min(start + MIN_RUN, right + 1)
+        while end < extended_end:
+            value = arr[end]
+            # Binary search for the slot after the elements <= value (stable)
+            position, high = start, end
+            while position < high:
+                mid = (position + high) // 2
+                if counter.compare(arr[mid], value):
+                    position = mid + 1
+                else:
+                    high = mid
+            if position < end:
+                arr[position + 1:end + 1] = arr[position:end]
+                arr[position] = value
+                counter.record_writes(end - position + 1)
+            end += 1
+
+        bounds.append(end - left)
+        start = end
+    return bounds
+
+def merge_runs(source, source_offset, target, target_offset, low, mid, high, counter=counters):
+    """
+    Merge the sorted runs source[low:mid] and source[mid:high] into target[low:high]
+    (every index shifted by the offset of its buffer), galloping when one run keeps winning.
+
+    Parameters:
+        source (list), source_offset (int): Buffer holding the runs.
+        target (list), target_offset (int): Buffer receiving the merged run.
+        low, mid, high (int): Run boundaries.
+        counter: Where comparisons and writes are counted.
+    """
+    # Absolute indices from here on
+    i, left_end = source_offset + low, source_offset + mid
+    j, right_end = source_offset + mid, source_offset + high
+    k = target_offset + low
+
+    left_value = source[i]
+    right_value = source[j]
+    left_wins = right_wins = 0
+
+    while True:
+        if counter.compare(left_value, right_value):  # Ties take the left element (stable)
+            target[k] = left_value
+            k += 1
+            i += 1
+            if i == left_end:
+                break
+            right_wins = 0
+            left_wins += 1
+            if left_wins >= MIN_GALLOP:
+                # Every following left element <= right_value goes first as well
+                end = gallop(source, right_value, i, left_end, True, counter)
+                target[k:k + end - i] = source[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+                if i == left_end:
+                    break
+            left_value = source[i]
+        else:
+            target[k] = right_value
+            k += 1
+            j += 1
+            if j == right_end:
+                break
+            left_wins = 0
+            right_wins += 1
+            if right_wins >= MIN_GALLOP:
+                # Every following right element < left_value goes first as well
+                end = gallop(source, left_value, j, right_end, False, counter)
+                target[k:k + end - j] = source[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+                if j == right_end:
+                    break
+            right_value = source[j]
+
+    # Copy whatever is left of either run
+    target[k:k + left_end - i] = source[i:left_end]
+    k += left_end - i
+    target[k:k + right_end - j] = source[j:right_end]
+    counter.record_writes(high - low)
+
+def gallop(source, key, start, end, inclusive, counter=counters):
+    """
+    Find the first index in [start, end) whose element no longer goes before `key`,
+    probing start, start + 1, start + 3, start + 7, ... and then binary searching.
+
+    Parameters:
+        inclusive (bool): True if elements equal to `key` go before it (left run),
+                          False if they do not (right run).
+
+    Returns:
+        int: The first index whose element does not go before `key` (or `end`).
+    """
+    def goes_before(value):
+        return counter.compare(value, key) if inclusive else not counter.compare(key, value)
+
+    last_before = start - 1
+    probe = start
+    step = 1
+    while probe < end and goes_before(source[probe]):
+        last_before = probe
+        probe = last_before + step
+        step *= 2
+
+    low, high = last_before + 1, min(probe, end)
+    while low < high:
+        mid = (low + high) // 2
+        if goes_before(source[mid]):
+            low = mid + 1
+        else:
+            high = mid
+    return low
 
 if __name__ == "__main__":
-    input_data = sys.stdin.read().splitlines()
-    n = int(input_data[0].strip())
-    array = list(map(int, input_data[1].split()))
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
 
     if n < 40:
         print("Initial array:", " ".join(f"{x:02}" for x in array))
@@ -81,9 +300,11 @@ if __name__ == "__main__":
 
     print(f"Total comparisons: {counters.comparison_count}")
     print(f"Total swaps: {counters.swap_count}")
-    original_array = array[:]  # Make a copy of the original array
-    # Check if the result is a sorted version of the input
-    if array == sorted(original_array):
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
         print("The array is correctly sorted.")
     else:
-        print("The array is NOT correctly sorted.")
\ No newline at end of file
+        print("The array is NOT correctly sorted.")
@@ -0,0 +1,508 @@
+import sys
+import numpy as np
+import utils.counters as counters
+import utils.binary_io as binary_io
+from utils.threshold_cache import cached_threshold
+
+# Blocks of at most this many elements are finished with insertion sort
+INSERTION_THRESHOLD = 16
+
+# Merges of halves up to this length are ranked with one binary search over all of them,
+# longer ones with a np.searchsorted call each
+BATCH_SEARCH_LIMIT = 1024
+
+
+def quick_sort(array_to_sort: np.ndarray, low: int, high: int, counter=counters) -> None:
+    """
+    NumPy version of quick_sort: median-of-three pivot, vectorized partition.
+
+    Every partition splits the block with boolean masks into the keys less than, equal to
+    and greater than the pivot (three-way, so duplicates cannot stall it), and all blocks of
+    one recursion level are partitioned together (see partition_sort), so no Python loop runs
+    over the elements or the blocks. Blocks of at most INSERTION_THRESHOLD elements are
+    finished together with a vectorized insertion sort (see insertion_sort_blocks).
+
+    Comparisons and swaps are not counted one by one but derived from the group sizes: a
+    partition of s elements is counted like the Lomuto partition of quick_sort would count it
+    (s - 1 comparisons, one swap per key <= pivot), the insertion sort exactly.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array to be sorted. A list is sorted too, through a copy.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    values = as_ndarray(array_to_sort)
+    partition_sort(values, low, high, counter, INSERTION_THRESHOLD, split_three_way)
+    write_back(array_to_sort, values, low, high)
+
+
+def hybrid_sort(array_to_sort: np.ndarray, low: int, high: int, threshold: int = None, counter=counters) -> None:
+    """
+    NumPy version of hybrid_sort: quick_sort above the threshold, insertion sort below.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array to be sorted. A list is sorted too, through a copy.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        threshold (int): Sub-arrays with high - low <= threshold are insertion sorted. None
+                         (default) uses the value tuned by threshold_tuner.py for the dtype.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    values = as_ndarray(array_to_sort)
+    if threshold is None:
+        threshold = cached_threshold(str(values.dtype), "numpy")
+    partition_sort(values, low, high, counter, threshold + 1, split_three_way)
+    write_back(array_to_sort, values, low, high)
+
+
+def dual_pivot_quick_sort(array_to_sort: np.ndarray, low: int, high: int, counter=counters) -> None:
+    """
+    NumPy version of dual_pivot_quick_sort.
+
+    The pivots are the tertiles of five evenly spaced samples, picked with np.partition.
+    Every partition splits the block with boolean masks into the keys below the lower pivot,
+    between the pivots and above the higher pivot; the keys equal to either pivot are already
+    in place and are left out. Like in quick_sort all blocks of a level are partitioned
+    together. A partition of s elements is counted like dual_partition would
+    count it: one comparison for a key <= the lower pivot, two for any other.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array to be sorted. A list is sorted too, through a copy.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    values = as_ndarray(array_to_sort)
+    partition_sort(values, low, high, counter, INSERTION_THRESHOLD, split_dual_pivot)
+    write_back(array_to_sort, values, low, high)
+
+
+def merge_sort(array_to_sort: np.ndarray, low: int, high: int, counter=counters) -> None:
+    """
+    NumPy version of merge_sort.
+
+    The range is split at the same midpoints as merge_sort splits it. Blocks of at most
+    INSERTION_THRESHOLD elements are insertion sorted together, and the blocks are then merged
+    level by level from the bottom, all merges of a level at once (see merge_level).
+    The comparisons of a merge are counted exactly as merge() counts them.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array to be sorted. A list is sorted too, through a copy.
+        low (int): Starting index of the array.
+        high (int): Ending index of the array.
+        counter: Where comparisons and writes are counted.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    values = as_ndarray(array_to_sort)
+    if low >= high:
+        return
+
+    # Ranges of the recursion tree, level by level; the leaves are sorted first
+    levels = [[(low, high)]]
+    leaves = []
+    while levels[-1]:
+        next_level = []
+        for left, right in levels[-1]:
+            if right - left + 1 <= INSERTION_THRESHOLD:
+                leaves.append((left, right))
+            else:
+                mid = (left + right) // 2
+                next_level += [(left, mid), (mid + 1, right)]
+        levels.append(next_level)
+
+    insertion_sort_blocks(values, leaves, counter)
+    for level in reversed(levels):
+        merged = [(left, right) for left, right in level if right - left + 1 > INSERTION_THRESHOLD]
+        if merged:
+            merge_level(values, merged, counter)
+    write_back(array_to_sort, values, low, high)
+
+
+def insertion_sort(array_to_sort: np.ndarray, low: int, high: int, counter=counters) -> None:
+    """
+    NumPy version of insertion_sort, counted exactly like insertion_sort.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array to be sorted. A list is sorted too, through a copy.
+        low (int): The starting index of the subarray to be sorted.
+        high (int): The ending index of the subarray to be sorted.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        None - the subarray is sorted in place.
+    """
+    values = as_ndarray(array_to_sort)
+    if low < high:
+        insertion_sort_blocks(values, [(low, high)], counter)
+    write_back(array_to_sort, values, low, high)
+
+
+def partition_sort(array_to_sort: np.ndarray, low: int, high: int, counter, leaf_size: int, split) -> None:
+    """
+    Partitions array_to_sort[low:high + 1] with `split` until every block has at most
+    `leaf_size` elements, then insertion sorts all the blocks at once.
+
+    The blocks are partitioned a level at a time: `split` gets all blocks that are still too
+    large and partitions them together, so the number of NumPy calls grows with the depth
+    of the recursion and not with the number of blocks.
+
+    Parameters:
+        leaf_size (int): Largest block left to insertion sort.
+        split: split_three_way or split_dual_pivot.
+    """
+    blocks = np.array([[low, high]], dtype=np.int64)
+    leaves = []
+    while blocks.size:
+        sizes = blocks[:, 1] - blocks[:, 0] + 1
+        leaves.append(blocks[(sizes > 1) & (sizes <= leaf_size)])
+        blocks = blocks[sizes > leaf_size]
+        if blocks.size:
+            blocks = split(array_to_sort, blocks, counter)
+    insertion_sort_blocks(array_to_sort, np.concatenate(leaves), counter)
+
+
+def split_three_way(array_to_sort: np.ndarray, blocks: np.ndarray, counter=counters) -> np.ndarray:
+    """
+    Partitions every block around its median-of-three pivot: the keys less than the pivot
+    go to the front of the block, the keys greater than it to the back.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the blocks.
+        blocks (np.ndarray): (low, high) rows, the blocks to partition.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        np.ndarray: (low, high) rows of the parts that still have to be sorted.
+    """
+    lows, highs = blocks[:, 0], blocks[:, 1]
+    samples = np.stack((array_to_sort[lows], array_to_sort[(lows + highs) // 2], array_to_sort[highs]), axis=1)
+    pivots = np.sort(samples, axis=1)[:, 1]
+
+    layout = BlockLayout(blocks)
+    keys = array_to_sort[layout.positions]
+    pivot_of_key = pivots[layout.block_of]
+    # 0: less than the pivot, 1: equal to it, 2: greater
+    classes = (keys >= pivot_of_key).astype(np.int8) + (keys > pivot_of_key)
+    counts, class_starts = move_by_class(array_to_sort, keys, classes, 3, layout)
+
+    # Lomuto: every other key is compared with the pivot, every key <= pivot is swapped
+    swaps = int((counts[:, 0] + counts[:, 1]).sum())
+    counter.comparison_count += int((layout.sizes - 1).sum())
+    counter.swap_count += swaps
+    counter.record_writes(2 * swaps)
+
+    return np.concatenate((
+        np.stack((lows, lows + counts[:, 0] - 1), axis=1),
+        np.stack((class_starts[:, 2], highs), axis=1),
+    ))
+
+
+def split_dual_pivot(array_to_sort: np.ndarray, blocks: np.ndarray, counter=counters) -> np.ndarray:
+    """
+    Partitions every block around two pivots, the tertiles of five evenly spaced samples
+    picked with np.partition, into five groups: below the lower pivot, equal to it, between
+    the pivots, equal to the higher pivot and above it. When both pivots are equal the
+    middle group holds exactly the keys equal to them and is not sorted any further.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the blocks.
+        blocks (np.ndarray): (low, high) rows, the blocks to partition.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        np.ndarray: (low, high) rows of the parts that still have to be sorted.
+    """
+    lows, highs = blocks[:, 0], blocks[:, 1]
+    sizes = highs - lows + 1
+    sample_positions = lows[:, None] + (2 * np.arange(5) + 1) * sizes[:, None] // 10
+    samples = np.partition(array_to_sort[sample_positions], (1, 3), axis=1)
+    pivots_low, pivots_high = samples[:, 1], samples[:, 3]
+
+    layout = BlockLayout(blocks)
+    keys = array_to_sort[layout.positions]
+    low_of_key = pivots_low[layout.block_of]
+    high_of_key = pivots_high[layout.block_of]
+    # 0: below the lower pivot, 1: equal to it, 2: between, 3: equal to the higher pivot, 4: above
+    # (with equal pivots the keys equal to them get 2)
+    classes = ((keys >= low_of_key).astype(np.int8) + (keys > low_of_key)
+               + (keys >= high_of_key) + (keys > high_of_key))
+    counts, class_starts = move_by_class(array_to_sort, keys, classes, 5, layout)
+
+    # dual_partition compares each key other than the two pivots with the lower pivot, and
+    # the ones above it with the higher pivot too; the keys outside the middle are swapped
+    equal_pivots = pivots_low == pivots_high
+    at_most_low = np.where(equal_pivots, counts[:, 0] + counts[:, 2] - 2, counts[:, 0] + counts[:, 1] - 1)
+    at_least_high = np.where(equal_pivots, counts[:, 4], counts[:, 3] + counts[:, 4] - 1)
+    swaps = int((4 + at_most_low + at_least_high).sum())
+    counter.comparison_count += int((1 + 2 * (sizes - 2) - at_most_low).sum())
+    counter.swap_count += swaps
+    counter.record_writes(2 * swaps)
+
+    middle = ~equal_pivots
+    return np.concatenate((
+        np.stack((lows, lows + counts[:, 0] - 1), axis=1),
+        np.stack((class_starts[middle, 2], class_starts[middle, 3] - 1), axis=1),
+        np.stack((class_starts[:, 4], highs), axis=1),
+    ))
+
+
+class BlockLayout:
+    """
+    The keys of several disjoint blocks laid out one block after another.
+
+    Attributes:
+        sizes (np.ndarray): Number of keys of each block.
+        offsets (np.ndarray): Where each block starts in the layout.
+        block_of (np.ndarray): Block of each key.
+        positions (np.ndarray): Index in the array of each key.
+    """
+
+    def __init__(self, blocks: np.ndarray):
+        starts = blocks[:, 0]
+        self.sizes = blocks[:, 1] - starts + 1
+        self.offsets = np.cumsum(self.sizes) - self.sizes
+        self.block_of = np.repeat(np.arange(len(blocks)), self.sizes)
+        self.positions = np.arange(int(self.sizes.sum())) + (starts - self.offsets)[self.block_of]
+
+
+def move_by_class(array_to_sort: np.ndarray, keys: np.ndarray, classes: np.ndarray, class_count: int,
+                  layout: BlockLayout) -> tuple:
+    """
+    Reorders every block so that its keys are grouped by class, in increasing class order,
+    keeping the order of the keys within a group (a stable counting sort on the class).
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the blocks.
+        keys (np.ndarray): The keys of the blocks, in layout order.
+        classes (np.ndarray): Class of each key, from 0 to class_count - 1.
+        class_count (int): Number of classes.
+        layout (BlockLayout): Where the keys come from.
+
+    Returns:
+        tuple: (counts, class_starts) - for every block and class, the number of keys and
+               the index in the array where the group starts.
+    """
+    block_count = len(layout.sizes)
+    counts = np.bincount(layout.block_of * class_count + classes,
+                         minlength=block_count * class_count).reshape(block_count, class_count)
+    block_starts = layout.positions[layout.offsets]
+    class_starts = block_starts[:, None] + np.cumsum(counts, axis=1) - counts
+
+    # Sorting the small class labels (radix sort) lists the keys by class, and by block and
+    # position within each class; only the offsets of every (block, class) group are needed
+    order = np.argsort(classes, kind="stable")
+    class_totals = counts.sum(axis=0)
+    earlier_blocks = np.cumsum(counts, axis=0) - counts
+    group_bases = class_starts - earlier_blocks - (np.cumsum(class_totals) - class_totals)
+    groups = layout.block_of[order] * class_count + classes[order]
+    array_to_sort[group_bases.ravel()[groups] + np.arange(order.size)] = keys[order]
+    return counts, class_starts
+
+
+def merge_level(array_to_sort: np.ndarray, ranges: list, counter=counters) -> None:
+    """
+    Merges the sorted halves of every range, each split at (left + right) // 2.
+
+    Long halves are merged one range at a time (see merge). Short ones are merged all
+    together: the final position of a key of a right half is its index in that half plus the
+    number of keys of the left half that are <= it (stable), and one branch-free binary search
+    finds these ranks for every right half of the level at once. The keys of the left halves
+    then fill the remaining slots in order.
+    The comparisons and writes of each merge are counted exactly as merge() counts them.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the ranges.
+        ranges (list): (left, right) pairs, disjoint and in increasing order.
+        counter: Where comparisons and writes are counted.
+    """
+    bounds = np.array(ranges, dtype=np.int64)
+    lefts, rights = bounds[:, 0], bounds[:, 1]
+    mids = (lefts + rights) // 2
+    left_sizes = mids - lefts + 1
+    if left_sizes.max() > BATCH_SEARCH_LIMIT:
+        for left, right in ranges:
+            merge(array_to_sort, left, right, counter)
+        return
+
+    right_layout = BlockLayout(np.stack((mids + 1, rights), axis=1))
+    pair_of = right_layout.block_of
+    right_keys = array_to_sort[right_layout.positions]
+
+    # For every key of a right half, how many keys of its left half are <= it
+    base = lefts[pair_of]
+    length = left_sizes[pair_of]
+    for _ in range(int(left_sizes.max()).bit_length()):
+        half = length >> 1
+        goes_after = (array_to_sort[base + half] <= right_keys) & (length > 0)
+        base += goes_after * (half + 1)
+        length = np.where(goes_after, length - half - 1, half)
+    ranks = base - lefts[pair_of]
+
+    # merge() compares until one half runs out, the keys left in the other are not compared
+    last_right = right_layout.offsets + right_layout.sizes - 1
+    left_runs_out = array_to_sort[mids] <= array_to_sort[rights]
+    right_keys_left = np.bincount(pair_of[ranks == left_sizes[pair_of]], minlength=len(bounds))
+    left_keys_left = left_sizes - ranks[last_right]
+    not_compared = np.where(left_runs_out, right_keys_left, left_keys_left)
+    counter.comparison_count += int((rights - lefts + 1 - not_compared).sum())
+    counter.record_writes(int((rights - lefts + 1).sum()))
+
+    # Left keys before it plus right keys before it
+    right_destinations = ranks + right_layout.positions - left_sizes[pair_of]
+
+    # The slots of all the ranges, relative to the first one, minus the ones taken by right keys
+    origin = lefts[0]
+    span = array_to_sort[origin:rights[-1] + 1]
+    range_edges = np.zeros(span.size + 1, dtype=np.int8)
+    range_edges[lefts - origin] += 1
+    range_edges[rights - origin + 1] -= 1
+    left_slots = np.cumsum(range_edges[:-1], dtype=np.int8).astype(bool)
+    left_slots[right_destinations - origin] = False
+    left_keys = array_to_sort[BlockLayout(np.stack((lefts, mids), axis=1)).positions]
+    span[right_destinations - origin] = right_keys
+    span[left_slots] = left_keys
+
+
+def merge(array_to_sort: np.ndarray, left: int, right: int, counter=counters) -> None:
+    """
+    Merges the sorted halves of array_to_sort[left:right + 1], split at (left + right) // 2.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the halves.
+        left (int): Starting index of the left half.
+        right (int): Ending index of the right half.
+        counter: Where comparisons and writes are counted.
+    """
+    mid = (left + right) // 2
+    left_half = array_to_sort[left:mid + 1].copy()
+    right_half = array_to_sort[mid + 1:right + 1].copy()
+
+    # A key of the right half goes after the keys of the left half that are <= it (stable)
+    right_positions = np.searchsorted(left_half, right_half, side="right") + np.arange(right_half.size)
+    from_left = np.ones(right - left + 1, dtype=bool)
+    from_left[right_positions] = False
+    merged = array_to_sort[left:right + 1]
+    merged[right_positions] = right_half
+    merged[from_left] = left_half
+
+    # merge() compares until one half runs out, the keys left in the other are not compared
+    if left_half[-1] <= right_half[-1]:
+        not_compared = right_half.size - int(np.searchsorted(right_half, left_half[-1], side="left"))
+    else:
+        not_compared = left_half.size - int(np.searchsorted(left_half, right_half[-1], side="right"))
+    counter.comparison_count += right - left + 1 - not_compared
+    counter.record_writes(right - left + 1)
+
+
+def insertion_sort_blocks(array_to_sort: np.ndarray, blocks: list, counter=counters) -> None:
+    """
+    Insertion sorts many disjoint blocks at once.
+
+    The blocks become the rows of a matrix, padded at the end with the largest value of the
+    dtype, and insertion sort runs on all rows together column by column: every step moves
+    the keys of the rows that are still shifting one place right and drops the rows whose
+    key found its place. Comparisons, swaps (shifts) and writes are counted exactly like
+    insertion_sort counts them on each block.
+
+    Parameters:
+        array_to_sort (np.ndarray): The array holding the blocks.
+        blocks (list): (low, high) ranges, each to be sorted.
+        counter: Where comparisons and swaps are counted.
+    """
+    bounds = np.array(blocks, dtype=np.int64).reshape(-1, 2)
+    if not bounds.size:
+        return
+    starts = bounds[:, 0]
+    sizes = bounds[:, 1] - starts + 1
+    width = int(sizes.max())
+
+    columns = np.arange(width)
+    valid = columns < sizes[:, None]
+    indices = starts[:, None] + np.minimum(columns, sizes[:, None] - 1)
+    rows = array_to_sort[indices]
+    rows[~valid] = padding_value(array_to_sort.dtype)
+
+    comparisons = swaps = 0
+    for i in range(1, width):
+        key = rows[:, i].copy()
+        active = np.flatnonzero(valid[:, i])
+        j = i - 1
+        while j >= 0 and active.size:
+            comparisons += active.size
+            previous = rows[active, j]
+            moving = previous > key[active]
+            stopped = active[~moving]
+            rows[stopped, j + 1] = key[stopped]
+            active = active[moving]
+            rows[active, j + 1] = previous[moving]
+            swaps += active.size
+            j -= 1
+        rows[active, 0] = key[active]
+
+    # insertion_sort counts two writes per swap; its final `= key` store rewrites the key
+    # the last swap already put there and is not counted
+    counter.comparison_count += comparisons
+    counter.swap_count += swaps
+    counter.record_writes(2 * swaps)
+    array_to_sort[indices[valid]] = rows[valid]
+
+
+def padding_value(dtype):
+    """The largest value of a numeric dtype."""
+    if np.issubdtype(dtype, np.integer):
+        return np.iinfo(dtype).max
+    return np.inf
+
+
+def as_ndarray(array_to_sort) -> np.ndarray:
+    """The array itself if it already is an ndarray, otherwise an int64 copy of it."""
+    if isinstance(array_to_sort, np.ndarray):
+        return array_to_sort
+    return np.array(array_to_sort, dtype=np.int64)
+
+
+def write_back(array_to_sort, values: np.ndarray, low: int, high: int) -> None:
+    """Copies the sorted range back when a list was sorted through an ndarray copy."""
+    if values is not array_to_sort:
+        array_to_sort[low:high + 1] = values[low:high + 1].tolist()
+
+
+if __name__ == "__main__":
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format, as_ndarray=True)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
+
+    if n < 40:
+        print("Initial array:", " ".join(f"{x:02}" for x in array))
+
+    counters.reset_counters()  # Reset counters before sorting
+    quick_sort(array, 0, n - 1)  # Sort the array in place, with correct low and high indices
+
+    if n < 40:
+        print("Sorted array:", " ".join(f"{x:02}" for x in array))
+
+    print(f"Total comparisons: {counters.comparison_count}")
+    print(f"Total swaps: {counters.swap_count}")
+
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
+        print("The array is correctly sorted.")
+    else:
+        print("The array is NOT correctly sorted.")
@@ -0,0 +1,173 @@
+import heapq
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List
+import utils.binary_io as binary_io
+from utils.instrumentation import uninstrumented
+from quick_sort import quick_sort
+from merge_sort import merge_sort
+
+# Sorts the workers can run on their chunk, by name (a name pickles, a function may not)
+CHUNK_SORTS = {
+    "merge_sort": merge_sort,
+    "quick_sort": quick_sort,
+}
+
+METHODS = ("sample", "merge")
+
+ITEM_SIZE = array("q").itemsize
+
+
+def parallel_sort(array_to_sort: List[int], low: int, high: int, workers: int = None,
+                  method: str = "sample", chunk_sort: str = "merge_sort") -> None:
+    """
+    Sorts a subarray of int64 keys on several cores.
+
+    The keys are copied once into a shared memory buffer, which the worker processes attach
+    to by name, so no keys are pickled. Every worker sorts one chunk of the buffer with
+    `chunk_sort` (uninstrumented, nothing is counted), then the sorted chunks are combined:
+     - "merge": the parent merges all chunks with a k-way heap merge (heapq.merge),
+     - "sample": sample sort by regular sampling - every chunk gives `workers` evenly spaced
+       keys, the sorted samples give workers - 1 splitters, and each worker merges the keys
+       between two neighbouring splitters from all chunks into its own part of a second
+       shared buffer. Both phases run in parallel.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted (keys must fit in int64).
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        workers (int): Number of worker processes, os.cpu_count() by default.
+        method (str): "sample" or "merge".
+        chunk_sort (str): Sort the workers run on their chunks, a key of CHUNK_SORTS.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if chunk_sort not in CHUNK_SORTS:
+        raise ValueError(f"Unknown chunk sort: {chunk_sort}")
+    n = high - low + 1
+    if n < 2:
+        return
+    workers = max(1, min(workers or os.cpu_count(), n))
+
+    keys = SharedMemory(create=True, size=n * ITEM_SIZE)
+    output = SharedMemory(create=True, size=n * ITEM_SIZE) if method == "sample" and workers > 1 else None
+    view = keys.buf.cast("q")
+    try:
+        view[:] = array("q", array_to_sort[low:high + 1])
+        chunks = [(worker * n // workers, (worker + 1) * n // workers) for worker in range(workers)]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(sort_chunk, [keys.name] * workers, *zip(*chunks), [chunk_sort] * workers))
+
+            if workers == 1:
+                result = view.tolist()
+            elif method == "merge":
+                result = list(heapq.merge(*(view[start:stop].tolist() for start, stop in chunks)))
+            else:
+                buckets = split_by_samples(view, chunks, workers)
+                output_starts = [0]
+                for bucket in buckets[:-1]:
+                    output_starts.append(output_starts[-1] + sum(stop - start for start, stop in bucket))
+                list(executor.map(merge_bucket, [keys.name] * workers, [output.name] * workers,
+                                  buckets, output_starts))
+                result = output.buf.cast("q").tolist()
+
+        array_to_sort[low:high + 1] = result
+    finally:
+        # Views into a shared buffer have to be released before it can be closed
+        view.release()
+        for shared in (keys, output):
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+
+
+def split_by_samples(view, chunks: list, workers: int) -> list:
+    """
+    Picks workers - 1 splitters from regular samples of the sorted chunks and cuts every
+    chunk at them.
+
+    Parameters:
+        view: The shared buffer, as int64 keys.
+        chunks (list): (start, stop) of every sorted chunk.
+        workers (int): Number of buckets.
+
+    Returns:
+        list: One bucket per worker, a bucket being the (start, stop) slice of every chunk
+              holding its keys. Bucket j gets the keys between splitters j - 1 and j.
+    """
+    samples = sorted(view[start + sample * (stop - start) // workers]
+                     for start, stop in chunks if stop > start
+                     for sample in range(workers))
+    splitters = [samples[bucket * len(samples) // workers] for bucket in range(1, workers)]
+
+    cuts = [[start] + [bisect_right(view, splitter, start, stop) for splitter in splitters] + [stop]
+            for start, stop in chunks]
+    return [[(chunk_cuts[bucket], chunk_cuts[bucket + 1]) for chunk_cuts in cuts] for bucket in range(workers)]
+
+
+def sort_chunk(buffer_name: str, start: int, stop: int, chunk_sort: str) -> None:
+    """
+    Worker: sorts view[start:stop] of the shared buffer in place.
+    """
+    shared = attach(buffer_name)
+    view = shared.buf.cast("q")
+    chunk = view[start:stop].tolist()
+    uninstrumented(CHUNK_SORTS[chunk_sort])(chunk, 0, len(chunk) - 1)
+    view[start:stop] = array("q", chunk)
+    view.release()
+    shared.close()
+
+
+def merge_bucket(input_name: str, output_name: str, bucket: list, output_start: int) -> None:
+    """
+    Worker: merges the sorted slices of one bucket into the output buffer from output_start on.
+    """
+    keys, output = attach(input_name), attach(output_name)
+    view, output_view = keys.buf.cast("q"), output.buf.cast("q")
+    merged = array("q", heapq.merge(*(view[start:stop].tolist() for start, stop in bucket)))
+    output_view[output_start:output_start + len(merged)] = merged
+    view.release()
+    output_view.release()
+    keys.close()
+    output.close()
+
+
+def attach(name: str) -> SharedMemory:
+    """
+    Opens a shared buffer created by the parent process. The parent owns it and unlinks it;
+    the workers share the parent's resource tracker, so attaching does not register it twice.
+    """
+    return SharedMemory(name=name)
+
+
+if __name__ == "__main__":
+    options = binary_io.parse_arguments(sys.argv[1:], "number of worker processes, all CPUs by default")
+    array_to_sort = binary_io.read_keys(options.input, options.format)
+    n = len(array_to_sort)
+    checksum = binary_io.key_checksum(array_to_sort)  # Fingerprint of the input keys, instead of a copy
+    workers = options.count
+
+    if n < 40:
+        print("Initial array:", " ".join(f"{x:02}" for x in array_to_sort))
+
+    parallel_sort(array_to_sort, 0, n - 1, workers)
+
+    if n < 40:
+        print("Sorted array:", " ".join(f"{x:02}" for x in array_to_sort))
+
+    if options.output is not None:
+        binary_io.write_keys(array_to_sort, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array_to_sort) and binary_io.key_checksum(array_to_sort) == checksum:
+        print("The array is correctly sorted.")
+    else:
+        print("The array is NOT correctly sorted.")
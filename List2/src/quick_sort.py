@@ -2,27 +2,90 @@ from typing import List
 import sys
 import random
 import utils.counters as counters
+import utils.binary_io as binary_io
+from heap_sort import heap_sort
 
 
-def quick_sort(array_to_sort: List[int], low: int, high: int) -> None:
+PARTITION_SCHEMES = ("lomuto", "three_way")
+
+
+def quick_sort(array_to_sort: List[int], low: int, high: int, counter=counters,
+               partition_scheme: str = "lomuto") -> None:
     """
-    Implements the quick sort algorithm to sort an array in place with a random pivot.
+    Implements the quick sort algorithm to sort an array in place with a median-of-three pivot.
     Tracks comparisons and swaps during sorting.
 
+    The recursion is replaced by an explicit stack: after each partition the larger side is
+    pushed and the loop continues with the smaller one, so the stack never holds more than
+    log2(n) ranges. When a range is partitioned more than 2 * log2(n) times the input is
+    adversarial and the range is finished with heap sort instead (introsort), which keeps
+    the worst case at O(n log n).
+
+    With partition_scheme="three_way" every partition also gathers the keys equal to the pivot
+    in the middle and leaves them out of both sides, so inputs with few distinct keys are
+    sorted in O(n * number of distinct keys).
+
     Parameters:
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the array segment to be sorted.
         high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+        partition_scheme (str): "lomuto" (single pivot) or "three_way" (fat pivot).
 
     Returns:
         None - It sorts the array in place.
     """
-    if low < high:
-        pivot_index = partition(array_to_sort, low, high)
-        quick_sort(array_to_sort, low, pivot_index - 1)  # Left sub-array
-        quick_sort(array_to_sort, pivot_index + 1, high)  # Right sub-array
+    if partition_scheme not in PARTITION_SCHEMES:
+        raise ValueError(f"Unknown partition scheme: {partition_scheme}")
+    if low >= high:
+        return
+
+    depth_limit = 2 * ((high - low + 1).bit_length() - 1)  # 2 * floor(log2(n))
+    stack = [(low, high, 0)]
+
+    while stack:
+        low, high, depth = stack.pop()
+        while low < high:
+            if depth > depth_limit:
+                heap_sort(array_to_sort, low, high, counter)
+                break
 
-def partition(array_to_sort: List[int], low: int, high: int) -> int:
+            left_high, right_low = split(array_to_sort, low, high, counter, partition_scheme)
+            depth += 1
+
+            # Push the larger side, keep going with the smaller one
+            if left_high - low < high - right_low:
+                stack.append((right_low, high, depth))  # Right sub-array
+                high = left_high
+            else:
+                stack.append((low, left_high, depth))  # Left sub-array
+                low = right_low
+
+
+def split(array_to_sort: List[int], low: int, high: int, counter=counters,
+          partition_scheme: str = "lomuto") -> tuple:
+    """
+    Partitions the array with the chosen scheme.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be partitioned.
+        low (int): The starting index of the partition.
+        high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
+        partition_scheme (str): "lomuto" or "three_way".
+
+    Returns:
+        tuple: (end of the left part, start of the right part); everything in between
+               is already in its final position.
+    """
+    if partition_scheme == "three_way":
+        equal_low, equal_high = partition_three_way(array_to_sort, low, high, counter)
+        return equal_low - 1, equal_high + 1
+    pivot_index = partition(array_to_sort, low, high, counter)
+    return pivot_index - 1, pivot_index + 1
+
+def partition(array_to_sort: List[int], low: int, high: int, counter=counters) -> int:
     """
     Partitions the array into two sub-arrays based on a pivot chosen randomly.
     Rearranges the elements in the array such that all elements less than the pivot
@@ -32,6 +95,7 @@ def partition(array_to_sort: List[int], low: int, high: int) -> int:
         array_to_sort (List[int]): The array to be partitioned.
         low (int): The starting index of the partition.
         high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
 
     Returns:
         int: The index of the pivot after partitioning.
@@ -46,17 +110,105 @@ def partition(array_to_sort: List[int], low: int, high: int) -> int:
     
     i = low - 1
     for j in range(low, high):
-        if counters.compare(array_to_sort[j], pivot):  # If current element <= pivot
+        if counter.compare(array_to_sort[j], pivot):  # If current element <= pivot
             i += 1
-            counters.swap(array_to_sort, i, j)  # Swap the elements
+            counter.swap(array_to_sort, i, j)  # Swap the elements
 
-    counters.swap(array_to_sort, i + 1, high)  # Place pivot in the correct position
+    counter.swap(array_to_sort, i + 1, high)  # Place pivot in the correct position
     return i + 1
 
+def partition_three_way(array_to_sort: List[int], low: int, high: int, counter=counters) -> tuple:
+    """
+    Partitions the array into three sub-arrays: elements less than, equal to and greater
+    than a median-of-three pivot (Bentley-McIlroy).
+
+    Both ends are scanned towards each other like in Hoare's partition. Elements equal to
+    the pivot are parked at the two ends of the range and swapped into the middle at the
+    end, so there are no extra swaps when the keys are distinct and sorted input stays sorted.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be partitioned.
+        low (int): The starting index of the partition.
+        high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        tuple: (first, last) index of the elements equal to the pivot.
+    """
+    def less(a, b):
+        return not counter.compare(b, a)
+
+    def equal(a, b):
+        return counter.compare(a, b) and counter.compare(b, a)
+
+    # Two elements: no middle sample to take the median of, just order them
+    if high - low < 2:
+        if high > low and less(array_to_sort[high], array_to_sort[low]):
+            counter.swap(array_to_sort, low, high)
+        if high > low and counter.compare(array_to_sort[high], array_to_sort[low]):
+            return low, high
+        return low, low
+
+    # Median of three: the median goes to the front, the smallest sample to the middle and
+    # the largest to the end (just moving the median to the front makes reversed input quadratic)
+    mid = (low + high) // 2
+    if less(array_to_sort[mid], array_to_sort[low]):
+        counter.swap(array_to_sort, low, mid)
+    if less(array_to_sort[high], array_to_sort[mid]):
+        counter.swap(array_to_sort, mid, high)
+        if less(array_to_sort[mid], array_to_sort[low]):
+            counter.swap(array_to_sort, low, mid)
+    counter.swap(array_to_sort, low, mid)
+    pivot = array_to_sort[low]
+
+    # array_to_sort[low:equal_left + 1] and array_to_sort[equal_right:high + 1] hold keys equal to the pivot
+    i, j = low, high + 1
+    equal_left, equal_right = low, high + 1
+    while True:
+        i += 1
+        while less(array_to_sort[i], pivot):
+            if i == high:
+                break
+            i += 1
+        j -= 1
+        while less(pivot, array_to_sort[j]):
+            if j == low:
+                break
+            j -= 1
+
+        # The pointers crossed
+        if i == j and equal(array_to_sort[i], pivot):
+            equal_left += 1
+            counter.swap(array_to_sort, equal_left, i)
+        if i >= j:
+            break
+
+        # Both scans stopped on their condition, so after the swap array_to_sort[i] <= pivot
+        # and array_to_sort[j] >= pivot, and one comparison tells whether they are equal to it
+        counter.swap(array_to_sort, i, j)
+        if counter.compare(pivot, array_to_sort[i]):
+            equal_left += 1
+            counter.swap(array_to_sort, equal_left, i)
+        if counter.compare(array_to_sort[j], pivot):
+            equal_right -= 1
+            counter.swap(array_to_sort, equal_right, j)
+
+    # Move the parked equal keys from both ends into the middle
+    i = j + 1
+    for k in range(low, equal_left + 1):
+        counter.swap(array_to_sort, k, j)
+        j -= 1
+    for k in range(high, equal_right - 1, -1):
+        counter.swap(array_to_sort, k, i)
+        i += 1
+
+    return j + 1, i - 1
+
 if __name__ == "__main__":
-    input_data = sys.stdin.read().splitlines()
-    n = int(input_data[0].strip())
-    array = list(map(int, input_data[1].split()))
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
     
     if n < 40:
         print("Initial array:", " ".join(str(x) for x in array))
@@ -69,9 +221,11 @@ if __name__ == "__main__":
     
     print(f"Total comparisons: {counters.comparison_count}")
     print(f"Total swaps: {counters.swap_count}")
-    original_array = array[:]  # Make a copy of the original array
-    # Check if the result is a sorted version of the input
-    if array == sorted(original_array):
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
         print("The array is correctly sorted.")
     else:
-        print("The array is NOT correctly sorted.")
\ No newline at end of file
+        print("The array is NOT correctly sorted.")
@@ -0,0 +1,137 @@
+from typing import List
+import sys
+import utils.counters as counters
+import utils.binary_io as binary_io
+
+# Bits of the key handled by one LSD radix pass
+RADIX_BITS = 8
+RADIX = 1 << RADIX_BITS
+
+
+def integer_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Sorts integer keys without comparing them, picking the engine from the key range.
+
+    Counting sort needs O(n + range) time and a table of `range` counters, LSD radix sort
+    needs one O(n) pass per byte of the range. Counting sort is used when its table is no
+    larger than the work of the radix passes, i.e. when range <= n * passes - this covers
+    the permutations of 1..n and the 1..100 keys of generate_random.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        counter: Where writes are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    if low >= high:
+        return
+    minimum, maximum = min(array_to_sort[low:high + 1]), max(array_to_sort[low:high + 1])
+    key_range = maximum - minimum + 1
+    if key_range <= (high - low + 1) * radix_passes(key_range):
+        counting_sort(array_to_sort, low, high, counter)
+    else:
+        radix_sort(array_to_sort, low, high, counter)
+
+
+def counting_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Implements counting sort: counts the occurrences of every key between the smallest and
+    the largest one, then writes the keys back in order. No comparisons are made.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        counter: Where writes are counted.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    if low >= high:
+        return
+    minimum = min(array_to_sort[low:high + 1])
+    occurrences = [0] * (max(array_to_sort[low:high + 1]) - minimum + 1)
+    for i in range(low, high + 1):
+        occurrences[array_to_sort[i] - minimum] += 1
+
+    position = low
+    for offset, count in enumerate(occurrences):
+        if count:
+            array_to_sort[position:position + count] = [minimum + offset] * count
+            position += count
+    counter.record_writes(high - low + 1)
+
+
+def radix_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Implements LSD radix sort over bytes.
+
+    The keys are shifted by the smallest one, so negative keys work too, and distributed into
+    RADIX buckets by one byte per pass, from the least significant byte up. Every pass is
+    stable, so after the last one the keys are sorted. A pass whose byte is the same for all
+    keys moves nothing and is skipped. No comparisons are made; every pass writes each key
+    once into its bucket and once back into the array.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the array segment to be sorted.
+        high (int): The ending index of the array segment to be sorted.
+        counter: Where writes are counted.
+
+    Returns:
+        None - It sorts the array in place.
+    """
+    if low >= high:
+        return
+    keys = array_to_sort[low:high + 1]
+    minimum = min(keys)
+    passes = radix_passes(max(keys) - minimum + 1)
+
+    for shift in range(0, passes * RADIX_BITS, RADIX_BITS):
+        buckets = [[] for _ in range(RADIX)]
+        for key in keys:
+            buckets[((key - minimum) >> shift) & (RADIX - 1)].append(key)
+        if any(len(bucket) == len(keys) for bucket in buckets):
+            continue
+        keys = [key for bucket in buckets for key in bucket]
+        counter.record_writes(2 * len(keys))
+
+    array_to_sort[low:high + 1] = keys
+    counter.record_writes(len(keys))
+
+
+def radix_passes(key_range: int) -> int:
+    """Number of RADIX_BITS-bit digits needed for the keys 0..key_range - 1 (at least 1)."""
+    return max(1, -(-(key_range - 1).bit_length() // RADIX_BITS))
+
+
+if __name__ == "__main__":
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+    checksum = binary_io.key_checksum(array)  # Fingerprint of the input keys, instead of a copy
+
+    if n < 40:
+        print("Initial array:", " ".join(f"{x:02}" for x in array))
+
+    counters.reset_counters()  # Reset counters before sorting
+    integer_sort(array, 0, n - 1)  # Sort the array in place, with correct low and high indices
+
+    if n < 40:
+        print("Sorted array:", " ".join(f"{x:02}" for x in array))
+
+    print(f"Total comparisons: {counters.comparison_count}")
+    print(f"Total writes: {counters.write_count}")
+
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
+
+    # Check in one pass that the result is sorted and holds the input keys
+    if binary_io.is_sorted(array) and binary_io.key_checksum(array) == checksum:
+        print("The array is correctly sorted.")
+    else:
+        print("The array is NOT correctly sorted.")
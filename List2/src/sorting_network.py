@@ -0,0 +1,83 @@
+from typing import List
+import sys
+import utils.counters as counters
+import utils.binary_io as binary_io
+
+# Largest block network_sort accepts
+NETWORK_MAX_SIZE = 16
+
+# Comparators of the network for every block size, built on first use
+_networks = {}
+
+
+def network_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
+    """
+    Sorts a block of at most NETWORK_MAX_SIZE elements with Batcher's odd-even merge sorting
+    network: a fixed sequence of compare-exchanges that does not depend on the keys, so the
+    number of comparisons is the same for every input (63 for 16 elements) and there are no
+    data-dependent loops. Not stable.
+
+    Parameters:
+        array_to_sort (List[int]): The array to be sorted.
+        low (int): The starting index of the block to be sorted.
+        high (int): The ending index of the block to be sorted.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        None - the block is sorted in place.
+    """
+    size = high - low + 1
+    if size > NETWORK_MAX_SIZE:
+        raise ValueError(f"network_sort sorts at most {NETWORK_MAX_SIZE} elements, got {size}")
+    for i, j in sorting_network(size):
+        if not counter.compare(array_to_sort[low + i], array_to_sort[low + j]):
+            counter.swap(array_to_sort, low + i, low + j)
+
+
+def sorting_network(size: int) -> list:
+    """
+    Comparators (i, j), i < j, of Batcher's odd-even merge sort for `size` elements.
+
+    The network is built for the next power of two; the comparators that reach past the
+    block are dropped, which is the same as padding the block with infinitely large keys.
+
+    Returns:
+        list: The comparators in the order they are applied.
+    """
+    if size not in _networks:
+        width = 1
+        while width < size:
+            width *= 2
+        comparators = []
+        # Standard iterative form: p is the size of the sorted runs being merged, k the
+        # distance of the comparators within the merge
+        p = 1
+        while p < width:
+            k = p
+            while k >= 1:
+                for j in range(k % p, width - k, 2 * k):
+                    for i in range(min(k, width - j - k)):
+                        if (i + j) // (2 * p) == (i + j + k) // (2 * p) and i + j + k < size:
+                            comparators.append((i + j, i + j + k))
+                k //= 2
+            p *= 2
+        _networks[size] = comparators
+    return _networks[size]
+
+
+if __name__ == "__main__":
+    options = binary_io.parse_arguments(sys.argv[1:])
+    array = binary_io.read_keys(options.input, options.format)
+    n = len(array)
+
+    print("Initial array:", " ".join(f"{x:02}" for x in array))
+
+    counters.reset_counters()  # Reset counters before sorting
+    network_sort(array, 0, n - 1)  # Sort the array in place, with correct low and high indices
+
+    print("Sorted array:", " ".join(f"{x:02}" for x in array))
+    print(f"Total comparisons: {counters.comparison_count}")
+    print(f"Total swaps: {counters.swap_count}")
+
+    if options.output is not None:
+        binary_io.write_keys(array, options.output, options.format)
@@ -0,0 +1,107 @@
+import random
+import sys
+import time
+import utils.counters as counters
+from utils.instrumentation import uninstrumented
+from utils.threshold_cache import store_threshold
+from hybrid_sort import hybrid_sort
+
+# "python" - uninstrumented hybrid_sort, "counted" - hybrid_sort counting into a Counters
+# instance, "numpy" - numpy_backend.hybrid_sort
+BACKENDS = ("python", "counted", "numpy")
+
+# Key type each backend is tuned for when none is given
+DEFAULT_KEY_TYPES = {"python": "int", "counted": "int", "numpy": "int64"}
+
+CANDIDATES = (0, 2, 4, 6, 8, 10, 12, 16, 20, 24, 32, 48, 64)
+
+
+def tune_threshold(backend: str = "python", key_type_name: str = None, candidates: tuple = CANDIDATES,
+                   sample_size: int = 20000, repetitions: int = 3, seed: int = 0, save: bool = True) -> int:
+    """
+    Finds the fastest hybrid_sort threshold for a backend and key type on this machine and
+    stores it in the cache that hybrid_sort reads its default threshold from.
+
+    Parameters:
+        backend (str): One of BACKENDS.
+        key_type_name (str): "int" or "float" for the Python backends, a dtype name for "numpy".
+        candidates (tuple): Thresholds to try.
+        sample_size (int): Number of keys of the calibration sample.
+        repetitions (int): Each threshold is timed this many times, the best time counts.
+        seed (int): Seed of the calibration sample.
+        save (bool): Whether to store the result in the cache.
+
+    Returns:
+        int: The fastest threshold.
+    """
+    key_type_name = key_type_name or DEFAULT_KEY_TYPES[backend]
+    timings = measure_thresholds(backend, key_type_name, candidates, sample_size, repetitions, seed)
+    best = min(timings, key=timings.get)
+    if save:
+        store_threshold(key_type_name, backend, best)
+    return best
+
+
+def measure_thresholds(backend: str = "python", key_type_name: str = None, candidates: tuple = CANDIDATES,
+                       sample_size: int = 20000, repetitions: int = 3, seed: int = 0) -> dict:
+    """
+    Times hybrid_sort on copies of one calibration sample for every candidate threshold.
+
+    Returns:
+        dict: {threshold: best time in seconds}
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    key_type_name = key_type_name or DEFAULT_KEY_TYPES[backend]
+    sample = calibration_sample(backend, key_type_name, sample_size, seed)
+
+    if backend == "numpy":
+        import numpy_backend
+        sort_function = numpy_backend.hybrid_sort
+    elif backend == "python":
+        sort_function = uninstrumented(hybrid_sort)
+    else:
+        sort_function = hybrid_sort
+
+    timings = {}
+    for threshold in candidates:
+        best = float("inf")
+        for _ in range(repetitions):
+            array = sample.copy()
+            counter = counters.Counters()
+            start = time.perf_counter()
+            sort_function(array, 0, len(array) - 1, threshold, counter=counter)
+            best = min(best, time.perf_counter() - start)
+        timings[threshold] = best
+    return timings
+
+
+def calibration_sample(backend: str, key_type_name: str, size: int, seed: int):
+    """
+    Random keys of the given type: a list for the Python backends, an ndarray for "numpy".
+    """
+    generator = random.Random(seed)
+    if key_type_name.startswith("float"):
+        keys = [generator.random() for _ in range(size)]
+    else:
+        keys = [generator.randint(1, size) for _ in range(size)]
+
+    if backend == "numpy":
+        import numpy as np
+        return np.array(keys, dtype=key_type_name)
+    if key_type_name not in ("int", "float"):
+        raise ValueError(f"The Python backends sort int or float keys, not {key_type_name}")
+    return keys
+
+
+if __name__ == "__main__":
+    backends = [sys.argv[1]] if len(sys.argv) > 1 else ["python", "counted"]
+    key_type_name = sys.argv[2] if len(sys.argv) > 2 else None
+
+    for backend in backends:
+        timings = measure_thresholds(backend, key_type_name)
+        best = min(timings, key=timings.get)
+        store_threshold(key_type_name or DEFAULT_KEY_TYPES[backend], backend, best)
+        print(f"\n{backend}:")
+        for threshold, elapsed in timings.items():
+            print(f"  threshold={threshold:<3} {elapsed:.4f}s{'  <- best' if threshold == best else ''}")
@@ -0,0 +1,177 @@
+import argparse
+import mmap
+import os
+import stat
+import sys
+from array import array
+from functools import reduce
+from itertools import islice
+from operator import le, xor
+
+# Formats the sorting scripts read and the generators write:
+#  "text" - the number of keys on the first line, the keys on the second (the original format),
+#  "raw"  - native int64 keys with no header,
+#  "npy"  - a one-dimensional integer NumPy array (needs numpy).
+FORMATS = ("text", "raw", "npy")
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# File suffix of every binary format, used when no --format is given
+SUFFIXES = {".bin": "raw", ".npy": "npy"}
+
+MASK = (1 << 64) - 1
+
+
+def parse_arguments(argv: list, count_help: str = None):
+    """
+    Parses the command line of a sorting script or a generator: the input / output options
+    and, if the script takes one, an optional number. Anything else - a malformed number or
+    an unknown option - ends the script with a usage message, and --help prints it.
+
+    Parameters:
+        argv (list): sys.argv[1:].
+        count_help (str): Help of the optional number the script takes (e.g. the number of
+                          keys), None if it takes none.
+
+    Returns:
+        argparse.Namespace: options.input, options.output, options.format and, with
+                            count_help, options.count (None when it is not given).
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=None, help="file with the keys, stdin by default")
+    parser.add_argument("--output", default=None, help="file the sorted keys are written to")
+    parser.add_argument("--format", default=None, choices=FORMATS)
+    if count_help is not None:
+        parser.add_argument("count", nargs="?", type=int, default=None, help=count_help)
+    return parser.parse_args(argv)
+
+
+def read_keys(source: str = None, key_format: str = None, as_ndarray: bool = False):
+    """
+    Reads keys from a file or stdin.
+
+    A file - also one redirected to stdin - is memory-mapped instead of being read, so the
+    binary formats are never parsed: the keys are converted from the mapped bytes in one
+    bulk call. A pipe can not be mapped and is read in one go. Text is split once and the
+    keys are converted with one map call.
+
+    Parameters:
+        source (str): Path of the file, None for stdin.
+        key_format (str): One of FORMATS; by default .npy data is recognised by its magic
+                          bytes and a file by its suffix (SUFFIXES), anything else is text.
+        as_ndarray (bool): Return an int64 ndarray (a copy-on-write map of the file when it
+                           can be mapped) instead of a list.
+
+    Returns:
+        list | numpy.ndarray: The keys.
+    """
+    stream = open(source, "rb") if source is not None else sys.stdin.buffer
+    try:
+        if stat.S_ISREG(os.fstat(stream.fileno()).st_mode) and os.fstat(stream.fileno()).st_size > 0:
+            data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            data = stream.read()
+    finally:
+        if source is not None:
+            stream.close()
+
+    if key_format is None:
+        if data[:len(NPY_MAGIC)] == NPY_MAGIC:
+            key_format = "npy"
+        else:
+            key_format = SUFFIXES.get(os.path.splitext(source or "")[1], "text")
+    if key_format not in FORMATS:
+        raise ValueError(f"Unknown format: {key_format}")
+
+    if key_format == "text":
+        fields = bytes(data).split()
+        keys = list(map(int, fields[1:int(fields[0]) + 1])) if fields else []
+        if as_ndarray:
+            import numpy as np
+            return np.array(keys, dtype=np.int64)
+        return keys
+
+    if key_format == "raw":
+        if as_ndarray:
+            import numpy as np
+            keys = np.frombuffer(data, dtype=np.int64)
+            # A mapped file is copy-on-write, bytes read from a pipe are not
+            return keys if keys.flags.writeable else keys.copy()
+        return memoryview(data).cast("q").tolist()
+
+    import io
+    import numpy as np
+    if isinstance(data, mmap.mmap) and source is not None:
+        data.close()
+        keys = np.load(source, mmap_mode="c")
+    else:
+        keys = np.load(io.BytesIO(data))
+    if keys.ndim != 1 or keys.dtype.kind not in "iu":
+        raise ValueError(f"Expected a one-dimensional integer array, got {keys.dtype} of shape {keys.shape}")
+    return keys.astype(np.int64, copy=False) if as_ndarray else keys.tolist()
+
+
+def write_keys(keys, destination: str = None, key_format: str = None) -> None:
+    """
+    Writes all keys in one bulk write.
+
+    Parameters:
+        keys (list | numpy.ndarray): The keys (int64 for the binary formats).
+        destination (str): Path of the file, None for stdout.
+        key_format (str): One of FORMATS; by default taken from the suffix of the
+                          destination (SUFFIXES), text otherwise.
+    """
+    if key_format is None:
+        key_format = SUFFIXES.get(os.path.splitext(destination or "")[1], "text")
+    if key_format not in FORMATS:
+        raise ValueError(f"Unknown format: {key_format}")
+
+    if key_format == "text":
+        data = f"{len(keys)}\n{' '.join(map(str, keys))}\n".encode()
+    elif key_format == "raw":
+        data = keys.astype("=i8", copy=False).tobytes() if hasattr(keys, "dtype") else array("q", keys).tobytes()
+    else:
+        import io
+        import numpy as np
+        buffer = io.BytesIO()
+        np.save(buffer, np.asarray(keys, dtype=np.int64))
+        data = buffer.getvalue()
+
+    if destination is None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+    else:
+        with open(destination, "wb") as file:
+            file.write(data)
+
+
+def is_sorted(keys, low: int = 0, high: int = None) -> bool:
+    """
+    Checks in one O(n) pass that keys[low..high] is in non-decreasing order, without copying
+    or sorting it.
+    """
+    high = len(keys) - 1 if high is None else high
+    if high - low < 1:
+        return True
+    if hasattr(keys, "dtype"):
+        return bool((keys[low:high] <= keys[low + 1:high + 1]).all())
+    return all(map(le, islice(keys, low, high), islice(keys, low + 1, high + 1)))
+
+
+def key_checksum(keys) -> tuple:
+    """
+    A fingerprint of the multiset of keys: their number, the sum of the keys, the sum of
+    their squares and their xor, all modulo 2^64. It does not depend on the order, so a
+    sorted array has the checksum of its input; a lost, duplicated or changed key changes it
+    unless the changes cancel out in all four. Together with is_sorted it replaces comparing
+    the result with sorted(input) at O(n) time and no copy.
+    """
+    if hasattr(keys, "dtype"):
+        import numpy as np
+        unsigned = keys.astype(np.int64, copy=False).view(np.uint64)
+        return (len(keys), int(unsigned.sum(dtype=np.uint64)),
+                int((unsigned * unsigned).sum(dtype=np.uint64)),
+                int(np.bitwise_xor.reduce(unsigned)) if len(keys) else 0)
+    return (len(keys), sum(keys) & MASK, sum(key * key for key in keys) & MASK,
+            reduce(xor, keys, 0) & MASK)
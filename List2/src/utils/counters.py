@@ -1,5 +1,7 @@
 comparison_count = 0
 swap_count = 0
+write_count = 0
+io_bytes = 0
 
 def compare(a: int, b: int) -> bool:
     """Compares two elements and increments the comparison counter."""
@@ -8,13 +10,68 @@ def compare(a: int, b: int) -> bool:
     return a <= b
 
 def swap(arr: list, i: int, j: int) -> None:
-    """Swaps two elements in the array and increments the swap counter."""
-    global swap_count
+    """Swaps two elements in the array and increments the swap counter (and the write counter by 2)."""
+    global swap_count, write_count
     arr[i], arr[j] = arr[j], arr[i]
     swap_count += 1
+    write_count += 2
+
+def record_writes(count: int) -> None:
+    """Adds `count` element writes that are not swaps (e.g. copying a merged run back)."""
+    global write_count
+    write_count += count
+
+def record_io(count: int) -> None:
+    """Adds `count` bytes read from or written to a file (e.g. the runs of external_sort)."""
+    global io_bytes
+    io_bytes += count
 
 def reset_counters() -> None:
-    """Resets the comparison and swap counters."""
-    global comparison_count, swap_count
+    """Resets the comparison, swap, write and I/O counters."""
+    global comparison_count, swap_count, write_count, io_bytes
     comparison_count = 0
     swap_count = 0
+    write_count = 0
+    io_bytes = 0
+
+
+class Counters:
+    """
+    Counters owned by a single sort call, an alternative to the module-level globals above.
+
+    Every instrumented sort takes a `counter` argument that defaults to this module, so by
+    default it counts into the globals. Passing a Counters instance instead keeps the counts
+    of that call separate, which makes counting safe when several sorts run in parallel threads.
+    """
+
+    def __init__(self):
+        self.comparison_count = 0
+        self.swap_count = 0
+        self.write_count = 0
+        self.io_bytes = 0
+
+    def compare(self, a: int, b: int) -> bool:
+        """Compares two elements and increments the comparison counter."""
+        self.comparison_count += 1
+        return a <= b
+
+    def swap(self, arr: list, i: int, j: int) -> None:
+        """Swaps two elements in the array and increments the swap counter (and the write counter by 2)."""
+        arr[i], arr[j] = arr[j], arr[i]
+        self.swap_count += 1
+        self.write_count += 2
+
+    def record_writes(self, count: int) -> None:
+        """Adds `count` element writes that are not swaps (e.g. copying a merged run back)."""
+        self.write_count += count
+
+    def record_io(self, count: int) -> None:
+        """Adds `count` bytes read from or written to a file (e.g. the runs of external_sort)."""
+        self.io_bytes += count
+
+    def reset_counters(self) -> None:
+        """Resets the comparison, swap, write and I/O counters."""
+        self.comparison_count = 0
+        self.swap_count = 0
+        self.write_count = 0
+        self.io_bytes = 0
@@ -0,0 +1,134 @@
+import csv
+import os
+import sys
+import time
+import tracemalloc
+import utils.counters as counters
+from utils.instrumentation import is_instrumented
+
+# Fields of a profile record, in the column order of write_records
+RECORD_FIELDS = ["function", "n", "elapsed_ns", "peak_memory_bytes", "max_recursion_depth",
+                 "comparisons", "swaps", "writes"]
+
+
+def profile(function, array, *args, trace: bool = True, **kwargs) -> tuple:
+    """
+    Calls a sort or select from List2 / List3 once and profiles the call.
+
+    function(array, *args, **kwargs) is called on `array` itself with a Counters instance
+    of its own (if the function takes a `counter`) and timed with perf_counter_ns, nothing
+    else hooked in. Tracing memory and calls slows a function down several times, so the peak
+    memory and the recursion depth are measured by a second call on a copy of the input:
+     - peak_memory_bytes: peak of the memory traced by tracemalloc during the call, above what
+       was allocated before it (the copy of the input is made before tracing starts),
+     - max_recursion_depth: the largest number of frames of one function active at a time,
+       1 for a function that does not recurse (an iterative sort whose partition helper is
+       not recursive gives 1).
+
+    Parameters:
+        function: The sort or select, e.g. quick_sort or my_select.
+        array: The input, sorted / partitioned in place like by a direct call.
+        *args, **kwargs: The other arguments, e.g. low, high (and k).
+        trace (bool): Make the second call; peak_memory_bytes and max_recursion_depth are None without it.
+
+    Returns:
+        tuple: (result of the call, record) - the record is a dict with RECORD_FIELDS;
+               the counts are None for a function without a `counter` argument.
+    """
+    instrumented = is_instrumented(function)
+    copy = array.copy() if trace else None
+
+    counter = counters.Counters()
+    if instrumented:
+        kwargs["counter"] = counter
+    start = time.perf_counter_ns()
+    result = function(array, *args, **kwargs)
+    elapsed = time.perf_counter_ns() - start
+
+    record = {
+        "function": function.__name__,
+        "n": len(array),
+        "elapsed_ns": elapsed,
+        "peak_memory_bytes": None,
+        "max_recursion_depth": None,
+        "comparisons": counter.comparison_count if instrumented else None,
+        "swaps": counter.swap_count if instrumented else None,
+        "writes": counter.write_count if instrumented else None,
+    }
+
+    if trace:
+        if instrumented:
+            kwargs["counter"] = counters.Counters()
+        record["peak_memory_bytes"], record["max_recursion_depth"] = _trace_call(function, copy, args, kwargs)
+    return result, record
+
+
+def _trace_call(function, array, args, kwargs) -> tuple:
+    """Peak traced memory and max recursion depth of function(array, *args, **kwargs)."""
+    depths = {}
+    max_depth = 0
+
+    def track(frame, event, _):
+        nonlocal max_depth
+        if event == "call":
+            depth = depths.get(frame.f_code, 0) + 1
+            depths[frame.f_code] = depth
+            if depth > max_depth:
+                max_depth = depth
+        elif event == "return":
+            depths[frame.f_code] = depths.get(frame.f_code, 0) - 1
+
+    tracing_before = tracemalloc.is_tracing()
+    if not tracing_before:
+        tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    previous_profiler = sys.getprofile()
+    sys.setprofile(track)
+    try:
+        function(array, *args, **kwargs)
+    finally:
+        sys.setprofile(previous_profiler)
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing_before:
+            tracemalloc.stop()
+    return peak - baseline, max_depth
+
+
+def write_records(records: list, path: str) -> None:
+    """
+    Appends profile records to a CSV file (with a header row if the file is new), for
+    pandas.read_csv or csv.DictReader. Extra keys of the records (e.g. "k" or "group_size"
+    set by an experiment) become extra columns after RECORD_FIELDS.
+    """
+    if not records:
+        return
+    fields = RECORD_FIELDS + [key for key in records[0] if key not in RECORD_FIELDS]
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(records)
+
+
+def read_records(path: str) -> list:
+    """
+    Reads records written by write_records, with the numbers converted back (empty fields become None).
+    """
+    records = []
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            for key, value in row.items():
+                if value == "":
+                    row[key] = None
+                elif key != "function":
+                    try:
+                        row[key] = int(value)
+                    except ValueError:
+                        try:
+                            row[key] = float(value)
+                        except ValueError:
+                            pass
+            records.append(row)
+    return records
@@ -0,0 +1,86 @@
+import csv
+import hashlib
+import importlib
+import inspect
+import os
+from utils.instrumentation import is_instrumented
+
+# Results of experiments.py on this machine (not versioned), one row per finished cell
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "experiment_results.csv")
+
+KEY_FIELDS = ["algorithm", "n", "k", "seed", "code_hash"]
+VALUE_FIELDS = ["comparisons", "swaps"]
+
+# Source modules every measurement depends on, besides the ones of the sort itself: the
+# counters, the inputs and experiments.py, which runs the trials and averages them
+COMMON_MODULES = ("utils.counters", "utils.input_pool", "experiments")
+
+
+def code_hash(sort_function, settings: tuple = ()) -> str:
+    """
+    Short hash of the source code a sort runs: its module, the modules of the instrumented
+    functions it imports (e.g. quick_sort.split for hybrid_sort), recursively, and
+    COMMON_MODULES. A stored result is only reused while this hash is unchanged.
+    experiments.py usually runs as __main__, so the modules are looked up by importing them.
+
+    `settings` are values the results depend on that are not in the source, e.g. the tuned
+    threshold hybrid_sort reads from hybrid_thresholds.json; they are hashed too.
+    """
+    modules, pending = set(COMMON_MODULES), [sort_function.__module__]
+    while pending:
+        name = pending.pop()
+        if name in modules:
+            continue
+        modules.add(name)
+        pending.extend(value.__module__ for value in vars(importlib.import_module(name)).values() if is_instrumented(value))
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(inspect.getsource(importlib.import_module(name)).encode())
+    for setting in settings:
+        digest.update(repr(setting).encode())
+    return digest.hexdigest()[:12]
+
+
+def load_results(path: str = RESULTS_PATH) -> dict:
+    """
+    Reads the store.
+
+    Returns:
+        dict: {(algorithm, n, k, seed, code_hash): (comparisons, swaps)}. Rows that are
+              incomplete (e.g. cut off by a crash while they were written) are skipped.
+    """
+    results = {}
+    try:
+        with open(path, newline="") as store:
+            for row in csv.DictReader(store):
+                try:
+                    key = (row["algorithm"], int(row["n"]), int(row["k"]), int(row["seed"]), row["code_hash"])
+                    results[key] = tuple(float(row[field]) for field in VALUE_FIELDS)
+                except (KeyError, TypeError, ValueError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return results
+
+
+def append_result(key: tuple, values: tuple, path: str = RESULTS_PATH) -> None:
+    """
+    Appends one finished cell to the store and flushes it to disk right away, so a crash
+    loses at most the cells that were still running.
+    """
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    if not new_file:
+        with open(path, "rb") as store:
+            store.seek(-1, os.SEEK_END)
+            cut_off = store.read(1) != b"\n"
+    with open(path, "a", newline="") as store:
+        writer = csv.writer(store)
+        if new_file:
+            writer.writerow(KEY_FIELDS + VALUE_FIELDS)
+        elif cut_off:
+            # End the row a crash cut off, load_results skips it
+            store.write("\n")
+        writer.writerow(list(key) + list(values))
+        store.flush()
+        os.fsync(store.fileno())
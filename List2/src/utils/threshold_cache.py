@@ -0,0 +1,45 @@
+import json
+import os
+
+# Tuned hybrid_sort thresholds of this machine (not versioned, see threshold_tuner.py)
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hybrid_thresholds.json")
+
+# Used while nothing has been tuned for a (key type, backend) pair
+DEFAULT_THRESHOLD = 10
+
+# Contents of the cache file, loaded on first use
+_thresholds = None
+
+
+def key_type(array, low: int) -> str:
+    """Name of the key type of `array`: the dtype of an ndarray, the type of its keys otherwise."""
+    if hasattr(array, "dtype"):
+        return str(array.dtype)
+    return type(array[low]).__name__
+
+
+def cached_threshold(key_type_name: str, backend: str) -> int:
+    """
+    Returns:
+        int: The tuned threshold for the pair, or DEFAULT_THRESHOLD if it was never tuned.
+    """
+    return _load().get(f"{key_type_name}/{backend}", DEFAULT_THRESHOLD)
+
+
+def store_threshold(key_type_name: str, backend: str, threshold: int) -> None:
+    """Saves the tuned threshold for the pair in the cache file."""
+    thresholds = _load()
+    thresholds[f"{key_type_name}/{backend}"] = threshold
+    with open(CACHE_PATH, "w") as cache_file:
+        json.dump(thresholds, cache_file, indent=2, sort_keys=True)
+
+
+def _load() -> dict:
+    global _thresholds
+    if _thresholds is None:
+        try:
+            with open(CACHE_PATH) as cache_file:
+                _thresholds = json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _thresholds = {}
+    return _thresholds
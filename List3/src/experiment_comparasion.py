@@ -1,11 +1,11 @@
-import random
 import numpy as np
 import csv
 import os
 from multiprocessing import Pool, cpu_count
 from utils import counters
-from my_select import my_select
-from random_select import randomized_select
+from utils.input_pool import InputPool, attach
+from utils.profiling import profile
+from selection import select, multiselect, numpy_multiselect, METHODS
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -14,48 +14,54 @@ import seaborn as sns
 n_values = list(range(1000, 50001, 100))  # np. co 1000
 k_values = [1, 10, 100]
 m = 50  # liczba powtórzeń
+seed = 0  # ziarno puli danych wejściowych
+methods = METHODS  # porównywane algorytmy (selection.METHODS)
 output_file = "results/select_comparison.csv"
 os.makedirs("results", exist_ok=True)
 
+# Parametry eksperymentu multiselect: q kwantyli (rzędy n * i / (q + 1), i = 1..q) tej samej tablicy
+multiselect_n_values = list(range(1000, 50001, 1000))
+q_values = [3, 9, 99]
+multiselect_m = 10  # liczba powtórzeń
+multiselect_output_file = "results/multiselect_comparison.csv"
+
+
+# Kolumny wyników poza n, k i algorithm: (kolumna, pole rekordu z utils.profiling)
+metrics = [("avg_comparisons", "comparisons"), ("avg_swaps", "swaps"), ("avg_time_ns", "elapsed_ns"),
+           ("avg_peak_memory_bytes", "peak_memory_bytes"), ("avg_max_recursion_depth", "max_recursion_depth")]
+
 
 def run_experiment(args):
-    n, k = args
-    rand_comps = []
-    rand_swaps = []
-    det_comps = []
-    det_swaps = []
-
-    for _ in range(m):
-        data = [random.randint(1, 10**6) for _ in range(n)]
-
-        # Algorytm Randomized Select
-        arr_rand = data.copy()
-        counters.reset_counters()
-        randomized_select(arr_rand, 0, n - 1, min(k, n))
-        rand_comps.append(counters.comparison_count)
-        rand_swaps.append(counters.swap_count)
-
-        # Algorytm Deterministic Select (MySelect)
-        arr_det = data.copy()
-        counters.reset_counters()
-        my_select(arr_det, 0, n - 1, min(k, n))
-        det_comps.append(counters.comparison_count)
-        det_swaps.append(counters.swap_count)
+    n, k, inputs_spec = args
+    inputs = attach(inputs_spec)
+    records = {method: [] for method in methods}
+
+    for trial in range(m):
+        # Te same dane dla wszystkich algorytmów i każdego k (porównanie w parach)
+        data = inputs.trial(trial, n)
+
+        # randomized (Randomized Select), deterministic (MySelect), floyd_rivest, introselect
+        for method in methods:
+            _, record = profile(select, data.copy(), min(k, n), method=method)
+            records[method].append(record)
 
     print(f"Done: n={n}, k={k}")
     return [
-        [n, k, "randomized", np.mean(rand_comps), np.mean(rand_swaps)],
-        [n, k, "deterministic", np.mean(det_comps), np.mean(det_swaps)]
+        [n, k, algorithm] + [np.mean([record[field] for record in algorithm_records]) for _, field in metrics]
+        for algorithm, algorithm_records in records.items()
     ]
 
 
 def run_experiments():
-    # Przygotowanie zadań
-    tasks = [(n, k) for k in k_values for n in n_values]
+    # Dane wejściowe generowane raz, w pamięci współdzielonej (m tablic o długości max(n_values),
+    # mniejsze n używają prefiksów)
+    with InputPool(n_values, m, seed, key_range=10**6) as inputs:
+        # Przygotowanie zadań
+        tasks = [(n, k, inputs.spec) for k in k_values for n in n_values]
 
-    # Uruchomienie eksperymentów równolegle
-    with Pool(processes=cpu_count()) as pool:
-        results = pool.map(run_experiment, tasks)
+        # Uruchomienie eksperymentów równolegle
+        with Pool(processes=cpu_count()) as pool:
+            results = pool.map(run_experiment, tasks)
 
     # Spłaszczenie listy wyników
     flattened = [row for result in results for row in result]
@@ -63,11 +69,108 @@ def run_experiments():
     # Zapisz wyniki do pliku CSV
     with open(output_file, mode="w", newline="") as file:
         writer = csv.writer(file)
-        writer.writerow(["n", "k", "algorithm", "avg_comparisons", "avg_swaps"])
+        writer.writerow(["n", "k", "algorithm"] + [column for column, _ in metrics])
         writer.writerows(flattened)
 
     print(f"Wyniki zapisane do {output_file}")
 
+def quantile_ks(n, q):
+    # Rzędy q kwantyli tablicy n elementów, np. q = 99 to percentyle p1..p99
+    return [max(1, n * i // (q + 1)) for i in range(1, q + 1)]
+
+
+def repeated_select(arr, ks, counter=counters):
+    # Punkt odniesienia dla multiselect: osobne wywołanie select dla każdego k, na tej samej tablicy
+    return [select(arr, k, counter=counter) for k in ks]
+
+
+def average(records, field):
+    values = [record[field] for record in records]
+    return np.nan if None in values else np.mean(values)
+
+
+# Kolumny wyników eksperymentu multiselect poza n, q i algorithm
+multiselect_metrics = [("avg_comparisons", "comparisons"), ("avg_swaps", "swaps"),
+                       ("avg_time_ns", "elapsed_ns"), ("avg_peak_memory_bytes", "peak_memory_bytes")]
+
+
+def run_multiselect_experiment(args):
+    n, q, inputs_spec = args
+    inputs = attach(inputs_spec)
+    ks = quantile_ks(n, q)
+    records = {"repeated_select": [], "multiselect": [], "numpy_multiselect": []}
+
+    for trial in range(multiselect_m):
+        # Te same dane dla wszystkich wariantów
+        data = inputs.trial(trial, n)
+        records["repeated_select"].append(profile(repeated_select, data.copy(), ks)[1])
+        records["multiselect"].append(profile(multiselect, data.copy(), ks)[1])
+        # np.partition nie zmienia wejścia i niczego nie zlicza
+        records["numpy_multiselect"].append(profile(numpy_multiselect, inputs.row(trial, n), ks)[1])
+
+    print(f"Done: n={n}, q={q}")
+    return [
+        [n, q, algorithm] + [average(algorithm_records, field) for _, field in multiselect_metrics]
+        for algorithm, algorithm_records in records.items()
+    ]
+
+
+def run_multiselect_experiments():
+    with InputPool(multiselect_n_values, multiselect_m, seed, key_range=10**6) as inputs:
+        tasks = [(n, q, inputs.spec) for q in q_values for n in multiselect_n_values]
+        with Pool(processes=cpu_count()) as pool:
+            results = pool.map(run_multiselect_experiment, tasks)
+
+    flattened = [row for result in results for row in result]
+    with open(multiselect_output_file, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["n", "q", "algorithm"] + [column for column, _ in multiselect_metrics])
+        writer.writerows(flattened)
+
+    print(f"Wyniki zapisane do {multiselect_output_file}")
+
+
+def plot_multiselect_results(file_path):
+    df = pd.read_csv(file_path)
+
+    # Oszczędność multiselect względem osobnych wywołań select
+    for q_val in sorted(df["q"].unique()):
+        by_algorithm = df[df["q"] == q_val].groupby("algorithm")[["avg_comparisons", "avg_time_ns"]].mean()
+        print(f"q={q_val}: repeated_select / multiselect - comparisons "
+              f"{by_algorithm.loc['repeated_select', 'avg_comparisons'] / by_algorithm.loc['multiselect', 'avg_comparisons']:.2f}x, "
+              f"time {by_algorithm.loc['repeated_select', 'avg_time_ns'] / by_algorithm.loc['multiselect', 'avg_time_ns']:.2f}x")
+
+    df_melted = df.melt(
+        id_vars=["n", "q", "algorithm"],
+        value_vars=[column for column, _ in multiselect_metrics],
+        var_name="metric_type",
+        value_name="value"
+    )
+    df_melted["metric_type"] = df_melted["metric_type"].map({
+        "avg_comparisons": "Comparisons",
+        "avg_swaps": "Swaps",
+        "avg_time_ns": "Time [ns]",
+        "avg_peak_memory_bytes": "Peak memory [B]"
+    })
+
+    os.makedirs("results/ex2", exist_ok=True)
+    for q_val in sorted(df["q"].unique()):
+        subset = df_melted[df_melted["q"] == q_val]
+        g = sns.relplot(
+            data=subset,
+            x="n", y="value", hue="algorithm", col="metric_type", col_wrap=2, kind="line",
+            facet_kws={'sharey': False, 'sharex': True}
+        )
+        g.fig.suptitle(f"Multiselect vs repeated select (q = {q_val} quantiles)", y=1.05)
+        g.set_axis_labels("n", "Average Count")
+        g.set_titles(col_template="{col_name}")
+        plt.tight_layout()
+        plt.savefig(f"results/ex2/multiselect_q{q_val}.png")
+        plt.close()
+
+    print("Plots saved to 'results/ex2/' folder.")
+
+
 def plot_results(file_path):
     # Wczytaj dane
     df = pd.read_csv(file_path)
@@ -75,7 +178,7 @@ def plot_results(file_path):
     # Przekształć dane do wykresów
     df_melted = df.melt(
         id_vars=["n", "k", "algorithm"],
-        value_vars=["avg_comparisons", "avg_swaps"],
+        value_vars=[column for column, _ in metrics],
         var_name="metric_type",
         value_name="value"
     )
@@ -83,7 +186,10 @@ def plot_results(file_path):
     # Uproszczenie nazw metryk
     df_melted["metric_type"] = df_melted["metric_type"].map({
         "avg_comparisons": "Comparisons",
-        "avg_swaps": "Swaps"
+        "avg_swaps": "Swaps",
+        "avg_time_ns": "Time [ns]",
+        "avg_peak_memory_bytes": "Peak memory [B]",
+        "avg_max_recursion_depth": "Max recursion depth"
     })
 
     # Unikalne wartości k
@@ -96,7 +202,7 @@ def plot_results(file_path):
         subset = df_melted[df_melted["k"] == k_val]
         g = sns.relplot(
             data=subset,
-            x="n", y="value", hue="algorithm", col="metric_type", kind="line",
+            x="n", y="value", hue="algorithm", col="metric_type", col_wrap=3, kind="line",
             facet_kws={'sharey': False, 'sharex': True}
         )
         g.fig.suptitle(f"Select Comparison Metrics (k = {k_val})", y=1.05)
@@ -111,3 +217,5 @@ def plot_results(file_path):
 if __name__ == "__main__":
     run_experiments()
     plot_results(output_file)
+    run_multiselect_experiments()
+    plot_multiselect_results(multiselect_output_file)
@@ -1,9 +1,8 @@
-import random
 import numpy as np
-import time
 import csv
 import os
-from utils import counters
+from utils.input_pool import InputPool, attach
+from utils.profiling import profile
 from my_select import my_select
 import pandas as pd
 import seaborn as sns
@@ -18,15 +17,16 @@ def plot_results(file_path):
 
     # Przekształć dane do wykresów
     df_melted = df.melt(id_vars=["n", "group_size", "k"], 
-                        value_vars=["avg_comparisons", "avg_swaps", "avg_time_sec"], 
+                        value_vars=["avg_comparisons", "avg_swaps", "avg_time_sec", "avg_peak_memory_bytes"], 
                         var_name="metric", value_name="value")
 
     # Dodaj kolumnę typu metryki
     df_melted["type"] = df_melted["metric"].apply(lambda x: "Comparisons" if "comparisons" in x else
-                                                  ("Swaps" if "swaps" in x else "Time"))
+                                                  ("Swaps" if "swaps" in x else
+                                                   ("Memory" if "memory" in x else "Time")))
 
-    # Wykresy: Comparisons, Swaps, Time
-    metrics = ["Comparisons", "Swaps", "Time"]
+    # Wykresy: Comparisons, Swaps, Time, Memory
+    metrics = ["Comparisons", "Swaps", "Time", "Memory"]
 
     for metric in metrics:
         subset = df_melted[df_melted["type"] == metric]
@@ -56,6 +56,7 @@ n_values = list(range(1000, 50001, 1000))  # np. co 1000
 group_sizes = [3, 5, 7, 9]
 k_values = [15, 20, 30]  # Różne wartości k
 m = 30  # liczba powtórzeń
+seed = 0  # ziarno puli danych wejściowych
 
 # Plik wynikowy
 output_file = "results/select_group_size_experiment.csv"
@@ -63,27 +64,27 @@ os.makedirs("results", exist_ok=True)
 os.makedirs("results/ex3", exist_ok=True)
 
 # Nagłówek
-header = ["n", "group_size", "k", "avg_comparisons", "avg_swaps", "avg_time_sec"]
+header = ["n", "group_size", "k", "avg_comparisons", "avg_swaps", "avg_time_sec", "avg_peak_memory_bytes"]
 
 # Funkcja wykonująca eksperyment dla danej kombinacji n, group_size, k
 def run_single_experiment(args):
-    n, group_size, k = args
-    comps, swaps, times = [], [], []
+    n, group_size, k, inputs_spec = args
+    inputs = attach(inputs_spec)
+    comps, swaps, times, memory = [], [], [], []
 
-    for _ in range(m):
-        data = [random.randint(1, 10**6) for _ in range(n)]
-        arr = data.copy()
+    for trial in range(m):
+        # Te same dane dla każdego group_size i k (porównanie w parach)
+        arr = inputs.trial(trial, n)
 
-        counters.reset_counters()
-        start = time.time()
-        my_select(arr, 0, n - 1, k, group_size=group_size)
-        end = time.time()
+        # Czas (perf_counter_ns) i liczniki z pierwszego wywołania, pamięć z drugiego (utils.profiling)
+        _, record = profile(my_select, arr, 0, n - 1, k, group_size=group_size)
 
-        comps.append(counters.comparison_count)
-        swaps.append(counters.swap_count)
-        times.append(end - start)
+        comps.append(record["comparisons"])
+        swaps.append(record["swaps"])
+        times.append(record["elapsed_ns"] / 1e9)
+        memory.append(record["peak_memory_bytes"])
 
-    return [n, group_size, k, np.mean(comps), np.mean(swaps), np.mean(times)]
+    return [n, group_size, k, np.mean(comps), np.mean(swaps), np.mean(times), np.mean(memory)]
 
 
 # Wykonaj eksperyment i zapisz wyniki
@@ -92,12 +93,14 @@ def run_experiment():
         writer = csv.writer(file)
         writer.writerow(header)
 
-        # Przygotowanie zadań
-        tasks = [(n, group_size, k) for group_size in group_sizes for n in n_values for k in k_values]
+        # Dane wejściowe generowane raz, w pamięci współdzielonej
+        with InputPool(n_values, m, seed, key_range=10**6) as inputs:
+            # Przygotowanie zadań
+            tasks = [(n, group_size, k, inputs.spec) for group_size in group_sizes for n in n_values for k in k_values]
 
-        # Uruchom eksperymenty równolegle
-        with Pool(processes=cpu_count()) as pool:
-            results = pool.map(run_single_experiment, tasks)
+            # Uruchom eksperymenty równolegle
+            with Pool(processes=cpu_count()) as pool:
+                results = pool.map(run_single_experiment, tasks)
 
         # Zapisz wyniki do pliku
         for result in results:
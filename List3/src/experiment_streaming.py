@@ -0,0 +1,150 @@
+import numpy as np
+import bisect
+import csv
+import math
+import os
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from utils.input_pool import InputPool, attach
+from utils.profiling import profile
+from streaming_select import RunningSelect, KLLSketch, exact_quantiles
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Parametry eksperymentu
+n_values = list(range(10000, 200001, 10000))
+quantiles = [0.01, 0.25, 0.5, 0.75, 0.99]  # kwantyle, o które pytamy strumień
+m = 10  # liczba powtórzeń
+seed = 0  # ziarno puli danych wejściowych
+kll_k = 200  # rozmiar szkicu KLL
+workers = 4  # liczba części strumienia szkicowanych osobno i scalanych (kll_merged)
+output_file = "results/streaming_comparison.csv"
+os.makedirs("results", exist_ok=True)
+
+# Kolumny wyników poza n i algorithm
+header = ["n", "algorithm", "avg_time_ns", "avg_throughput", "avg_max_rank_error", "avg_peak_memory_bytes"]
+
+
+def quantile_ks(n):
+    return [min(n, max(1, math.ceil(p * n))) for p in quantiles]
+
+
+# Warianty strumieniowe: tablica to strumień, czytany element po elemencie
+def running_median(stream, ks):
+    # Dokładna bieżąca mediana (dwa kopce) - odpowiada tylko na pytanie o medianę
+    running = RunningSelect()
+    running.extend(stream)
+    return [running.value()]
+
+
+def kll_quantiles(stream, ks):
+    sketch = KLLSketch(kll_k, seed)
+    sketch.extend(stream)
+    return [sketch.select(k) for k in ks]
+
+
+def kll_merged_quantiles(stream, ks):
+    # Strumień dzielony na `workers` części (jak między procesy), szkicowane kolejno w tym samym
+    # procesie i potem scalane - mierzy koszt i błąd scalania, nie zysk z równoległości
+    sketches = []
+    for worker in range(workers):
+        sketch = KLLSketch(kll_k, seed + worker)
+        sketch.extend(islice(stream, worker, None, workers))
+        sketches.append(sketch)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return [merged.select(k) for k in ks]
+
+
+# randomized_select (exact_quantiles) potrzebuje całej tablicy w pamięci - punkt odniesienia
+variants = {
+    "randomized_select": exact_quantiles,
+    "running_median": running_median,
+    "kll": kll_quantiles,
+    "kll_merged": kll_merged_quantiles,
+}
+
+
+def rank_error(sorted_data, value, k):
+    # Odległość k od przedziału rang, które zajmuje `value` w posortowanych danych, względem n
+    first = bisect.bisect_left(sorted_data, value) + 1
+    last = bisect.bisect_right(sorted_data, value)
+    return max(0, first - k, k - last) / len(sorted_data)
+
+
+def run_experiment(args):
+    n, inputs_spec = args
+    inputs = attach(inputs_spec)
+    ks = quantile_ks(n)
+    rows = {name: [] for name in variants}
+
+    for trial in range(m):
+        # Te same dane dla wszystkich wariantów
+        data = inputs.trial(trial, n)
+        sorted_data = sorted(data)
+
+        for name, variant in variants.items():
+            answers, record = profile(variant, data.copy(), ks)
+            asked = [(n + 1) // 2] if name == "running_median" else ks
+            rows[name].append([
+                record["elapsed_ns"],
+                n / (record["elapsed_ns"] / 1e9),
+                max(rank_error(sorted_data, answer, k) for answer, k in zip(answers, asked)),
+                record["peak_memory_bytes"],
+            ])
+
+    print(f"Done: n={n}")
+    return [[n, name] + np.mean(values, axis=0).tolist() for name, values in rows.items()]
+
+
+def run_experiments():
+    with InputPool(n_values, m, seed, key_range=10**6) as inputs:
+        tasks = [(n, inputs.spec) for n in n_values]
+        with Pool(processes=cpu_count()) as pool:
+            results = pool.map(run_experiment, tasks)
+
+    with open(output_file, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(row for result in results for row in result)
+
+    print(f"Wyniki zapisane do {output_file}")
+
+
+def plot_results(file_path):
+    df = pd.read_csv(file_path)
+
+    df_melted = df.melt(
+        id_vars=["n", "algorithm"],
+        value_vars=header[2:],
+        var_name="metric_type",
+        value_name="value"
+    )
+    df_melted["metric_type"] = df_melted["metric_type"].map({
+        "avg_time_ns": "Time [ns]",
+        "avg_throughput": "Throughput [elements/s]",
+        "avg_max_rank_error": "Max rank error [fraction of n]",
+        "avg_peak_memory_bytes": "Peak memory [B]"
+    })
+
+    os.makedirs("results/ex4", exist_ok=True)
+    g = sns.relplot(
+        data=df_melted,
+        x="n", y="value", hue="algorithm", col="metric_type", col_wrap=2, kind="line",
+        facet_kws={'sharey': False, 'sharex': True}
+    )
+    g.fig.suptitle(f"Streaming select vs randomized select (KLL k = {kll_k})", y=1.05)
+    g.set_axis_labels("n", "Average")
+    g.set_titles(col_template="{col_name}")
+    plt.tight_layout()
+    plt.savefig("results/ex4/streaming_comparison.png")
+    plt.close()
+
+    print("Plots saved to 'results/ex4/' folder.")
+
+
+if __name__ == "__main__":
+    run_experiments()
+    plot_results(output_file)
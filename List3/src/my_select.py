@@ -2,58 +2,139 @@ import utils.counters as counters
 import sys
 
 
-def insertion_sort(arr, low, high):
+def insertion_sort(arr, low, high, counter=counters):
     for i in range(low + 1, high + 1):
         key = arr[i]
         j = i - 1
-        while j >= low and not counters.compare(arr[j], key):
-            counters.swap(arr, j + 1, j)
+        while j >= low and not counter.compare(arr[j], key):
+            counter.swap(arr, j + 1, j)
             j -= 1
         arr[j + 1] = key
 
 
-def partition(arr, low, high):
-    pivot = arr[high]
-    i = low - 1
-    for j in range(low, high):
-        if counters.compare(arr[j], pivot):
+def partition_three_way(arr, low, high, pivot_index, counter=counters):
+    """
+    Three-way partition (Dijkstra's Dutch national flag) of arr[low..high] around the value
+    of arr[pivot_index]: every key equal to the pivot ends up in one block, so a subarray
+    with many duplicates is not split unevenly like by a two-way `<=` partition, which sends
+    all of them to one side.
+
+    Returns:
+        tuple: (first, last) - arr[low..first - 1] are smaller than the pivot, arr[first..last]
+               are equal to it and arr[last + 1..high] are larger.
+    """
+    pivot = arr[pivot_index]
+    first, i, last = low, low, high
+    while i <= last:
+        if not counter.compare(arr[i], pivot):
+            counter.swap(arr, i, last)
+            last -= 1
+        elif counter.compare(pivot, arr[i]):
             i += 1
-            counters.swap(arr, i, j)
-    counters.swap(arr, i + 1, high)
-    return i + 1
-
-
-def partition_around_pivot(arr, low, high, pivot_value):
-    for i in range(low, high + 1):
-        if arr[i] == pivot_value:
-            counters.swap(arr, i, high)
-            break
-    return partition(arr, low, high)
-
-
-def my_select(arr, low, high, k, group_size=5):
-    n = high - low + 1
-    if n <= group_size:
-        insertion_sort(arr, low, high)
-        return arr[low + k - 1]
-
-    medians = []
-    for i in range(low, high + 1, group_size):
-        group_end = min(i + group_size - 1, high)
-        insertion_sort(arr, i, group_end)
-        median = arr[i + (group_end - i) // 2]
-        medians.append(median)
-
-    median_of_medians = my_select(medians, 0, len(medians) - 1, len(medians) // 2 + 1)
-    pivot_index = partition_around_pivot(arr, low, high, median_of_medians)
-
-    left_size = pivot_index - low + 1
-    if k == left_size:
-        return arr[pivot_index]
-    elif k < left_size:
-        return my_select(arr, low, pivot_index - 1, k)
-    else:
-        return my_select(arr, pivot_index + 1, high, k - left_size)
+        else:
+            if first != i:
+                counter.swap(arr, first, i)
+            first += 1
+            i += 1
+    return first, last
+
+
+def my_select(arr, low, high, k, group_size=5, counter=counters):
+    """
+    Deterministic select (median of medians): returns the k-th smallest element (k from 1)
+    of arr[low..high] in worst-case linear time for group sizes >= 5 (O(n log n) for 3). The
+    subarray is rearranged in place so that the element ends up at its sorted position, see
+    my_select_index.
+
+    Parameters:
+        arr (list): The array.
+        low (int): The starting index of the subarray.
+        high (int): The ending index of the subarray.
+        k (int): Which order statistic, 1 <= k <= high - low + 1.
+        group_size (int): Size of the groups the medians are taken from (3, 5, 7, 9, ...).
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+
+    Returns:
+        The k-th smallest element.
+    """
+    return arr[my_select_index(arr, low, high, k, group_size, counter)]
+
+
+def my_select_index(arr, low, high, k, group_size=5, counter=counters):
+    """
+    Median of medians without auxiliary lists; returns the index of the k-th smallest
+    element of arr[low..high] (k from 1), see my_select_range.
+
+    Parameters and counter: see my_select.
+
+    Returns:
+        int: Index of the k-th smallest element (low + k - 1); arr[low..index - 1] are not
+             larger and arr[index + 1..high] are not smaller.
+    """
+    my_select_range(arr, low, high, k, group_size, counter)
+    return low + k - 1
+
+
+def my_select_range(arr, low, high, k, group_size=5, counter=counters):
+    """
+    Median of medians without auxiliary lists; moves the k-th smallest element of
+    arr[low..high] (k from 1) to its sorted position and returns the block of keys equal to it.
+
+    Every group is sorted and its median swapped to the front of the subarray, so the medians
+    form the prefix arr[low..low + groups - 1] and the median of medians is selected from that
+    prefix recursively - by index, so it can be partitioned around without searching for it.
+    The partition is three-way, so all keys equal to the pivot leave the subarray at once even
+    when keys repeat. With groups of 5 both remaining sides have at most about 7/10 of its
+    elements (less with larger groups) and the worst case is linear; with groups of 3 a side
+    can keep 2/3 of them and the worst case is O(n log n), with groups of 2 it is worse still.
+    Only the medians prefix is recursed into (depth O(log n)); the
+    side of the partition that holds the k-th element is handled by the loop.
+
+    Parameters and counter: see my_select.
+
+    Returns:
+        tuple: (first, last) with first <= low + k - 1 <= last - arr[first..last] are the
+               keys of arr[low..high] equal to the k-th smallest, arr[low..first - 1] are
+               smaller and arr[last + 1..high] are larger.
+    """
+    if group_size < 2:
+        raise ValueError(f"The group size has to be at least 2, got {group_size}")
+    if not 1 <= k <= high - low + 1:
+        raise ValueError(f"k = {k} is out of range for a subarray of {high - low + 1} elements")
+
+    position = low + k - 1
+    while True:
+        if high - low + 1 <= group_size:
+            insertion_sort(arr, low, high, counter)
+            # Keys equal to the k-th smallest are next to it now (all of them are in arr[low..high])
+            first, last = position, position
+            while first > low and counter.compare(arr[position], arr[first - 1]):
+                first -= 1
+            while last < high and counter.compare(arr[last + 1], arr[position]):
+                last += 1
+            return first, last
+
+        # Sort every group and move its (lower) median to the front
+        medians_end = low
+        for i in range(low, high + 1, group_size):
+            group_end = min(i + group_size - 1, high)
+            insertion_sort(arr, i, group_end, counter)
+            median = i + (group_end - i) // 2
+            if median != medians_end:
+                counter.swap(arr, medians_end, median)
+            medians_end += 1
+
+        groups = medians_end - low
+        pivot_index = my_select_index(arr, low, medians_end - 1, groups // 2 + 1, group_size, counter)
+        first, last = partition_three_way(arr, low, high, pivot_index, counter)
+
+        if first <= position <= last:
+            return first, last
+        elif position < first:
+            high = first - 1
+        else:
+            low = last + 1
 
 
 if __name__ == "__main__":
@@ -63,5 +63,53 @@ def run_tests():
         else:
             print("Sorting error in Dual Pivot QuickSort with SELECT.")
 
+# Porównanie wersji z SELECT (gwarantowane O(n log n)) z wersjami z losowym pivotem na tych samych danych:
+# losowa permutacja i dużo powtórzeń (klucze 1..10)
+def run_benchmark(n: int = 10**6, seed: int = 0):
+    generator = random.Random(seed)
+    permutation = list(range(1, n + 1))
+    generator.shuffle(permutation)
+    inputs = [
+        ("random permutation", permutation),
+        ("few distinct keys, 1..10", [generator.randint(1, 10) for _ in range(n)]),
+    ]
+
+    pairs = [
+        ("QuickSort", quick_sort, quick_sort_with_select),
+        ("Dual Pivot QuickSort", dual_pivot_quick_sort, dual_pivot_quick_sort_with_select),
+    ]
+    for input_name, array in inputs:
+        print(f"\nBenchmark for n = {n} ({input_name}, seed = {seed}):")
+        for name, randomized, with_select in pairs:
+            results = []
+            for algorithm in (randomized, with_select):
+                array_copy = array[:]
+                try:
+                    results.append(measure_algorithm(algorithm, array_copy, 0, n - 1))
+                except RecursionError:
+                    # Wersja z losowym pivotem może zejść zbyt głęboko przy wielu równych kluczach
+                    results.append(None)
+                    continue
+                if array_copy != sorted(array):
+                    print(f"Sorting error in {algorithm.__name__}.")
+
+            print(f"\n--- {name}: randomized vs with my_select ---")
+            if None in results:
+                for algorithm, result in zip((randomized, with_select), results):
+                    if result is None:
+                        print(f"{algorithm.__name__}: exceeded the recursion limit")
+                    else:
+                        print(f"{algorithm.__name__}: Time: {result[0]:.2f}s, Comparisons: {result[1]}, Swaps: {result[2]}")
+                continue
+
+            (time_randomized, comparisons_randomized, swaps_randomized), (time_select, comparisons_select, swaps_select) = results
+            print(f"Time: {time_randomized:.2f}s vs {time_select:.2f}s ({time_select / time_randomized:.2f}x)")
+            print(f"Comparisons: {comparisons_randomized} vs {comparisons_select} ({comparisons_select / comparisons_randomized:.2f}x)")
+            print(f"Swaps: {swaps_randomized} vs {swaps_select} ({swaps_select / max(swaps_randomized, 1):.2f}x)")
+
 if __name__ == "__main__":
-    run_tests()
+    # python qs.py benchmark [n] - porównanie przy n = 10^6 (domyślnie)
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10**6)
+    else:
+        run_tests()
@@ -3,34 +3,34 @@ import utils.counters as counters
 import sys
 
 
-def partition(arr, low, high):
+def partition(arr, low, high, counter=counters):
     pivot = arr[high]
     i = low - 1
     for j in range(low, high):
-        if counters.compare(arr[j], pivot):
+        if counter.compare(arr[j], pivot):
             i += 1
-            counters.swap(arr, i, j)
-    counters.swap(arr, i + 1, high)
+            counter.swap(arr, i, j)
+    counter.swap(arr, i + 1, high)
     return i + 1
 
 
-def randomized_partition(arr, low, high):
+def randomized_partition(arr, low, high, counter=counters):
     pivot_index = random.randint(low, high)
-    counters.swap(arr, pivot_index, high)
-    return partition(arr, low, high)
+    counter.swap(arr, pivot_index, high)
+    return partition(arr, low, high, counter)
 
 
-def randomized_select(arr, low, high, k):
+def randomized_select(arr, low, high, k, counter=counters):
     if low == high:
         return arr[low]
-    q = randomized_partition(arr, low, high)
+    q = randomized_partition(arr, low, high, counter)
     left_size = q - low + 1
     if k == left_size:
         return arr[q]
     elif k < left_size:
-        return randomized_select(arr, low, q - 1, k)
+        return randomized_select(arr, low, q - 1, k, counter)
     else:
-        return randomized_select(arr, q + 1, high, k - left_size)
+        return randomized_select(arr, q + 1, high, k - left_size, counter)
 
 
 if __name__ == "__main__":
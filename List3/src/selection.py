@@ -0,0 +1,253 @@
+import math
+import sys
+import utils.counters as counters
+from my_select import my_select_index, partition_three_way
+from random_select import randomized_select
+
+# Order-statistic engines of select()
+METHODS = ("randomized", "deterministic", "floyd_rivest", "introselect")
+
+# Floyd-Rivest samples only subarrays longer than this; shorter ones are partitioned directly
+FLOYD_RIVEST_CUTOFF = 600
+
+
+def select(arr, k, method="introselect", counter=counters, low=0, high=None):
+    """
+    Returns the k-th smallest element (k from 1) of arr[low..high] with the chosen engine.
+    The subarray is rearranged in place; all engines count into the same counters.
+
+    Parameters:
+        arr (list): The array.
+        k (int): Which order statistic, 1 <= k <= high - low + 1.
+        method (str): One of METHODS:
+                      "randomized" - randomized_select, expected O(n) for distinct keys (its
+                                     two-way partition is quadratic when most keys are equal),
+                      "deterministic" - my_select (median of medians), worst-case O(n),
+                      "floyd_rivest" - floyd_rivest_select, about n + min(k, n - k) comparisons,
+                      "introselect" - introselect, quickselect with a median of medians fallback.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
+        low (int): The starting index of the subarray.
+        high (int): The ending index of the subarray, the last index of arr by default.
+
+    Returns:
+        The k-th smallest element.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    high = len(arr) - 1 if high is None else high
+    if not 1 <= k <= high - low + 1:
+        raise ValueError(f"k = {k} is out of range for a subarray of {high - low + 1} elements")
+
+    # Looked up by name rather than in a table, so that an uninstrumented copy of this module
+    # calls the uninstrumented engines
+    if method == "randomized":
+        return randomized_select(arr, low, high, k, counter)
+    elif method == "deterministic":
+        return arr[my_select_index(arr, low, high, k, counter=counter)]
+    elif method == "floyd_rivest":
+        return arr[floyd_rivest_select(arr, low, high, low + k - 1, counter)]
+    else:
+        return arr[introselect(arr, low, high, k, counter)]
+
+
+def floyd_rivest_select(arr, left, right, index, counter=counters):
+    """
+    Floyd-Rivest select (algorithm SELECT of Floyd and Rivest, 1975): rearranges
+    arr[left..right] so that arr[index] is the element that belongs there in sorted order.
+
+    A subarray longer than FLOYD_RIVEST_CUTOFF is first narrowed down: a sample of about
+    n^(2/3) elements around the expected position of the element is selected recursively, so
+    that the pivot t = arr[index] is very close to the wanted element. Partitioning around t
+    then leaves only a small part of the subarray to search, which gives about
+    n + min(k, n - k) + o(n) comparisons on average.
+
+    Parameters:
+        arr (list): The array.
+        left (int): The starting index of the subarray.
+        right (int): The ending index of the subarray.
+        index (int): The position to fill, left <= index <= right (the k-th smallest is index = left + k - 1).
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        int: `index`.
+    """
+    while right > left:
+        if right - left > FLOYD_RIVEST_CUTOFF:
+            # Select from a sample whose expected position of the wanted element is `index`
+            n = right - left + 1
+            i = index - left + 1
+            z = math.log(n)
+            s = 0.5 * math.exp(2 * z / 3)
+            sd = 0.5 * math.sqrt(z * s * (n - s) / n) * (1 if 2 * i >= n else -1)
+            new_left = max(left, int(index - i * s / n + sd))
+            new_right = min(right, int(index + (n - i) * s / n + sd))
+            floyd_rivest_select(arr, new_left, new_right, index, counter)
+
+        # Partition arr[left..right] around t = arr[index]
+        t = arr[index]
+        i, j = left, right
+        counter.swap(arr, left, index)
+        if not counter.compare(arr[right], t):
+            counter.swap(arr, right, left)
+        while i < j:
+            counter.swap(arr, i, j)
+            i += 1
+            j -= 1
+            while not counter.compare(t, arr[i]):
+                i += 1
+            while not counter.compare(arr[j], t):
+                j -= 1
+
+        # t is at left or right, move it to its place j
+        if counter.compare(arr[left], t) and counter.compare(t, arr[left]):
+            counter.swap(arr, left, j)
+        else:
+            j += 1
+            counter.swap(arr, j, right)
+
+        if j <= index:
+            left = j + 1
+        if index <= j:
+            right = j - 1
+    return index
+
+
+def introselect(arr, low, high, k, counter=counters):
+    """
+    Introselect: quickselect with a median-of-three pivot, which is fast on most inputs, that
+    switches to the median of medians (my_select_index) on the remaining subarray once it has
+    partitioned 2 * log2(n) times without finding the element. Worst-case O(n), like
+    my_select, and as fast as quickselect when the pivots are good. Both partition three-way,
+    so keys equal to the pivot leave the subarray together and duplicates cost no extra rounds.
+
+    Parameters:
+        arr (list): The array.
+        low (int): The starting index of the subarray.
+        high (int): The ending index of the subarray.
+        k (int): Which order statistic, from 1.
+        counter: Where comparisons and swaps are counted.
+
+    Returns:
+        int: Index of the k-th smallest element.
+    """
+    budget = 2 * max(1, (high - low + 1).bit_length())
+    while low < high:
+        if budget == 0:
+            return my_select_index(arr, low, high, k, counter=counter)
+        budget -= 1
+
+        first, last = partition_three_way(arr, low, high, median_of_three(arr, low, high, counter), counter)
+
+        position = low + k - 1
+        if first <= position <= last:
+            return position
+        elif position < first:
+            high = first - 1
+        else:
+            k -= last + 1 - low
+            low = last + 1
+    return low
+
+
+def median_of_three(arr, low, high, counter=counters):
+    """
+    Returns the index of the median of arr[low], arr[mid] and arr[high].
+    """
+    mid = (low + high) // 2
+    if counter.compare(arr[low], arr[mid]):
+        if counter.compare(arr[mid], arr[high]):
+            return mid
+        return high if counter.compare(arr[low], arr[high]) else low
+    if counter.compare(arr[low], arr[high]):
+        return low
+    return high if counter.compare(arr[mid], arr[high]) else mid
+
+
+def multiselect(arr, ks, method="introselect", counter=counters, low=0, high=None):
+    """
+    Returns several order statistics of arr[low..high] at once, partitioning the subarray
+    only as far as the queries need.
+
+    The middle query is selected first with select(); every engine leaves it at its sorted
+    position with no larger elements before it and no smaller ones after it, so the queries
+    below it only have to look at the left part and the ones above it at the right part.
+    Both parts are handled the same way, so the subarray is split into q + 1 parts in
+    log2(q) levels of O(n) work each: O(n log q) for q queries instead of O(n q) for q
+    separate selects.
+
+    Parameters:
+        arr (list): The array, rearranged in place.
+        ks: Which order statistics, each from 1 to high - low + 1 (any order, repeats allowed).
+        method (str): Engine of the single selects, one of METHODS.
+        counter: Where comparisons and swaps are counted.
+        low (int): The starting index of the subarray.
+        high (int): The ending index of the subarray, the last index of arr by default.
+
+    Returns:
+        list: The k-th smallest element for every k of ks, in the order of ks.
+    """
+    high = len(arr) - 1 if high is None else high
+    ks = list(ks)
+    for k in ks:
+        if not 1 <= k <= high - low + 1:
+            raise ValueError(f"k = {k} is out of range for a subarray of {high - low + 1} elements")
+
+    # Subarrays still to split: (low, high, sorted positions inside it still to place)
+    pending = [(low, high, sorted({low + k - 1 for k in ks}))]
+    while pending:
+        part_low, part_high, positions = pending.pop()
+        middle = len(positions) // 2
+        position = positions[middle]
+        select(arr, position - part_low + 1, method, counter, part_low, part_high)
+        if middle > 0:
+            pending.append((part_low, position - 1, positions[:middle]))
+        if middle + 1 < len(positions):
+            pending.append((position + 1, part_high, positions[middle + 1:]))
+
+    return [arr[low + k - 1] for k in ks]
+
+
+def numpy_multiselect(values, ks):
+    """
+    NumPy fast path of multiselect: one np.partition call with all the positions as `kth`.
+    Nothing is counted and the input is not modified.
+
+    Parameters:
+        values: A list or an ndarray.
+        ks: Which order statistics, each from 1 to len(values).
+
+    Returns:
+        list: The k-th smallest element for every k of ks, in the order of ks.
+    """
+    import numpy as np
+    positions = np.asarray(ks, dtype=np.intp) - 1
+    if positions.size and (positions.min() < 0 or positions.max() >= len(values)):
+        raise ValueError(f"The order statistics have to be between 1 and {len(values)}")
+    partitioned = np.partition(np.asarray(values), np.unique(positions))
+    return partitioned[positions].tolist()
+
+
+if __name__ == "__main__":
+    input_data = sys.stdin.read().splitlines()
+    n = int(input_data[0].strip())
+    k = int(input_data[1].strip())
+    array = list(map(int, input_data[2].split()))
+    method = sys.argv[1] if len(sys.argv) > 1 else "introselect"
+
+    # Jeżeli n < 30, wyświetlamy początkową tablicę
+    if n < 30:
+        print("Initial array:", array)
+
+    counters.reset_counters()
+    arr_copy = array.copy()
+    result_select = select(arr_copy, k, method)
+
+    print(f"\n--- SELECT ({method}) ---")
+
+    if n < 30:
+        print("Array after:", arr_copy)
+
+    print(f"{k}-th statistic: {result_select}")
+    print("Sorted array:", sorted(array))
+    print(f"Comparisons: {counters.comparison_count}, Swaps: {counters.swap_count}")
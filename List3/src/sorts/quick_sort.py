@@ -2,27 +2,55 @@ from typing import List
 import sys
 import random
 import utils.counters as counters
+from sorts.heap_sort import heap_sort
 
 
-def quick_sort(array_to_sort: List[int], low: int, high: int) -> None:
+def quick_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
     """
-    Implements the quick sort algorithm to sort an array in place with a random pivot.
+    Implements the quick sort algorithm to sort an array in place with a median-of-three pivot.
     Tracks comparisons and swaps during sorting.
 
+    The recursion is replaced by an explicit stack: after each partition the larger side is
+    pushed and the loop continues with the smaller one, so the stack never holds more than
+    log2(n) ranges. When a range is partitioned more than 2 * log2(n) times the input is
+    adversarial and the range is finished with heap sort instead (introsort), which keeps
+    the worst case at O(n log n).
+
     Parameters:
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the array segment to be sorted.
         high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
 
     Returns:
         None - It sorts the array in place.
     """
-    if low < high:
-        pivot_index = partition(array_to_sort, low, high)
-        quick_sort(array_to_sort, low, pivot_index - 1)  # Left sub-array
-        quick_sort(array_to_sort, pivot_index + 1, high)  # Right sub-array
+    if low >= high:
+        return
+
+    depth_limit = 2 * ((high - low + 1).bit_length() - 1)  # 2 * floor(log2(n))
+    stack = [(low, high, 0)]
+
+    while stack:
+        low, high, depth = stack.pop()
+        while low < high:
+            if depth > depth_limit:
+                heap_sort(array_to_sort, low, high, counter)
+                break
+
+            pivot_index = partition(array_to_sort, low, high, counter)
+            depth += 1
+
+            # Push the larger side, keep going with the smaller one
+            if pivot_index - low < high - pivot_index:
+                stack.append((pivot_index + 1, high, depth))  # Right sub-array
+                high = pivot_index - 1
+            else:
+                stack.append((low, pivot_index - 1, depth))  # Left sub-array
+                low = pivot_index + 1
 
-def partition(array_to_sort: List[int], low: int, high: int) -> int:
+def partition(array_to_sort: List[int], low: int, high: int, counter=counters) -> int:
     """
     Partitions the array into two sub-arrays based on a pivot chosen randomly.
     Rearranges the elements in the array such that all elements less than the pivot
@@ -32,6 +60,7 @@ def partition(array_to_sort: List[int], low: int, high: int) -> int:
         array_to_sort (List[int]): The array to be partitioned.
         low (int): The starting index of the partition.
         high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
 
     Returns:
         int: The index of the pivot after partitioning.
@@ -46,11 +75,11 @@ def partition(array_to_sort: List[int], low: int, high: int) -> int:
     
     i = low - 1
     for j in range(low, high):
-        if counters.compare(array_to_sort[j], pivot):  # If current element <= pivot
+        if counter.compare(array_to_sort[j], pivot):  # If current element <= pivot
             i += 1
-            counters.swap(array_to_sort, i, j)  # Swap the elements
+            counter.swap(array_to_sort, i, j)  # Swap the elements
 
-    counters.swap(array_to_sort, i + 1, high)  # Place pivot in the correct position
+    counter.swap(array_to_sort, i + 1, high)  # Place pivot in the correct position
     return i + 1
 
 if __name__ == "__main__":
@@ -1,67 +1,47 @@
 from typing import List
 import sys
 import utils.counters as counters
-from my_select import my_select
+from my_select import my_select_range
 
 
-def select_dual_pivot_quick_sort(array_to_sort: List[int], low: int, high: int) -> None:
+def select_dual_pivot_quick_sort(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
     """
     Dual-pivot QuickSort using deterministic SELECT for pivot selection.
     """
     if low < high:
-        p1, p2 = dual_partition(array_to_sort, low, high)
-        select_dual_pivot_quick_sort(array_to_sort, low, p1 - 1)
-        select_dual_pivot_quick_sort(array_to_sort, p1 + 1, p2 - 1)
-        select_dual_pivot_quick_sort(array_to_sort, p2 + 1, high)
+        (first_1, last_1), (first_2, last_2) = dual_partition(array_to_sort, low, high, counter)
+        select_dual_pivot_quick_sort(array_to_sort, low, first_1 - 1, counter)
+        select_dual_pivot_quick_sort(array_to_sort, last_1 + 1, first_2 - 1, counter)
+        select_dual_pivot_quick_sort(array_to_sort, last_2 + 1, high, counter)
 
 
-def dual_partition(array: List[int], low: int, high: int) -> tuple:
+def dual_partition(array: List[int], low: int, high: int, counter=counters) -> tuple:
     """
     Partition array into three parts using two pivots selected by SELECT.
+
+    my_select_range leaves the subarray partitioned three-way around the element it selects,
+    so the first pivot (the 1/3 order statistic) is selected from the whole subarray and the
+    second one (the 2/3 order statistic) only from the part after the keys equal to the first
+    pivot. After both selects the three parts are already in place, and the keys equal to a
+    pivot are left out of them.
+
+    Returns:
+        tuple: ((first_1, last_1), (first_2, last_2)) - the indices of the keys equal to each
+               pivot; the second block is empty (high + 1, high) if all keys after the first
+               block are equal to the first pivot.
     """
     size = high - low + 1
-    # positions for pivots: 1/3 and 2/3
-    k1 = size // 3
+    # positions for pivots: 1/3 and 2/3 (at least 1, size >= 2)
+    k1 = max(1, size // 3)
     k2 = 2 * size // 3
 
-    # select pivot values
-    pivot_low = my_select(array, low, high, k1)
-    pivot_high = my_select(array, low, high, k2)
-
-    # find indices of these pivot values within [low, high]
-    low_indices = [i for i in range(low, high+1) if array[i] == pivot_low]
-    high_indices = [i for i in range(low, high+1) if array[i] == pivot_high and i not in low_indices]
-    # fallback if not found
-    pl = low_indices[0] if low_indices else low
-    ph = high_indices[0] if high_indices else high
-
-    counters.swap(array, low, pl)
-    counters.swap(array, high, ph)
-
-    # refresh pivot values
-    pivot_low = array[low]
-    pivot_high = array[high]
-    if counters.compare(pivot_high, pivot_low):
-        counters.swap(array, low, high)
-        pivot_low, pivot_high = pivot_high, pivot_low
-
-    left = low + 1
-    right = high - 1
-    i = left
-    while i <= right:
-        if counters.compare(array[i], pivot_low):
-            counters.swap(array, i, left)
-            left += 1
-            i += 1
-        elif counters.compare(pivot_high, array[i]):
-            counters.swap(array, i, right)
-            right -= 1
-        else:
-            i += 1
-
-    counters.swap(array, low, left - 1)
-    counters.swap(array, high, right + 1)
-    return left - 1, right + 1
+    first_1, last_1 = my_select_range(array, low, high, k1, counter=counter)
+    if last_1 == high:
+        return (first_1, last_1), (high + 1, high)
+    # The 2/3 statistic may be equal to the first pivot, then the smallest of the rest is taken
+    position_2 = max(low + k2 - 1, last_1 + 1)
+    second = my_select_range(array, last_1 + 1, high, position_2 - last_1, counter=counter)
+    return (first_1, last_1), second
 
 
 if __name__ == "__main__":
@@ -2,9 +2,9 @@ from typing import List
 import sys
 import random
 import utils.counters as counters
-from my_select import my_select  # Importujemy funkcję my_select
+from my_select import my_select_range  # Importujemy funkcję my_select_range
 
-def quick_sort_select(array_to_sort: List[int], low: int, high: int) -> None:
+def quick_sort_select(array_to_sort: List[int], low: int, high: int, counter=counters) -> None:
     """
     Implements the quick sort algorithm to sort an array in place using SELECT to choose the pivot.
     Tracks comparisons and swaps during sorting.
@@ -13,45 +13,36 @@ def quick_sort_select(array_to_sort: List[int], low: int, high: int) -> None:
         array_to_sort (List[int]): The array to be sorted.
         low (int): The starting index of the array segment to be sorted.
         high (int): The ending index of the array segment to be sorted.
+        counter: Where comparisons and swaps are counted - the utils.counters module (default)
+                 or a counters.Counters instance owned by this call.
 
     Returns:
         None - It sorts the array in place.
     """
     if low < high:
-        pivot_index = partition(array_to_sort, low, high)
-        quick_sort_select(array_to_sort, low, pivot_index - 1)  # Left sub-array
-        quick_sort_select(array_to_sort, pivot_index + 1, high)  # Right sub-array
+        first, last = partition(array_to_sort, low, high, counter)
+        quick_sort_select(array_to_sort, low, first - 1, counter)  # Left sub-array
+        quick_sort_select(array_to_sort, last + 1, high, counter)  # Right sub-array
 
-def partition(array_to_sort: List[int], low: int, high: int) -> int:
+def partition(array_to_sort: List[int], low: int, high: int, counter=counters) -> tuple:
     """
-    Partitions the array into two sub-arrays based on a pivot chosen using SELECT.
-    Rearranges the elements in the array such that all elements less than the pivot
-    are on the left, and all elements greater than the pivot are on the right.
+    Partitions the array into three sub-arrays around its median chosen using SELECT.
+    my_select_range leaves the subarray partitioned three-way around the element it selects,
+    so the median is already in place: all elements before its block of equal keys are
+    smaller and all elements after it are larger, and no further pass is needed. The equal
+    keys are not sorted again, so many duplicates do not make the sort slower.
 
     Parameters:
         array_to_sort (List[int]): The array to be partitioned.
         low (int): The starting index of the partition.
         high (int): The ending index of the partition.
+        counter: Where comparisons and swaps are counted.
 
     Returns:
-        int: The index of the pivot after partitioning.
+        tuple: The first and the last index of the keys equal to the pivot after partitioning.
     """
-    # Choose pivot using SELECT algorithm
-    pivot = my_select(array_to_sort, low, high, (high - low + 1) // 2)  # Select median as pivot
-    
-    # Swap pivot with the last element
-    pivot_index = array_to_sort.index(pivot)
-    counters.swap(array_to_sort, pivot_index, high)
-    
-    pivot = array_to_sort[high]
-    i = low - 1
-    for j in range(low, high):
-        if counters.compare(array_to_sort[j], pivot):  # If current element <= pivot
-            i += 1
-            counters.swap(array_to_sort, i, j)  # Swap the elements
-
-    counters.swap(array_to_sort, i + 1, high)  # Place pivot in the correct position
-    return i + 1
+    # Choose pivot using SELECT algorithm (median as pivot, already at its sorted position)
+    return my_select_range(array_to_sort, low, high, (high - low + 1) // 2, counter=counter)
 
 if __name__ == "__main__":
     input_data = sys.stdin.read().splitlines()
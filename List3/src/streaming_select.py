@@ -0,0 +1,242 @@
+import heapq
+import math
+import random
+import sys
+import utils.counters as counters
+from random_select import randomized_select
+
+# Every level of a KLL sketch holds at least this fraction of the items of the level above it
+KLL_CAPACITY_DECAY = 2 / 3
+# Smallest k of a KLL sketch; with fewer items per level the error is no longer bounded by k
+KLL_MIN_K = 8
+
+
+class RunningSelect:
+    """
+    Exact running k-th smallest element (or running median) of a stream, updated in O(log n)
+    per element, so the statistic of the prefix read so far is known at any time without
+    keeping the prefix in an array to select from.
+
+    Two heaps split the elements read so far: `lower`, a max-heap (of negated keys) with the
+    `rank` smallest ones, and `upper`, a min-heap with the rest. The wanted element is the top
+    of `lower`. The rank of the median grows by one every second element, so after every
+    element at most one key moves between the heaps.
+
+    For a fixed k an element that does not fit among the k smallest can never become the k-th
+    smallest, so it is dropped and `upper` stays empty: the memory is O(k) instead of O(n).
+
+    Keys have to be numbers (the max-heap stores them negated). Nothing is counted - the
+    heaps compare keys inside heapq.
+    """
+
+    def __init__(self, k: int = None):
+        """
+        Parameters:
+            k (int): Which order statistic, from 1, or None for the (lower) median -
+                     the (count + 1) // 2-th smallest of the elements read so far.
+        """
+        if k is not None and k < 1:
+            raise ValueError(f"k = {k} has to be at least 1")
+        self.k = k
+        self.count = 0
+        self.lower = []
+        self.upper = []
+
+    @property
+    def rank(self) -> int:
+        """Which order statistic of the elements read so far `value` returns."""
+        return (self.count + 1) // 2 if self.k is None else min(self.k, self.count)
+
+    def add(self, value) -> None:
+        """Reads the next element of the stream."""
+        self.count += 1
+        lower, upper = self.lower, self.upper
+        if self.k is not None:
+            if len(lower) < self.k:
+                heapq.heappush(lower, -value)
+            elif value < -lower[0]:
+                heapq.heapreplace(lower, -value)
+            return
+
+        if lower and value > -lower[0]:
+            heapq.heappush(upper, value)
+        else:
+            heapq.heappush(lower, -value)
+        # The median rank grew by at most one, so at most one key has to move
+        if len(lower) > self.rank:
+            heapq.heappush(upper, -heapq.heappop(lower))
+        elif len(lower) < self.rank:
+            heapq.heappush(lower, -heapq.heappop(upper))
+
+    def extend(self, values) -> None:
+        """Reads the next elements of the stream."""
+        for value in values:
+            self.add(value)
+
+    def value(self):
+        """
+        Returns:
+            The rank-th smallest element read so far.
+        """
+        if self.count == 0 or (self.k is not None and self.count < self.k):
+            raise ValueError(f"Only {self.count} elements read, the {self.k or 1}-th smallest does not exist yet")
+        return -self.lower[0]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class KLLSketch:
+    """
+    Approximate quantiles of a stream in bounded memory (the KLL sketch of Karnin, Lang and
+    Liberty, 2016).
+
+    The sketch is a stack of levels; an item on level h stands for 2^h elements of the
+    stream. New elements go to level 0. When the sketch holds more items than the sum of the
+    level capacities, the lowest full level is compacted: it is sorted and every second item
+    (starting at a random offset, so the error is unbiased) moves one level up with twice the
+    weight, the others are dropped. The top level has a capacity of k and every level below
+    it KLL_CAPACITY_DECAY of the one above, so the sketch keeps O(k) items for any stream
+    length and the rank of an answer is off by about n / k.
+
+    Sketches of parts of a stream (e.g. read by parallel workers) merge into a sketch of the
+    whole stream with the same error bound: `merge` joins the levels and compacts them again.
+    """
+
+    def __init__(self, k: int = 200, seed: int = None):
+        """
+        Parameters:
+            k (int): Size of the sketch - larger k, smaller error, more memory.
+            seed (int): Seed of the compaction offsets; the same seed and stream give the same sketch.
+        """
+        if k < KLL_MIN_K:
+            raise ValueError(f"k = {k} has to be at least {KLL_MIN_K}")
+        self.k = k
+        self.n = 0
+        self.levels = [[]]
+        self.size = 0
+        self.max_size = self.capacity(0)
+        self.random = random.Random(seed)
+
+    def capacity(self, level: int) -> int:
+        """Number of items a level may hold before it is compacted."""
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * KLL_CAPACITY_DECAY ** depth))
+
+    def add(self, value) -> None:
+        """Reads the next element of the stream."""
+        self.levels[0].append(value)
+        self.n += 1
+        self.size += 1
+        if self.size >= self.max_size:
+            self.compress()
+
+    def extend(self, values) -> None:
+        """Reads the next elements of the stream."""
+        for value in values:
+            self.add(value)
+
+    def compress(self) -> None:
+        """Compacts full levels, lowest first, until the sketch is below its capacity again."""
+        for level in range(len(self.levels)):
+            if len(self.levels[level]) < self.capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+
+            items = sorted(self.levels[level])
+            # An odd item out stays on this level - the smallest or the largest, at random, so
+            # neither end of the level loses weight - and the weight of the rest is halved
+            kept = [items.pop(-self.random.getrandbits(1))] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self.random.getrandbits(1)::2])
+            self.levels[level] = kept
+            self.size = sum(len(level_items) for level_items in self.levels)
+            if self.size < self.max_size:
+                return
+
+    def merge(self, other: "KLLSketch") -> None:
+        """
+        Adds the elements summarized by `other` (a sketch with the same k) to this sketch.
+        """
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge a sketch with k = {other.k} into one with k = {self.k}")
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self.size = sum(len(level_items) for level_items in self.levels)
+        self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+        while self.size >= self.max_size:
+            self.compress()
+
+    def weighted_items(self) -> list:
+        """All items of the sketch as (item, weight) pairs, sorted by item."""
+        return sorted((item, 1 << level) for level, items in enumerate(self.levels) for item in items)
+
+    def rank(self, value) -> int:
+        """Estimated number of elements of the stream <= value."""
+        return sum((1 << level) * sum(1 for item in items if item <= value) for level, items in enumerate(self.levels))
+
+    def select(self, k: int):
+        """
+        Returns:
+            An element of the stream whose rank is about k (the k-th smallest, from 1, up to the error of the sketch).
+        """
+        if not 1 <= k <= self.n:
+            raise ValueError(f"k = {k} is out of range for a stream of {self.n} elements")
+        total = 0
+        for item, weight in self.weighted_items():
+            total += weight
+            if total >= k:
+                return item
+        return item
+
+    def quantile(self, p: float):
+        """
+        Returns:
+            An element of the stream whose rank is about p * n, 0 <= p <= 1 (p = 0.5 - the median).
+        """
+        return self.select(min(self.n, max(1, math.ceil(p * self.n))))
+
+    def __len__(self) -> int:
+        return self.n
+
+
+def exact_quantiles(arr, ks, counter=counters):
+    """
+    Exact k-th smallest elements of a stream that was read whole into memory: one
+    randomized_select per k, the reference the streaming selects are compared with.
+    The array is rearranged in place.
+
+    Returns:
+        list: The k-th smallest element for every k of ks.
+    """
+    return [randomized_select(arr, 0, len(arr) - 1, k, counter) for k in ks]
+
+
+if __name__ == "__main__":
+    input_data = sys.stdin.read().splitlines()
+    n = int(input_data[0].strip())
+    k = int(input_data[1].strip())
+    stream = map(int, input_data[2].split())
+
+    running = RunningSelect(k)
+    running_median = RunningSelect()
+    sketch = KLLSketch(seed=0)
+    array = []
+    for key in stream:
+        running.add(key)
+        running_median.add(key)
+        sketch.add(key)
+        array.append(key)
+
+    counters.reset_counters()
+    exact_k, exact_median = exact_quantiles(array, [k, (n + 1) // 2])
+
+    print("\n--- STREAMING SELECT ---")
+    print(f"{k}-th statistic: {running.value()} (running), {sketch.select(k)} (KLL sketch, {sketch.size} items), "
+          f"{exact_k} (randomized select)")
+    print(f"Median: {running_median.value()} (running), {sketch.quantile(0.5)} (KLL sketch), {exact_median} (randomized select)")
+    print(f"Comparisons: {counters.comparison_count}, Swaps: {counters.swap_count}")
@@ -0,0 +1,120 @@
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# Pools attached by this process, by the name of their shared memory block
+_attached = {}
+
+
+class InputPool:
+    """
+    Inputs of repeated experiment trials, generated once from a seed and kept in shared memory.
+
+    The pool holds `trials` arrays of int64 keys for every size, generated in one vectorized
+    NumPy call per size instead of one Python shuffle per trial. Worker processes attach to
+    the pool by name (see `spec` and `attach`) instead of getting the keys pickled, and every
+    algorithm of an experiment takes trial i from the same pool, so all of them sort exactly
+    the same inputs (a paired comparison).
+
+    Two kinds of keys:
+     - key_range None: every array is a random permutation of 1..n, stored separately for
+       every size,
+     - key_range given: random keys from 1..key_range. A prefix of such an array is again
+       such an array, so only arrays of the largest size are stored and smaller sizes use
+       their prefixes - the memory is trials * max(sizes) keys instead of trials * sum(sizes).
+       The arrays of a size therefore depend on max(sizes): pools with the same seed but a
+       different largest size give different keys for the same n.
+    """
+
+    def __init__(self, sizes, trials: int, seed: int = 0, key_range: int = None, name: str = None):
+        """
+        Creates the pool and generates its keys, or attaches to an existing one if `name` is given
+        (use attach(spec) for that).
+
+        Parameters:
+            sizes: Sizes of the arrays.
+            trials (int): Number of arrays of every size.
+            seed (int): Seed of the keys; the same seed gives the same pool.
+            key_range (int): Random keys from 1..key_range, or permutations of 1..n if None.
+            name (str): Name of the shared memory block of an existing pool.
+        """
+        self.sizes = sorted(set(sizes))
+        self.trials = trials
+        self.seed = seed
+        self.key_range = key_range
+
+        # Offset of the first key of every size in the block (a single block when prefixes are used)
+        row_lengths = [max(self.sizes)] if key_range is not None else self.sizes
+        self.offsets = {}
+        offset = 0
+        for size in row_lengths:
+            self.offsets[size] = offset
+            offset += trials * size
+        total = max(offset, 1)
+
+        self.owner = name is None
+        self.shared = SharedMemory(name=name, create=self.owner, size=total * np.dtype(np.int64).itemsize)
+        self.keys = np.ndarray(total, dtype=np.int64, buffer=self.shared.buf)
+        if self.owner:
+            self.generate()
+        # attach() in the creating process (e.g. a task run without workers) gets the pool itself
+        _attached[self.shared.name] = self
+
+    def generate(self) -> None:
+        for size, offset in self.offsets.items():
+            # Seeded by the row length too, so permutations of a size do not depend on the other
+            # sizes of the pool (with key_range there is one row length, max(sizes), see the class)
+            generator = np.random.default_rng([self.seed, size])
+            block = self.keys[offset:offset + self.trials * size].reshape(self.trials, size)
+            if self.key_range is None:
+                block[:] = np.arange(1, size + 1)
+                generator.permuted(block, axis=1, out=block)
+            else:
+                block[:] = generator.integers(1, self.key_range + 1, size=block.shape)
+
+    def row(self, trial: int, n: int) -> np.ndarray:
+        """
+        The keys of one trial of size n, as a view into shared memory (do not modify it).
+        """
+        if not 0 <= trial < self.trials:
+            raise IndexError(f"Trial {trial} is not in the pool of {self.trials} trials")
+        row_length = max(self.sizes) if self.key_range is not None else n
+        if row_length not in self.offsets or n > row_length:
+            raise KeyError(f"Size {n} is not in the pool")
+        start = self.offsets[row_length] + trial * row_length
+        return self.keys[start:start + n]
+
+    def trial(self, trial: int, n: int) -> list:
+        """
+        A fresh list with the keys of one trial of size n, for a sort to work on.
+        """
+        return self.row(trial, n).tolist()
+
+    @property
+    def spec(self) -> tuple:
+        """Everything a worker process needs to attach to the pool; small enough to pickle with every task."""
+        return self.shared.name, tuple(self.sizes), self.trials, self.seed, self.key_range
+
+    def close(self) -> None:
+        """Detaches from the pool; the process that created it also frees it."""
+        _attached.pop(self.shared.name, None)
+        del self.keys
+        self.shared.close()
+        if self.owner:
+            self.shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach(spec: tuple) -> InputPool:
+    """
+    Attaches to the pool described by `spec` (InputPool.spec); every process attaches to a
+    pool once and keeps it for the following tasks.
+    """
+    name, sizes, trials, seed, key_range = spec
+    if name not in _attached:
+        _attached[name] = InputPool(sizes, trials, seed, key_range, name=name)
+    return _attached[name]
@@ -0,0 +1,99 @@
+import ast
+import builtins
+import inspect
+import sys
+
+# Names under which the sorts reach their counters: the `counter` argument or the `counters` module
+COUNTER_NAMES = {"counter", "counters"}
+
+# Stripped module namespaces, keyed by the name of the original module
+_stripped_modules = {}
+
+
+def uninstrumented(sort_function):
+    """
+    Returns a copy of an instrumented sort with every counter call compiled away.
+
+    The source of the module that defines `sort_function` is rewritten before compiling:
+     - counter.compare(a, b)    ->  a <= b
+     - counter.swap(arr, i, j)  ->  arr[i], arr[j] = arr[j], arr[i]
+     - any other counter call or `counter.<attribute> += ...` statement is dropped
+    Helpers imported from other instrumented modules (e.g. `partition` in hybrid_sort) are
+    replaced by their stripped versions too, so the returned function never touches a counter.
+
+    Parameters:
+        sort_function: function that takes a `counter` argument (e.g. quick_sort).
+
+    Returns:
+        The same algorithm with the same signature; the `counter` argument is ignored.
+    """
+    namespace = _strip_module(sys.modules[sort_function.__module__])
+    return namespace[sort_function.__name__]
+
+
+def is_instrumented(function) -> bool:
+    """Tells whether `function` is a plain function that takes a `counter` argument."""
+    return inspect.isfunction(function) and "counter" in inspect.signature(function).parameters
+
+
+def _strip_module(module) -> dict:
+    name = module.__name__
+    if name in _stripped_modules:
+        return _stripped_modules[name]
+
+    tree = _StripCounters().visit(ast.parse(inspect.getsource(module)))
+    ast.fix_missing_locations(tree)
+
+    # A different __name__ also keeps the `if __name__ == "__main__"` block from running
+    stripped_name = f"{name}[uninstrumented]"
+    namespace = {"__name__": stripped_name, "__file__": module.__file__, "__builtins__": builtins}
+    _stripped_modules[name] = namespace
+    exec(compile(tree, module.__file__, "exec"), namespace)
+
+    for key, value in list(namespace.items()):
+        if is_instrumented(value) and value.__module__ != stripped_name:
+            namespace[key] = uninstrumented(value)
+    return namespace
+
+
+def _is_counter_call(node) -> bool:
+    return (isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id in COUNTER_NAMES)
+
+
+class _StripCounters(ast.NodeTransformer):
+    """
+    Rewrites counter calls into the plain operations they count.
+    """
+
+    def visit_Expr(self, node):
+        if not _is_counter_call(node.value):
+            return self.generic_visit(node)
+        call = node.value
+        if call.func.attr == "swap":
+            array, i, j = (self.visit(arg) for arg in call.args)
+            return ast.Assign(
+                targets=[ast.Tuple([_item(array, i, ast.Store()), _item(array, j, ast.Store())], ast.Store())],
+                value=ast.Tuple([_item(array, j, ast.Load()), _item(array, i, ast.Load())], ast.Load()),
+            )
+        return ast.Pass()
+
+    def visit_Call(self, node):
+        node = self.generic_visit(node)
+        if _is_counter_call(node) and node.func.attr == "compare":
+            a, b = node.args
+            return ast.Compare(left=a, ops=[ast.LtE()], comparators=[b])
+        return node
+
+    def visit_AugAssign(self, node):
+        target = node.target
+        if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                and target.value.id in COUNTER_NAMES):
+            return ast.Pass()
+        return self.generic_visit(node)
+
+
+def _item(array, index, context):
+    return ast.Subscript(value=array, slice=index, ctx=context)